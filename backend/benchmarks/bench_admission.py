@@ -0,0 +1,100 @@
+"""
+Admission control under overload, and rate limiter cost.
+
+Simulates a route with a fixed service time offered twice its capacity and
+compares an unbounded queue (plain semaphore) with AdmissionController's
+CoDel-style shedding: latency of the requests that are served, and how many
+are shed. Also times TokenBucketLimiter.acquire with in-memory and shared
+(/dev/shm) buckets.
+
+Usage (from backend/):
+    python -m benchmarks.bench_admission
+    python -m benchmarks.bench_admission --overload 3 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from src.core.admission import AdmissionController, LoadShedError, TokenBucketLimiter
+
+
+class Unbounded:
+    """Baseline: every request waits as long as it takes."""
+
+    def __init__(self, max_concurrency: int):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def acquire(self):
+        await self.semaphore.acquire()
+
+    def release(self):
+        self.semaphore.release()
+
+
+async def offer_load(controller, args):
+    latencies, shed = [], 0
+    service = args.service_ms / 1000
+    gap = service / args.concurrency / args.overload
+
+    async def request():
+        nonlocal shed
+        start = time.perf_counter()
+        try:
+            await controller.acquire()
+        except LoadShedError:
+            shed += 1
+            return
+        try:
+            await asyncio.sleep(service)
+        finally:
+            controller.release()
+        latencies.append(time.perf_counter() - start)
+
+    tasks = []
+    for _ in range(args.requests):
+        tasks.append(asyncio.create_task(request()))
+        await asyncio.sleep(gap)
+    await asyncio.gather(*tasks)
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    return p50, p99, shed
+
+
+def limiter_us(limiter: TokenBucketLimiter, calls: int) -> float:
+    keys = [f"user_{index}" for index in range(1000)]
+    start = time.perf_counter()
+    for index in range(calls):
+        limiter.acquire(keys[index % 1000])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def main(args):
+    print(f"{args.overload}x overload, {args.concurrency} slots, {args.service_ms}ms service time, {args.requests} requests")
+    candidates = {
+        "unbounded queue": Unbounded(args.concurrency),
+        "CoDel shedding": AdmissionController("bench", args.concurrency, args.max_queue, args.target_ms / 1000, args.interval_ms / 1000),
+    }
+    for name, controller in candidates.items():
+        p50, p99, shed = await offer_load(controller, args)
+        print(f"{name:>16}: served p50 {p50:8.1f}ms, p99 {p99:8.1f}ms, shed {shed / args.requests:6.1%}")
+
+    print(f"\nrate limiter, in memory: {limiter_us(TokenBucketLimiter(1e9, 1e9), 200_000):6.2f}us per request")
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    with tempfile.NamedTemporaryFile(dir=directory) as shared:
+        print(f"rate limiter, shared:    {limiter_us(TokenBucketLimiter(1e9, 1e9, shared_path=shared.name), 200_000):6.2f}us per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--overload", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--service-ms", type=float, default=20)
+    parser.add_argument("--max-queue", type=int, default=128)
+    parser.add_argument("--target-ms", type=float, default=50)
+    parser.add_argument("--interval-ms", type=float, default=500)
+    asyncio.run(main(parser.parse_args()))
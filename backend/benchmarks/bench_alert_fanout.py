@@ -0,0 +1,74 @@
+"""
+Alert fan-out cost with thousands of connected dashboards.
+
+Connects N in-process subscribers (consumer tasks, as the SSE/WebSocket
+handlers are), a fraction of which never read, then publishes a stream of
+alerts. Reports publish cost per alert, end-to-end delivery latency, and how
+many slow consumers were disconnected instead of buffering without bound.
+
+Usage (from backend/):
+    python -m benchmarks.bench_alert_fanout
+    python -m benchmarks.bench_alert_fanout --subscribers 10000 --alerts 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+from src.models.alerts import AlertResponse
+from src.services.alerts import AlertBroker
+
+
+async def consume(subscription, latencies):
+    while (message := await subscription.get()) is not None:
+        latencies.append(time.perf_counter() - message.alert.timestamp.timestamp())
+
+
+async def main(args):
+    broker = AlertBroker(buffer_size=args.buffer, replay_size=256, max_subscribers=args.subscribers)
+    latencies = []
+    slow = int(args.subscribers * args.slow_fraction)
+    consumers = []
+    for index in range(args.subscribers):
+        subscription = broker.subscribe()
+        # Slow consumers subscribe but never read
+        if index >= slow:
+            consumers.append(asyncio.create_task(consume(subscription, latencies)))
+    await asyncio.sleep(0)
+
+    publish_seconds = []
+    for index in range(args.alerts):
+        # Alert timestamps carry perf_counter time so consumers can measure delivery latency
+        alert = AlertResponse(
+            id=str(index), title="bench", description="x" * 200, severity="high",
+            timestamp=datetime.fromtimestamp(time.perf_counter())
+        )
+        start = time.perf_counter()
+        broker.publish(alert)
+        publish_seconds.append(time.perf_counter() - start)
+        # Let consumers drain between alerts, as a coalesced alert stream would
+        await asyncio.sleep(args.interval_ms / 1000)
+
+    broker.close_all()
+    await asyncio.gather(*consumers)
+
+    stats = broker.stats()
+    latencies.sort()
+    print(f"subscribers: {args.subscribers} ({slow} never read), alerts: {args.alerts}")
+    print(f"publish:    {statistics.mean(publish_seconds) * 1000:8.2f}ms mean, "
+          f"{max(publish_seconds) * 1000:8.2f}ms max per alert "
+          f"({statistics.mean(publish_seconds) / args.subscribers * 1e6:.2f}us per subscriber)")
+    print(f"delivery:   {latencies[len(latencies) // 2] * 1000:8.2f}ms p50, "
+          f"{latencies[int(len(latencies) * 0.99)] * 1000:8.2f}ms p99")
+    print(f"delivered:  {stats['delivered']}, slow consumers disconnected: {stats['dropped_subscribers']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--alerts", type=int, default=100)
+    parser.add_argument("--buffer", type=int, default=64)
+    parser.add_argument("--slow-fraction", type=float, default=0.05)
+    parser.add_argument("--interval-ms", type=float, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,45 @@
+"""
+Per-request overhead of the get_current_user auth dependency.
+
+Times the dependency with the verified-token cache disabled and enabled, for
+each available JOSE backend (PyJWT is optional and skipped if not installed).
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth
+"""
+import asyncio
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+from src.core import security
+
+CALLS = 20_000
+
+
+async def per_call_us(credentials: HTTPAuthorizationCredentials) -> float:
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await security.get_current_user(credentials)
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def main():
+    token = security.create_access_token({"sub": "user_1", "email": "user@example.com"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    for backend in security.JWT_BACKENDS:
+        try:
+            security._decode_token, security._token_error = security.build_token_decoder(backend)
+        except RuntimeError as e:
+            print(f"{backend}: skipped ({e})")
+            continue
+
+        for max_entries in (0, 10_000):
+            security.token_cache = security.VerifiedTokenCache(max_entries=max_entries)
+            label = "cached" if max_entries else "uncached"
+            print(f"{backend:>6} {label:>9}: {await per_call_us(credentials):8.2f}us per request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""
+Database round-trips and latency per auth call.
+
+Drives /auth/signup and repeated /auth/login in-process (no HTTP server)
+against the Supabase project configured in .env, counting every query that
+goes through the database executor. Run it on the old and new build to
+compare round-trips per call.
+
+Usage (from backend/):
+    python -m benchmarks.bench_auth_round_trips --logins 20
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from src.core import database
+from src.main import app
+
+
+class CountingExecutor:
+    """Wraps the database executor and counts submitted queries."""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.calls = 0
+
+    def submit(self, *args, **kwargs):
+        self.calls += 1
+        return self.executor.submit(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.executor, name)
+
+
+async def timed_call(client, counter, path, payload):
+    before = counter.calls
+    start = time.perf_counter()
+    response = await client.post(path, json=payload)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return response.status_code, counter.calls - before, elapsed_ms
+
+
+async def main(args):
+    counter = CountingExecutor(database.db_executor)
+    database.db_executor = counter
+
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    credentials = {"email": email, "password": "BenchPass123"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        status, trips, elapsed = await timed_call(client, counter, "/auth/signup", {"name": "Bench", **credentials})
+        print(f"signup:           status={status} round_trips={trips} {elapsed:7.1f}ms")
+
+        status, trips, elapsed = await timed_call(client, counter, "/auth/signup", {"name": "Bench", **credentials})
+        print(f"duplicate signup: status={status} round_trips={trips} {elapsed:7.1f}ms")
+
+        total_trips = 0
+        total_ms = 0.0
+        for _ in range(args.logins):
+            status, trips, elapsed = await timed_call(client, counter, "/auth/login", credentials)
+            total_trips += trips
+            total_ms += elapsed
+        print(f"login x{args.logins}:        round_trips/call={total_trips / args.logins:.2f} "
+              f"mean={total_ms / args.logins:7.1f}ms (includes bcrypt)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
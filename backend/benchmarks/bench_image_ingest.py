@@ -0,0 +1,94 @@
+"""
+Peak-RSS benchmark for meme ingestion.
+
+Each scenario runs in a fresh subprocess and reports how far its peak RSS
+rose above the post-import baseline:
+  - read_full / read_chunked: buffering a 200 MB upload with file.read()
+    vs. read_upload_limited() aborting at the 10 MB limit
+  - full_decode / probe / draft_decode: decoding a 24 MP JPEG at full
+    resolution vs. header-only probing vs. decoding straight to 224x224
+
+Usage (from backend/):
+    python -m benchmarks.bench_image_ingest
+"""
+import asyncio
+import io
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SCENARIOS = ["read_full", "read_chunked", "full_decode", "probe", "draft_decode"]
+UPLOAD_BYTES = 200 * 1024 * 1024
+LIMIT_BYTES = 10 * 1024 * 1024
+IMAGE_SIZE = (6000, 4000)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_jpeg() -> bytes:
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.effect_noise(IMAGE_SIZE, 64).convert("RGB").save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def run_scenario(name: str, image_path: str) -> None:
+    from PIL import Image
+    from starlette.datastructures import UploadFile
+    from src.services.image_io import read_upload_limited, probe_image, load_for_model, ImageTooLargeError
+
+    if name.startswith("read"):
+        spool = tempfile.TemporaryFile()
+        chunk = b"\0" * (1024 * 1024)
+        for _ in range(UPLOAD_BYTES // len(chunk)):
+            spool.write(chunk)
+        spool.seek(0)
+        # size unknown, as with a chunked request body
+        upload = UploadFile(spool, filename="big.jpg")
+    else:
+        with open(image_path, "rb") as image_file:
+            image_bytes = image_file.read()
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+
+    if name == "read_full":
+        data = asyncio.run(upload.read())
+        assert len(data) > LIMIT_BYTES
+    elif name == "read_chunked":
+        try:
+            asyncio.run(read_upload_limited(upload, LIMIT_BYTES))
+        except ImageTooLargeError:
+            pass
+    elif name == "full_decode":
+        Image.open(io.BytesIO(image_bytes)).convert("RGB").resize((224, 224))
+    elif name == "probe":
+        probe_image(image_bytes)
+    elif name == "draft_decode":
+        load_for_model(image_bytes, (224, 224))
+
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{name:>14} {peak_rss_mb() - baseline:>10.1f} {elapsed:>10.1f}")
+
+
+def main():
+    # Encode the test image once, outside the measured processes
+    with tempfile.NamedTemporaryFile(suffix=".jpg") as image_file:
+        image_file.write(make_jpeg())
+        image_file.flush()
+
+        print(f"{'scenario':>14} {'+RSS MB':>10} {'time ms':>10}")
+        for name in SCENARIOS:
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_image_ingest", name, image_file.name], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run_scenario(sys.argv[1], sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,60 @@
+"""
+Import-time budget check for the application module.
+
+Imports src.main in a fresh interpreter under `python -X importtime`,
+prints the slowest modules (cumulative time) and exits non-zero when the
+total exceeds the budget, so it can gate CI. Run it twice locally: the
+first run also pays for compiling .pyc files.
+
+Usage (from backend/):
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --budget-ms 600 --top 20
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+def measure(module: str):
+    """Return [(module, self_us, cumulative_us)] from a fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if completed.returncode != 0:
+        sys.exit(completed.stderr)
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main(args) -> int:
+    rows = measure(args.module)
+    total_ms = next(cumulative for name, _, cumulative in rows if name == args.module) / 1000
+
+    print(f"{'module':<50} {'self ms':>9} {'cumulative ms':>14}")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{name:<50} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+
+    print(f"\nimport {args.module}: {total_ms:.0f}ms (budget {args.budget_ms}ms)")
+    if total_ms > args.budget_ms:
+        print("FAIL: import-time budget exceeded")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--budget-ms", type=int, default=800)
+    parser.add_argument("--top", type=int, default=15)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,62 @@
+"""
+Job queue throughput by worker count.
+
+Submits a backlog of text jobs to a scratch SQLite queue and drains it with
+1, 2, 4 and 8 workers running the real text job handler, reporting jobs per
+second and the submit latency. Repeated texts hit the result cache. Analysis log
+writes go to the write-behind sink, which is not started, so no database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_job_queue
+    python -m benchmarks.bench_job_queue --jobs 500 --texts-per-job 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from src.api.analyze_jobs import run_text_job
+from src.services.job_queue import JobQueue, JobWorkerPool
+from src.services.log_sink import analysis_log_sink
+
+
+async def drain(workers: int, args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        queue = JobQueue(os.path.join(directory, "jobs.sqlite3"), max_queued=args.jobs)
+        payload = json.dumps([f"post {index} about a rigged election hoax" for index in range(args.texts_per_job)]).encode("utf-8")
+
+        start = time.perf_counter()
+        for _ in range(args.jobs):
+            await queue.submit("text", "bench", payload)
+        submit_ms = (time.perf_counter() - start) / args.jobs * 1000
+
+        pool = JobWorkerPool(queue, concurrency=workers, poll_interval=0.05)
+        pool.register("text", run_text_job)
+        start = time.perf_counter()
+        await pool.start()
+        while pool.succeeded + pool.failed < args.jobs:
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        await pool.stop()
+
+        # Keep the unstarted sink from filling up between runs
+        while not analysis_log_sink.queue.empty():
+            analysis_log_sink.queue.get_nowait()
+
+        print(f"{workers:>2} workers: {args.jobs / elapsed:8.1f} jobs/s "
+              f"({args.jobs * args.texts_per_job / elapsed:9.0f} texts/s), submit {submit_ms:.2f}ms/job")
+
+
+async def main(args):
+    analysis_log_sink.max_queue_size = args.jobs * args.texts_per_job
+    for workers in (1, 2, 4, 8):
+        await drain(workers, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--texts-per-job", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,63 @@
+"""
+Micro-benchmark for the text classifier keyword engines.
+
+Compares the per-keyword substring loop against the Aho-Corasick automaton
+and the compiled-regex matcher from the shipped 8-keyword lexicon up to 50k
+keywords, on short posts and long texts. build_matcher(engine="auto") switches
+from the loop to the automaton at AUTO_AUTOMATON_MIN_KEYWORDS.
+
+Usage (from backend/):
+    python -m benchmarks.bench_keyword_matcher
+"""
+import random
+import string
+import time
+
+from src.services.keyword_matcher import build_matcher
+
+LEXICON_SIZES = [8, 64, 128, 256, 1_000, 50_000]
+TEXT_LENGTHS = [300, 2_000]
+REPEATS = 20
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+
+
+def make_text(rng: random.Random, keywords, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(keywords) if rng.random() < 0.05 else random_word(rng)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)
+
+
+def timed(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'chars':>6} {'keywords':>10} {'engine':>10} {'build ms':>10} {'search ms':>10}")
+    for length in TEXT_LENGTHS:
+        for size in LEXICON_SIZES:
+            keywords = list({random_word(rng) for _ in range(size * 2)})[:size]
+            text = make_text(rng, keywords, length)
+
+            for engine in ("substring", "automaton", "regex"):
+                if engine == "regex" and size > 1_000:
+                    continue  # minutes per search at this size
+                start = time.perf_counter()
+                matcher = build_matcher(keywords, engine=engine)
+                build_ms = (time.perf_counter() - start) * 1000
+                search_ms = timed(lambda: matcher.find_all(text), REPEATS)
+                print(f"{length:>6} {size:>10} {engine:>10} {build_ms:>10.2f} {search_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
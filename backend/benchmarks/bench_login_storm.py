@@ -0,0 +1,85 @@
+"""
+/analyze/text latency during a login storm.
+
+Measures /analyze/text latency with the server idle, then again while a
+burst of concurrent logins (500 by default) hits /auth/login. With bcrypt on
+its own bounded pool, analysis latency should stay close to the baseline
+while logins queue (or are shed with 503 once PASSWORD_MAX_QUEUE is full).
+
+Usage (from backend/, with the server running and the account existing):
+    python -m benchmarks.bench_login_storm --token <JWT> --email a@b.c --password secret
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import List
+
+import httpx
+
+from benchmarks.load_test import report
+
+
+async def analyze_loop(client, stop, samples, errors):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            response = await client.post("/analyze/text", json={"text": "This is fake news and propaganda"})
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+            else:
+                samples.append((time.perf_counter() - start) * 1000)
+        except httpx.HTTPError:
+            errors.append(0)
+        await asyncio.sleep(0.005)
+
+
+async def measure_analyze(client, seconds: float, burst=None):
+    samples: List[float] = []
+    errors: List[int] = []
+    stop = asyncio.Event()
+    workers = [asyncio.create_task(analyze_loop(client, stop, samples, errors)) for _ in range(4)]
+    start = time.perf_counter()
+    if burst is not None:
+        await burst
+    else:
+        await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*workers)
+    return samples, errors, time.perf_counter() - start
+
+
+async def login_burst(client, args, statuses: Counter):
+    async def login():
+        try:
+            response = await client.post("/auth/login", json={"email": args.email, "password": args.password})
+            statuses[response.status_code] += 1
+        except httpx.HTTPError:
+            statuses["error"] += 1
+
+    await asyncio.gather(*(login() for _ in range(args.logins)))
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.logins + 8, max_keepalive_connections=args.logins + 8)
+    headers = {"Authorization": f"Bearer {args.token}"}
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=120) as client:
+        samples, errors, elapsed = await measure_analyze(client, args.baseline_seconds)
+        report("idle", samples, len(errors), elapsed)
+
+        statuses: Counter = Counter()
+        burst_start = time.perf_counter()
+        samples, errors, elapsed = await measure_analyze(client, 0, burst=login_burst(client, args, statuses))
+        report("login storm", samples, len(errors), elapsed)
+        print(f"{args.logins} logins finished in {time.perf_counter() - burst_start:.1f}s: {dict(statuses)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--email", default="test@example.com")
+    parser.add_argument("--password", default="TestPass123")
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,63 @@
+"""
+Throughput benchmark for the meme execution backends.
+
+Analyzes a batch of JPEGs on the inline, thread and process backends at
+increasing pool sizes. Each image is decoded to model input resolution
+before classification, standing in for CNN preprocessing and inference,
+so the work is CPU-bound like production meme analysis.
+
+Usage (from backend/, with the usual .env or environment configured):
+    python -m benchmarks.bench_meme_executor
+"""
+import io
+import os
+import time
+
+from PIL import Image
+
+from src.services.meme_classifier import meme_classifier
+from src.services.meme_executor import MemeExecutor
+
+BATCH_SIZE = 64
+IMAGE_SIZE = (1600, 1200)
+ROUNDS = 3
+
+
+def decode_and_classify(image_bytes: bytes, filename: str):
+    # Full pixel path: decode at model resolution, then score
+    meme_classifier.preprocess(image_bytes)
+    return meme_classifier.analyze(image_bytes, filename)
+
+
+def make_batch():
+    buffer = io.BytesIO()
+    Image.effect_noise(IMAGE_SIZE, 64).convert("RGB").save(buffer, "JPEG", quality=90)
+    image_bytes = buffer.getvalue()
+    return [(image_bytes, f"meme_{index}.jpg") for index in range(BATCH_SIZE)]
+
+
+def measure(executor: MemeExecutor, batch) -> float:
+    executor.start()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        executor.analyze_batch(batch)
+    elapsed = time.perf_counter() - start
+    executor.shutdown()
+    return BATCH_SIZE * ROUNDS / elapsed
+
+
+def main():
+    batch = make_batch()
+    cores = os.cpu_count() or 1
+    pool_sizes = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+
+    print(f"{'mode':>8} {'workers':>8} {'images/s':>10}")
+    print(f"{'inline':>8} {1:>8} {measure(MemeExecutor('inline', analyze_fn=decode_and_classify), batch):>10.1f}")
+    for mode in ("thread", "process"):
+        for pool_size in pool_sizes:
+            executor = MemeExecutor(mode, pool_size=pool_size, analyze_fn=decode_and_classify)
+            print(f"{mode:>8} {pool_size:>8} {measure(executor, batch):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Overhead of a metrics timing span and of the request-latency middleware.
+
+Times an empty loop, then the same loop with each iteration wrapped in a
+span, and reports the difference per span. Also measures the middleware on a
+trivial ASGI app. Exits non-zero when a span costs more than the budget, so
+it can gate CI.
+
+Usage (from backend/):
+    python -m benchmarks.bench_metrics_overhead
+    python -m benchmarks.bench_metrics_overhead --budget-us 5 --calls 500000
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+
+from src.core.metrics import Histogram, span
+from src.core.middleware import MetricsMiddleware
+
+
+def empty_loop(calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        pass
+    return time.perf_counter() - start
+
+
+def span_loop(calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        with span("bench"):
+            pass
+    return time.perf_counter() - start
+
+
+def contended_span_us(calls: int, threads: int) -> float:
+    """Per-span cost with several threads recording into the same series."""
+    workers = [threading.Thread(target=span_loop, args=(calls // threads,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def middleware_us(calls: int) -> float:
+    """Per-request cost of MetricsMiddleware around an app that returns 200 immediately."""
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    wrapped = MetricsMiddleware(app, Histogram("bench_request_seconds", "bench", ("method", "route", "status")))
+    scope = {"type": "http", "method": "GET", "path": "/bench"}
+
+    timings = []
+    for handler in (app, wrapped):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await handler(scope, receive, send)
+        timings.append(time.perf_counter() - start)
+    return (timings[1] - timings[0]) / calls * 1e6
+
+
+def main(args) -> int:
+    # Warm up, then keep the best of several rounds to reduce scheduler noise
+    span_loop(10_000)
+    overhead_us = min(
+        (span_loop(args.calls) - empty_loop(args.calls)) / args.calls * 1e6
+        for _ in range(args.rounds)
+    )
+    print(f"{'span':<28} {overhead_us:6.2f}us per span")
+    print(f"{f'span, {args.threads} threads contended':<28} {contended_span_us(args.calls, args.threads):6.2f}us per span")
+    print(f"{'middleware':<28} {asyncio.run(middleware_us(args.calls // 10)):6.2f}us per request")
+
+    print(f"\nbudget {args.budget_us}us per span")
+    if overhead_us > args.budget_us:
+        print("FAIL: span overhead over budget")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--budget-us", type=float, default=5.0)
+    sys.exit(main(parser.parse_args()))
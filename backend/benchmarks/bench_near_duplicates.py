@@ -0,0 +1,108 @@
+"""
+Near-duplicate index at scale.
+
+Streams synthetic posts through a NearDuplicateIndex in batches: mostly unique
+background posts, plus coordinated campaigns posting lightly edited copies of
+a few templates (a word or two swapped per copy). Reports throughput, the
+latency of single-text observe() calls (the /analyze/text path) sampled along
+the way, campaign recall, false matches among background posts, and memory,
+which stays flat once the segment ring is full and older texts are evicted.
+
+Usage (from backend/):
+    python -m benchmarks.bench_near_duplicates
+    python -m benchmarks.bench_near_duplicates --texts 1000000 --segment-capacity 250000
+"""
+import argparse
+import resource
+import time
+
+import numpy as np
+
+from src.services.near_duplicates import NearDuplicateIndex
+
+VOCABULARY = [f"word{index}" for index in range(20000)]
+WORDS_PER_POST = 25
+
+
+def make_batch(rng: np.random.Generator, templates: np.ndarray, size: int, campaign_share: float):
+    """Returns (texts, campaign ids or -1 for background posts)."""
+    campaign = np.where(rng.random(size) < campaign_share, rng.integers(0, len(templates), size), -1)
+    words = rng.integers(0, len(VOCABULARY), (size, WORDS_PER_POST))
+    copies = campaign >= 0
+    words[copies] = templates[campaign[copies]]
+    # Light edits: replace one or two words of each copy
+    for _ in range(2):
+        edited = copies & (rng.random(size) < 0.7)
+        words[edited, rng.integers(0, WORDS_PER_POST, edited.sum())] = rng.integers(0, len(VOCABULARY), edited.sum())
+    return [" ".join(VOCABULARY[word] for word in row) for row in words], campaign
+
+
+def percentile(samples, fraction: float) -> float:
+    return sorted(samples)[int(len(samples) * fraction)]
+
+
+def main(args):
+    rng = np.random.default_rng(7)
+    templates = rng.integers(0, len(VOCABULARY), (args.campaigns, WORDS_PER_POST))
+    index = NearDuplicateIndex(
+        threshold=args.threshold,
+        window_seconds=1e9,  # evict by capacity only; the stream runs far faster than real traffic
+        segments=args.segments,
+        segment_capacity=args.segment_capacity,
+    )
+    print(f"index: {args.segments} x {args.segment_capacity:,} texts, {index.stats()['memory_bytes'] / 2**20:.0f} MiB reserved")
+
+    seen_campaigns = set()
+    campaign_posts = campaign_hits = background_posts = background_hits = 0
+    single_us = []
+    indexed = 0
+    scoring = 0.0
+    report_every = max(args.texts // 10, args.batch_size)
+    next_report = report_every
+    while indexed < args.texts:
+        size = min(args.batch_size, args.texts - indexed)
+        texts, campaign = make_batch(rng, templates, size, args.campaign_share)
+
+        start = time.perf_counter()
+        sizes = index.observe_batch(texts[:-1])
+        scoring += time.perf_counter() - start
+        # The last post of each batch goes through the single-text path, timed alone
+        start = time.perf_counter()
+        sizes.append(index.observe(texts[-1]))
+        elapsed = time.perf_counter() - start
+        scoring += elapsed
+        single_us.append(elapsed * 1e6)
+
+        for campaign_id, campaign_size in zip(campaign.tolist(), sizes):
+            if campaign_id < 0:
+                background_posts += 1
+                background_hits += campaign_size > 1
+            elif campaign_id in seen_campaigns:
+                campaign_posts += 1
+                campaign_hits += campaign_size > 1
+            else:
+                seen_campaigns.add(campaign_id)
+        indexed += size
+
+        if indexed >= next_report or indexed == args.texts:
+            next_report += report_every
+            stats = index.stats()
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(f"{indexed:>11,} texts: {indexed / scoring:8.0f} texts/s, "
+                  f"single observe p50 {percentile(single_us, 0.5):6.0f}us p99 {percentile(single_us, 0.99):6.0f}us, "
+                  f"live {stats['indexed']:,}, evicted {stats['evicted']:,}, campaigns {stats['campaigns']:,}, peak RSS {rss:.0f} MiB")
+
+    print(f"campaign recall: {campaign_hits / max(campaign_posts, 1):.3f} of {campaign_posts:,} repeat copies matched")
+    print(f"false matches:   {background_hits / max(background_posts, 1):.5f} of {background_posts:,} background posts")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=10_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--segments", type=int, default=4)
+    parser.add_argument("--segment-capacity", type=int, default=1_000_000)
+    parser.add_argument("--campaigns", type=int, default=2000)
+    parser.add_argument("--campaign-share", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    main(parser.parse_args())
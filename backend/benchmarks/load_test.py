@@ -0,0 +1,108 @@
+"""
+Concurrent load test for the analysis and auth endpoints.
+
+Opens N concurrent clients against a running server and reports latency
+percentiles. Alongside the measured route, a probe client hits `GET /`
+continuously: that route does no I/O, so its tail latency shows how long
+the event loop is being stalled by blocking work in other handlers.
+Run it once against the old build and once against the new one to compare.
+
+Usage (from backend/, with the server running):
+    python -m benchmarks.load_test --token <JWT> --clients 200 --requests 20
+    python -m benchmarks.load_test --route login --email a@b.c --password secret
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, samples: List[float], errors: int, elapsed: float) -> None:
+    print(
+        f"{name:>12}: n={len(samples):>6} errors={errors:>4} "
+        f"rps={len(samples) / elapsed:>8.1f} "
+        f"p50={percentile(samples, 50):>8.1f}ms p99={percentile(samples, 99):>8.1f}ms "
+        f"max={max(samples, default=0):>8.1f}ms mean={statistics.fmean(samples) if samples else 0:>8.1f}ms"
+    )
+
+
+def build_request(args):
+    if args.route == "text":
+        return "POST", "/analyze/text", {"json": {"text": "This is fake news and propaganda"}}
+    if args.route == "login":
+        return "POST", "/auth/login", {"json": {"email": args.email, "password": args.password}}
+    return "GET", "/network/stats", {}
+
+
+async def client_loop(client, method, path, kwargs, count, samples, errors):
+    for _ in range(count):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        samples.append((time.perf_counter() - start) * 1000)
+
+
+async def probe_loop(client, stop, samples):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get("/")
+            samples.append((time.perf_counter() - start) * 1000)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.01)
+
+
+async def main(args):
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.clients + 1, max_keepalive_connections=args.clients + 1)
+    method, path, kwargs = build_request(args)
+
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=60) as client:
+        samples: List[float] = []
+        errors: List[int] = []
+        probe_samples: List[float] = []
+        stop = asyncio.Event()
+
+        probe = asyncio.create_task(probe_loop(client, stop, probe_samples))
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            client_loop(client, method, path, kwargs, args.requests, samples, errors)
+            for _ in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    print(f"{args.clients} clients x {args.requests} requests -> {method} {path}")
+    report(args.route, samples, len(errors), elapsed)
+    report("loop probe", probe_samples, 0, elapsed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", default="")
+    parser.add_argument("--route", choices=["text", "login", "stats"], default="text")
+    parser.add_argument("--email", default="test@example.com")
+    parser.add_argument("--password", default="TestPass123")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
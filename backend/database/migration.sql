@@ -68,8 +68,17 @@ CREATE TABLE IF NOT EXISTS alerts (
 
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
-CREATE INDEX IF NOT EXISTS idx_analysis_logs_user_id ON analysis_logs(user_id);
-CREATE INDEX IF NOT EXISTS idx_analysis_logs_created_at ON analysis_logs(created_at DESC);
+
+-- Composite keyset index for /analyze/history: pages are ordered by
+-- (created_at DESC, id DESC) and resume after the previous page's last row,
+-- so each page is one index range scan however deep it is. It also serves the
+-- user_id foreign key, replacing the single-column index.
+CREATE INDEX IF NOT EXISTS idx_analysis_logs_user_created_id ON analysis_logs(user_id, created_at DESC, id DESC);
+-- Time-ordered scans across all users (the analytics rollup rebuild)
+CREATE INDEX IF NOT EXISTS idx_analysis_logs_created_id ON analysis_logs(created_at DESC, id DESC);
+DROP INDEX IF EXISTS idx_analysis_logs_user_id;
+DROP INDEX IF EXISTS idx_analysis_logs_created_at;
+
 CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts(timestamp DESC);
 CREATE INDEX IF NOT EXISTS idx_alerts_severity ON alerts(severity);
 
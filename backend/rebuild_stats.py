@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Rebuild analytics rollups from the analysis_logs table and print the totals.
+
+The API keeps its rollups in memory; set ANALYTICS_REBUILD_ON_STARTUP=true to
+have each worker replay the log when it starts. This script runs the same
+replay offline, e.g. to check the counters against the table.
+
+Usage:
+    python rebuild_stats.py
+    python rebuild_stats.py --window 7d
+"""
+import argparse
+import asyncio
+import json
+from src.core.config import settings
+from src.services.analytics import analytics_rollups, parse_window
+
+
+async def main(window: str):
+    replayed = await analytics_rollups.rebuild(page_size=settings.ANALYTICS_REBUILD_PAGE_SIZE)
+    print(f"Replayed {replayed} analysis log rows")
+    print(json.dumps(analytics_rollups.totals_summary(), indent=2))
+    if window:
+        print(json.dumps(analytics_rollups.summary(parse_window(window)), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--window", default="", help="Also print the summary for a trailing window, e.g. 24h")
+    args = parser.parse_args()
+    asyncio.run(main(args.window))
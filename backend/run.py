@@ -3,16 +3,185 @@
 Run script for SatyaNetra Backend API
 
 Usage:
-    python run.py
+    python run.py                                 # development: single worker, auto-reload
+    python run.py --mode production --workers 4   # production: pre-forked workers
+
+Production mode imports the app (and the classifier singletons) once in the
+master process, binds the listening socket, then forks the workers so the
+loaded models are shared copy-on-write. Workers run uvloop + httptools.
+SIGTERM/SIGINT drain every worker gracefully (SERVER_GRACEFUL_TIMEOUT) before
+the master exits, and workers still running after that are killed. Workers
+that crash are replaced after a backoff that grows while they keep crashing
+shortly after starting.
 """
+import argparse
+import logging
+import os
+import signal
+import time
+
 import uvicorn
 from src.core.config import settings
 
-if __name__ == "__main__":
+logger = logging.getLogger("satyanetra.run")
+
+
+def run_development(host: str, port: int):
     uvicorn.run(
         "src.main:app",
-        host=settings.API_HOST,
-        port=settings.API_PORT,
+        host=host,
+        port=port,
         reload=True,  # Enable auto-reload during development
         log_level="info"
     )
+
+
+def preload_app():
+    """Import the app and warm the classifier singletons before forking."""
+    start = time.perf_counter()
+    from src.main import app
+    from src.services.text_classifier import text_classifier
+
+    # Importing src.main built both classifier singletons; one call warms lazy state too
+    text_classifier.analyze("warm up")
+    logger.info("Preloaded app and classifiers in %.2fs", time.perf_counter() - start)
+    return app
+
+
+def serve_worker(config: uvicorn.Config, sock, forked_at: float) -> None:
+    """Worker body: run uvicorn on the inherited socket and report startup time."""
+    import asyncio
+
+    server = uvicorn.Server(config)
+
+    async def serve():
+        task = asyncio.ensure_future(server.serve(sockets=[sock]))
+        while not server.started and not task.done():
+            await asyncio.sleep(0.01)
+        if server.started:
+            logger.info("Worker %d ready in %.2fs after fork", os.getpid(), time.perf_counter() - forked_at)
+        await task
+
+    config.setup_event_loop()
+    asyncio.run(serve())
+
+
+def run_production(host: str, port: int, workers: int):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    started = time.perf_counter()
+    app = preload_app()
+
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT,
+        access_log=False,
+        log_level="info"
+    )
+
+    if not hasattr(os, "fork"):
+        # No fork (Windows): fall back to uvicorn's spawn-based workers without preloading
+        uvicorn.run("src.main:app", host=host, port=port, workers=workers, loop="auto", http="auto",
+                    backlog=settings.SERVER_BACKLOG, timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT)
+        return
+
+    if workers > 1:
+        logger.warning("The network graph is kept in each worker's memory: with %d workers, /network/* "
+                       "serves a different graph per worker. Use --workers 1 if you rely on /network/ingest.", workers)
+        logger.warning("Analytics rollups are kept in each worker's memory: with %d workers, /analytics/summary "
+                       "counts only the analyses served by the worker that answers. Use --workers 1 for exact figures.", workers)
+
+    sock = config.bind_socket()
+    children = {}
+    stopping = False
+
+    def spawn():
+        forked_at = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                serve_worker(config, sock, forked_at)
+            finally:
+                os._exit(0)
+        children[pid] = forked_at
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        logger.info("Received %s, draining %d workers", signal.Signals(signum).name, len(children))
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    for _ in range(workers):
+        spawn()
+    logger.info("Master %d serving on http://%s:%d with %d workers (startup %.2fs)",
+                os.getpid(), host, port, workers, time.perf_counter() - started)
+
+    deadline = None
+    respawn_at = []  # monotonic times at which to fork replacement workers
+    crash_streak = 0
+    while children or (respawn_at and not stopping):
+        now = time.monotonic()
+        if stopping:
+            respawn_at.clear()
+            if deadline is None:
+                deadline = now + settings.SERVER_GRACEFUL_TIMEOUT + 5
+            elif now > deadline:
+                for pid in children:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+        while respawn_at and respawn_at[0] <= now:
+            respawn_at.pop(0)
+            spawn()
+
+        # Poll rather than block, so the shutdown deadline and respawns are never missed
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            pid = 0
+        except InterruptedError:
+            continue
+        if pid == 0:
+            time.sleep(0.1)
+            continue
+
+        forked_at = children.pop(pid, None)
+        if not stopping and forked_at is not None:
+            # Workers that die soon after starting are likely to do so again
+            quick = time.perf_counter() - forked_at < settings.SERVER_RESPAWN_MAX_BACKOFF
+            crash_streak = crash_streak + 1 if quick else 1
+            delay = min(settings.SERVER_RESPAWN_BACKOFF * 2 ** (crash_streak - 1), settings.SERVER_RESPAWN_MAX_BACKOFF)
+            logger.warning("Worker %d exited with code %d, restarting in %.1fs", pid, os.waitstatus_to_exitcode(status), delay)
+            respawn_at.append(time.monotonic() + delay)
+
+    sock.close()
+    logger.info("All workers stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the SatyaNetra API")
+    parser.add_argument("--mode", choices=["development", "production"], default=settings.SERVER_MODE)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS)
+    parser.add_argument("--host", default=settings.API_HOST)
+    parser.add_argument("--port", type=int, default=settings.API_PORT)
+    args = parser.parse_args()
+
+    if args.mode == "production":
+        run_production(args.host, args.port, args.workers)
+    else:
+        run_development(args.host, args.port)
@@ -0,0 +1,147 @@
+import asyncio
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from typing import List, Optional
+from ..core.config import settings
+from ..core.database import get_supabase, run_query
+from ..core.security import get_current_user, authenticate_token
+from ..models.alerts import AlertResponse
+from ..services.alerts import alert_broker, SEVERITIES
+
+router = APIRouter(prefix="/alerts", tags=["Alerts"])
+
+# EventSource and browser WebSockets cannot send an Authorization header,
+# so streaming endpoints also accept the access token as ?token=
+stream_security = HTTPBearer(auto_error=False)
+
+
+async def get_stream_user(
+    token: Optional[str] = Query(None, description="Access token, for clients that cannot set headers"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(stream_security)
+) -> dict:
+    if credentials is not None:
+        return authenticate_token(credentials.credentials)
+    if token:
+        return authenticate_token(token)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def subscribe(last_event_id: Optional[int]):
+    try:
+        return alert_broker.subscribe(last_event_id)
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+
+@router.get("", response_model=List[AlertResponse])
+async def list_alerts(
+    severity: Optional[str] = Query(None, pattern=f"^({'|'.join(SEVERITIES)})$"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Most recent stored alerts, newest first. Load once, then follow /alerts/stream.
+    """
+    query = get_supabase().table("alerts").select("id, title, description, severity, timestamp")
+    if severity is not None:
+        query = query.eq("severity", severity)
+    result = await run_query(query.order("timestamp", desc=True).limit(limit))
+    return result.data or []
+
+
+@router.get("/stream")
+async def stream_alerts(
+    last_event_id: Optional[int] = Header(None, alias="Last-Event-ID"),
+    current_user: dict = Depends(get_stream_user)
+):
+    """
+    Server-Sent Events stream of new alerts (event name "alert", data is an AlertResponse).
+    Reconnecting clients send Last-Event-ID (EventSource does this automatically)
+    and receive the alerts they missed, as long as they are still buffered.
+
+    Frontend Integration:
+    ```javascript
+    const source = new EventSource(`http://localhost:8000/alerts/stream?token=${accessToken}`);
+    source.addEventListener('alert', (event) => {
+      const alert = JSON.parse(event.data);
+      console.log(alert.severity, alert.title);
+    });
+    ```
+    """
+    subscription = subscribe(last_event_id)
+
+    async def events():
+        try:
+            # Tell EventSource to reconnect quickly if the connection drops
+            yield b"retry: 2000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), settings.ALERT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield b": keep-alive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield message.sse
+        finally:
+            alert_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws")
+async def alerts_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None),
+    last_event_id: Optional[int] = Query(None)
+):
+    """
+    WebSocket stream of new alerts; each text message is an AlertResponse as JSON.
+    Authenticate with ?token=<access token>.
+
+    Frontend Integration:
+    ```javascript
+    const socket = new WebSocket(`ws://localhost:8000/alerts/ws?token=${accessToken}`);
+    socket.onmessage = (event) => console.log(JSON.parse(event.data));
+    ```
+    """
+    try:
+        authenticate_token(token or "")
+        subscription = alert_broker.subscribe(last_event_id)
+    except (HTTPException, OverflowError):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    async def watch_disconnect():
+        # Clients only listen; a receive returning means they went away
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        finally:
+            alert_broker.unsubscribe(subscription)
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        while (message := await subscription.get()) is not None:
+            await websocket.send_text(message.json)
+        if subscription.close_reason == "slow consumer":
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        elif subscription.close_reason == "shutdown":
+            await websocket.close(code=status.WS_1001_GOING_AWAY)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        watcher.cancel()
+        alert_broker.unsubscribe(subscription)
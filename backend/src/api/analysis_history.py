@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Any, Optional
+from ..core.config import settings
+from ..core.security import get_current_user
+from ..services.analysis_history import analysis_history, parse_fields
+
+router = APIRouter(prefix="/analyze", tags=["Analysis"])
+
+
+@router.get("/history")
+async def get_analysis_history(
+    analysis_type: Optional[str] = Query(None, pattern="^(text|meme)$"),
+    result_label: Optional[str] = Query(None),
+    min_score: Optional[float] = Query(None, ge=0, le=1),
+    max_score: Optional[float] = Query(None, ge=0, le=1),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. result_label,result_score"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=settings.HISTORY_PAGE_MAX_LIMIT),
+    current_user: dict = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Your analysis history, newest first.
+    Follow next_cursor until it is null to page through the full (filtered) history;
+    every page costs the same however deep it is.
+
+    Frontend Integration:
+    ```javascript
+    const params = new URLSearchParams({ analysis_type: 'text', min_score: 0.6, fields: 'result_label,result_score' });
+    const response = await fetch(`http://localhost:8000/analyze/history?${params}`, {
+      method: 'GET',
+      headers: {
+        'Authorization': `Bearer ${accessToken}`
+      }
+    });
+    const history = await response.json();
+    // history.items: rows with id, created_at and the requested fields
+    // history.next_cursor: pass as ?cursor= to fetch the next page, null on the last page
+    ```
+    """
+    if min_score is not None and max_score is not None and min_score > max_score:
+        raise HTTPException(status_code=400, detail="min_score cannot be greater than max_score")
+
+    try:
+        return await analysis_history.page(
+            user_id=current_user["user_id"],
+            analysis_type=analysis_type,
+            result_label=result_label,
+            min_score=min_score,
+            max_score=max_score,
+            fields=parse_fields(fields),
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
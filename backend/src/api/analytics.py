@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Any, Optional
+from ..core.security import get_current_user
+from ..services.analytics import analytics_rollups, parse_window
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/summary")
+async def get_analytics_summary(
+    window: str = Query("24h", description="Trailing window, e.g. 15m, 24h or 7d"),
+    analysis_type: Optional[str] = Query(None, pattern="^(text|meme)$"),
+    current_user: dict = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Per-label distribution of analyses over a trailing time window.
+    Served from in-memory rollups (per minute, hour and day), never from analysis_logs.
+
+    Frontend Integration:
+    ```javascript
+    const response = await fetch('http://localhost:8000/analytics/summary?window=7d', {
+      method: 'GET',
+      headers: {
+        'Authorization': `Bearer ${accessToken}`
+      }
+    });
+    const summary = await response.json();
+    console.log('Analyses:', summary.total, 'By label:', summary.by_label);
+    // summary.series: [{start, analyses}] per bucket, for trend charts
+    ```
+    """
+    try:
+        window_seconds = parse_window(window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return analytics_rollups.summary(window_seconds, analysis_type)
@@ -0,0 +1,212 @@
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid5
+from ..core.admission import admission, text_count
+from ..core.config import settings
+from ..core.executors import run_cpu
+from ..core.security import get_current_user
+from ..models.analysis_logs import AnalysisLogCreate
+from ..services.image_io import read_upload_limited, ImageTooLargeError
+from ..services.job_queue import job_queue, job_workers, JobQueueFullError
+from ..services.log_sink import analysis_log_sink
+from ..services.near_duplicates import campaign_text_batch_analysis
+from ..services.result_cache import cached_meme_analysis
+
+router = APIRouter(prefix="/analyze/jobs", tags=["Analysis Jobs"])
+
+
+class TextJobRequest(BaseModel):
+    texts: List[str]
+    priority: int = Field(0, ge=0, le=9)
+
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    queued_ahead: int
+
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str  # 'queued', 'running', 'succeeded' or 'failed'
+    priority: int
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+
+async def submit_job(kind: str, user_id: str, payload: bytes, params: Dict[str, Any], priority: int) -> JobSubmitResponse:
+    try:
+        submitted = await job_queue.submit(kind, user_id, payload, params, priority)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    job_workers.notify()
+    return JobSubmitResponse(**submitted)
+
+
+async def get_own_job(job_id: str, user_id: str) -> Dict[str, Any]:
+    job = await job_queue.get(job_id)
+    # Other users' jobs are indistinguishable from unknown ones
+    if job is None or job["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+
+@router.post("/text", response_model=JobSubmitResponse, status_code=202)
+async def submit_text_job(
+    request: TextJobRequest,
+    current_user: dict = Depends(admission("analyze_jobs_text", cost=text_count))
+):
+    """
+    Queue a bulk text analysis and return a job ID immediately.
+    Poll GET /analyze/jobs/{job_id} until the status is succeeded or failed,
+    then fetch GET /analyze/jobs/{job_id}/result.
+    Higher priority (0-9) jobs run first.
+
+    Frontend Integration:
+    ```javascript
+    const response = await fetch('http://localhost:8000/analyze/jobs/text', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${accessToken}`
+      },
+      body: JSON.stringify({ texts: posts, priority: 5 })
+    });
+    const { job_id } = await response.json();
+    ```
+    """
+    if not request.texts:
+        raise HTTPException(status_code=400, detail="Texts cannot be empty")
+    if len(request.texts) > settings.JOB_MAX_TEXTS:
+        raise HTTPException(status_code=413, detail=f"Too many texts (max {settings.JOB_MAX_TEXTS} per job)")
+
+    payload = json.dumps(request.texts).encode("utf-8")
+    return await submit_job("text", current_user["user_id"], payload, {}, request.priority)
+
+
+@router.post("/meme", response_model=JobSubmitResponse, status_code=202)
+async def submit_meme_job(
+    file: UploadFile = File(...),
+    priority: int = Form(0, ge=0, le=9),
+    current_user: dict = Depends(admission("analyze_jobs_meme"))
+):
+    """Queue an image analysis and return a job ID immediately (poll as for text jobs)."""
+    if not file.content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="File must be an image")
+    try:
+        image_bytes = await read_upload_limited(file, settings.MEME_MAX_UPLOAD_BYTES, settings.UPLOAD_CHUNK_SIZE)
+    except ImageTooLargeError:
+        raise HTTPException(status_code=400, detail=settings.meme_upload_limit_detail)
+
+    return await submit_job("meme", current_user["user_id"], image_bytes, {"filename": file.filename}, priority)
+
+
+@router.get("/stats")
+async def get_job_stats(current_user: dict = Depends(get_current_user)) -> Dict[str, int]:
+    """Queue depth: job counts per status, shared by every worker on this host."""
+    return await job_queue.stats()
+
+
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Status of one of your jobs."""
+    job = await get_own_job(job_id, current_user["user_id"])
+    return JobStatusResponse(
+        job_id=job["id"],
+        **{key: job[key] for key in ("kind", "status", "priority", "attempts", "error")},
+        **{key: datetime.utcfromtimestamp(job[key]) if job[key] is not None else None
+           for key in ("created_at", "started_at", "finished_at", "expires_at")}
+    )
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str, current_user: dict = Depends(get_current_user)) -> Dict[str, Any]:
+    """Result of a finished job: {"job_id", "kind", "results": [...]}; 409 while it is still pending."""
+    job = await get_own_job(job_id, current_user["user_id"])
+    if job["status"] == "failed":
+        raise HTTPException(status_code=422, detail=f"Job failed after {job['attempts']} attempts: {job['error']}")
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return {"job_id": job["id"], "kind": job["kind"], "results": job["result"]}
+
+
+def job_log_id(job: Dict[str, Any], index: int) -> str:
+    """
+    Analysis log id for the index-th input of a job. Deterministic, so a job
+    that is retried after its logs were written upserts the same rows
+    instead of duplicating them.
+    """
+    return str(uuid5(UUID(job["id"]), str(index)))
+
+
+async def run_text_job(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    texts = json.loads(job["payload"])
+    results: List[Dict[str, Any]] = [{"index": index, "error": "Text cannot be empty"} for index in range(len(texts))]
+    valid_indices = [index for index, text in enumerate(texts) if text.strip()]
+
+    # Score in chunks so one bulk job cannot monopolize the CPU pool
+    chunk_size = settings.ANALYZE_BATCH_MAX_SIZE
+    analysis_results: List[Dict[str, Any]] = []
+    for start in range(0, len(valid_indices), chunk_size):
+        chunk = valid_indices[start:start + chunk_size]
+        # Keyed by log id, so a retried attempt does not add its texts to the campaign index again
+        analysis_results.extend(await run_cpu(
+            campaign_text_batch_analysis, [texts[index] for index in chunk], [job_log_id(job, index) for index in chunk]
+        ))
+
+    # Log only once every text is scored, so a failed attempt leaves no rows behind
+    log_entries = [
+        AnalysisLogCreate(
+            id=job_log_id(job, index),
+            user_id=job["user_id"],
+            input_data=texts[index][:500],  # Store first 500 chars
+            result_score=analysis_result["score"],
+            result_label=analysis_result["label"],
+            analysis_type="text"
+        )
+        for index, analysis_result in zip(valid_indices, analysis_results)
+    ]
+    # Up to JOB_MAX_TEXTS rows: queue them in chunks as the sink drains, leaving room for live requests
+    accepted = await analysis_log_sink.submit_bulk(log_entries, settings.JOB_LOG_ENQUEUE_TIMEOUT)
+
+    for index, analysis_result, log_entry, log_accepted in zip(valid_indices, analysis_results, log_entries, accepted):
+        results[index] = {
+            "index": index,
+            "score": analysis_result["score"],
+            "label": analysis_result["label"],
+            "explanation": analysis_result["explanation"],
+            "indicators": analysis_result["indicators"],
+            "campaign_size": analysis_result["campaign_size"],
+            "analysis_id": log_entry.id if log_accepted else "unknown",
+        }
+    return results
+
+
+async def run_meme_job(job: Dict[str, Any]) -> List[Dict[str, Any]]:
+    filename = job["params"].get("filename")
+    # An undecodable image is a result ("Analysis Failed"), as on /analyze/meme;
+    # only exceptions (e.g. a crashed worker process) are retried
+    analysis_result = await run_cpu(cached_meme_analysis, job["payload"], filename)
+
+    log_entry = AnalysisLogCreate(
+        id=job_log_id(job, 0),
+        user_id=job["user_id"],
+        input_data=f"Image: {filename} ({analysis_result.get('image_size', 'unknown')})",
+        result_score=analysis_result["score"],
+        result_label=analysis_result["label"],
+        analysis_type="meme"
+    )
+    accepted = await analysis_log_sink.submit(log_entry)
+    return [{**analysis_result, "analysis_id": log_entry.id if accepted else "unknown"}]
+
+
+job_workers.register("text", run_text_job)
+job_workers.register("meme", run_meme_job)
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from pydantic import BaseModel
-from datetime import datetime
-from ..core.security import get_current_user
-from ..core.database import get_supabase
-from ..services.meme_classifier import meme_classifier
+from ..core.config import settings
+from ..core.admission import admission
+from ..models.analysis_logs import AnalysisLogCreate
+from ..services.batching import meme_batcher
+from ..services.image_io import read_upload_limited, ImageTooLargeError
+from ..services.log_sink import analysis_log_sink
 
 router = APIRouter(prefix="/analyze", tags=["Analysis"])
 
@@ -20,7 +22,7 @@ class MemeAnalysisResponse(BaseModel):
 @router.post("/meme", response_model=MemeAnalysisResponse)
 async def analyze_meme(
     file: UploadFile = File(...),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(admission("analyze_meme"))
 ):
     """
     Analyze uploaded meme/image for harmful content.
@@ -45,29 +47,27 @@ async def analyze_meme(
     if not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="File must be an image")
 
-    # Read image bytes
-    image_bytes = await file.read()
+    # Read image bytes in chunks, stopping as soon as the size limit is crossed
+    try:
+        image_bytes = await read_upload_limited(file, settings.MEME_MAX_UPLOAD_BYTES, settings.UPLOAD_CHUNK_SIZE)
+    except ImageTooLargeError:
+        raise HTTPException(status_code=400, detail=settings.meme_upload_limit_detail)
 
-    if len(image_bytes) > 10 * 1024 * 1024:  # 10MB limit
-        raise HTTPException(status_code=400, detail="Image file too large (max 10MB)")
+    # Analyze image using classifier service (micro-batched with concurrent requests, cached for repeated content)
+    analysis_result = await meme_batcher.submit((image_bytes, file.filename))
 
-    # Analyze image using classifier service
-    analysis_result = meme_classifier.analyze(image_bytes, file.filename)
-
-    # Store analysis log in database
-    supabase = get_supabase()
-    log_entry = {
-        "user_id": current_user["user_id"],
-        "input_data": f"Image: {file.filename} ({analysis_result.get('image_size', 'unknown')})",
-        "result_score": analysis_result["score"],
-        "result_label": analysis_result["label"],
-        "analysis_type": "meme",
-        "created_at": datetime.utcnow().isoformat()
-    }
+    # Queue analysis log for write-behind storage
+    log_entry = AnalysisLogCreate(
+        user_id=current_user["user_id"],
+        input_data=f"Image: {file.filename} ({analysis_result.get('image_size', 'unknown')})",
+        result_score=analysis_result["score"],
+        result_label=analysis_result["label"],
+        analysis_type="meme"
+    )
 
-    log_result = supabase.table("analysis_logs").insert(log_entry).execute()
+    accepted = await analysis_log_sink.submit(log_entry)
 
-    analysis_id = log_result.data[0]["id"] if log_result.data else "unknown"
+    analysis_id = log_entry.id if accepted else "unknown"
 
     return MemeAnalysisResponse(
         score=analysis_result["score"],
@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from datetime import datetime
-from ..core.security import get_current_user
-from ..core.database import get_supabase
-from ..services.text_classifier import text_classifier
+from typing import List, Optional
+from ..core.config import settings
+from ..core.admission import admission, text_count
+from ..core.executors import run_cpu
+from ..models.analysis_logs import AnalysisLogCreate
+from ..services.near_duplicates import campaign_text_batch_analysis
+from ..services.batching import text_batcher
+from ..services.log_sink import analysis_log_sink
 
 router = APIRouter(prefix="/analyze", tags=["Analysis"])
 
@@ -17,13 +21,33 @@ class TextAnalysisResponse(BaseModel):
     label: str
     explanation: str
     indicators: int
+    campaign_size: int  # near-duplicates of this text analyzed recently, itself included
     analysis_id: str
 
 
+class TextBatchAnalysisRequest(BaseModel):
+    texts: List[str]
+
+
+class TextBatchItemResult(BaseModel):
+    index: int
+    score: Optional[float] = None
+    label: Optional[str] = None
+    explanation: Optional[str] = None
+    indicators: Optional[int] = None
+    campaign_size: Optional[int] = None
+    analysis_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TextBatchAnalysisResponse(BaseModel):
+    results: List[TextBatchItemResult]
+
+
 @router.post("/text", response_model=TextAnalysisResponse)
 async def analyze_text(
     request: TextAnalysisRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(admission("analyze_text"))
 ):
     """
     Analyze text content for propaganda, misinformation, and harmful content.
@@ -45,28 +69,100 @@ async def analyze_text(
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
 
-    # Analyze text using classifier service
-    analysis_result = text_classifier.analyze(request.text)
+    # Analyze text using classifier service (micro-batched with concurrent requests, cached for repeated content)
+    analysis_result = await text_batcher.submit(request.text)
 
-    # Store analysis log in database
-    supabase = get_supabase()
-    log_entry = {
-        "user_id": current_user["user_id"],
-        "input_data": request.text[:500],  # Store first 500 chars
-        "result_score": analysis_result["score"],
-        "result_label": analysis_result["label"],
-        "analysis_type": "text",
-        "created_at": datetime.utcnow().isoformat()
-    }
+    # Queue analysis log for write-behind storage
+    log_entry = AnalysisLogCreate(
+        user_id=current_user["user_id"],
+        input_data=request.text[:500],  # Store first 500 chars
+        result_score=analysis_result["score"],
+        result_label=analysis_result["label"],
+        analysis_type="text"
+    )
 
-    log_result = supabase.table("analysis_logs").insert(log_entry).execute()
+    accepted = await analysis_log_sink.submit(log_entry)
 
-    analysis_id = log_result.data[0]["id"] if log_result.data else "unknown"
+    analysis_id = log_entry.id if accepted else "unknown"
 
     return TextAnalysisResponse(
         score=analysis_result["score"],
         label=analysis_result["label"],
         explanation=analysis_result["explanation"],
         indicators=analysis_result["indicators"],
+        campaign_size=analysis_result["campaign_size"],
         analysis_id=analysis_id
     )
+
+
+@router.post("/text/batch", response_model=TextBatchAnalysisResponse)
+async def analyze_text_batch(
+    request: TextBatchAnalysisRequest,
+    current_user: dict = Depends(admission("analyze_text_batch", cost=text_count))
+):
+    """
+    Analyze a batch of texts in a single request.
+    Results are returned in input order; invalid items carry an error instead of a score.
+
+    Frontend Integration:
+    ```javascript
+    const response = await fetch('http://localhost:8000/analyze/text/batch', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${accessToken}`
+      },
+      body: JSON.stringify({ texts: ["First post...", "Second post..."] })
+    });
+    const { results } = await response.json();
+    results.forEach(r => console.log(r.index, r.error || r.label));
+    ```
+    """
+    if not request.texts:
+        raise HTTPException(status_code=400, detail="Texts cannot be empty")
+
+    if len(request.texts) > settings.ANALYZE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large (max {settings.ANALYZE_BATCH_MAX_SIZE} texts)"
+        )
+
+    results = [TextBatchItemResult(index=index) for index in range(len(request.texts))]
+
+    valid_indices = []
+    for index, text in enumerate(request.texts):
+        if text.strip():
+            valid_indices.append(index)
+        else:
+            results[index].error = "Text cannot be empty"
+
+    if not valid_indices:
+        return TextBatchAnalysisResponse(results=results)
+
+    # Score every valid text in one batched classifier call
+    analysis_results = await run_cpu(campaign_text_batch_analysis, [request.texts[index] for index in valid_indices])
+
+    # Queue all analysis logs; the sink writes them out in bulk inserts
+    log_entries = [
+        AnalysisLogCreate(
+            user_id=current_user["user_id"],
+            input_data=request.texts[index][:500],  # Store first 500 chars
+            result_score=analysis_result["score"],
+            result_label=analysis_result["label"],
+            analysis_type="text"
+        )
+        for index, analysis_result in zip(valid_indices, analysis_results)
+    ]
+
+    accepted = await analysis_log_sink.submit_many(log_entries)
+
+    for index, analysis_result, log_entry, log_accepted in zip(valid_indices, analysis_results, log_entries, accepted):
+        item = results[index]
+        item.score = analysis_result["score"]
+        item.label = analysis_result["label"]
+        item.explanation = analysis_result["explanation"]
+        item.indicators = analysis_result["indicators"]
+        item.campaign_size = analysis_result["campaign_size"]
+        item.analysis_id = log_entry.id if log_accepted else "unknown"
+
+    return TextBatchAnalysisResponse(results=results)
@@ -1,49 +1,50 @@
+import logging
 from fastapi import APIRouter, HTTPException, status
-from datetime import datetime
 from ..models.users import UserCreate, UserLogin, UserResponse, TokenResponse
-from ..core.security import get_password_hash, verify_password, create_access_token
-from ..core.database import get_supabase
+from ..core.security import get_password_hash, verify_and_update_password, create_access_token
+from ..core.executors import run_password, ExecutorSaturatedError
+from ..services.user_repository import user_repository, EmailAlreadyRegisteredError
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+async def hash_in_pool(func, *args):
+    """Run bcrypt on the dedicated password pool; a full queue becomes a 503."""
+    try:
+        return await run_password(func, *args)
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry",
+            headers={"Retry-After": "1"}
+        )
+
+
 @router.post("/signup", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def signup(user_data: UserCreate):
     """
     Register a new user.
     Creates user in Supabase and returns JWT token.
     """
-    supabase = get_supabase()
+    # Hash password
+    hashed_password = await hash_in_pool(get_password_hash, user_data.password)
 
-    # Check if user already exists
-    existing = supabase.table("users").select("*").eq("email", user_data.email).execute()
-    if existing.data:
+    # Single insert; the unique email index rejects existing accounts
+    try:
+        created_user = await user_repository.create(user_data.name, user_data.email, hashed_password)
+    except EmailAlreadyRegisteredError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
-
-    # Hash password
-    hashed_password = get_password_hash(user_data.password)
-
-    # Insert user into database
-    new_user = {
-        "name": user_data.name,
-        "email": user_data.email,
-        "password_hash": hashed_password,
-        "created_at": datetime.utcnow().isoformat()
-    }
-
-    result = supabase.table("users").insert(new_user).execute()
-
-    if not result.data:
+    except RuntimeError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create user"
         )
 
-    created_user = result.data[0]
-
     # Create access token
     access_token = create_access_token(data={"sub": created_user["id"], "email": created_user["email"]})
 
@@ -64,26 +65,30 @@ async def login(credentials: UserLogin):
     Login with email and password.
     Returns JWT token on success.
     """
-    supabase = get_supabase()
+    # Find user by email (cached briefly, credential columns only)
+    user = await user_repository.get_by_email(credentials.email)
 
-    # Find user by email
-    result = supabase.table("users").select("*").eq("email", credentials.email).execute()
-
-    if not result.data:
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
-    user = result.data[0]
-
     # Verify password
-    if not verify_password(credentials.password, user["password_hash"]):
+    valid, new_hash = await hash_in_pool(verify_and_update_password, credentials.password, user["password_hash"])
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
 
+    # Transparently upgrade hashes made with an older cost factor
+    if new_hash:
+        try:
+            await user_repository.update_password_hash(user, new_hash)
+        except Exception:
+            logger.exception("Failed to upgrade password hash for user %s", user["id"])
+
     # Create access token
     access_token = create_access_token(data={"sub": user["id"], "email": user["email"]})
 
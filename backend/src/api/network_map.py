@@ -1,20 +1,63 @@
-from fastapi import APIRouter, Depends
-from typing import Dict, List, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import Dict, List, Any, Literal, Optional
+from ..core.config import settings
 from ..core.security import get_current_user
+from ..core.executors import run_cpu
+from ..services.graph_store import GraphCapacityError
 from ..services.network_graph import network_graph_service
 
 router = APIRouter(prefix="/network", tags=["Network Analysis"])
 
 
+class GraphNode(BaseModel):
+    id: str
+    type: Optional[Literal["bot_account", "suspicious_account", "normal_account", "post"]] = None
+    label: Optional[str] = None
+    risk_score: Optional[float] = None
+    follower_count: Optional[int] = None
+    engagement: Optional[int] = None
+    sentiment: Optional[str] = None
+
+
+class GraphEdge(BaseModel):
+    source: str
+    target: str
+    relationship: Literal["created", "shared", "amplified", "coordinated_with"]
+
+
+class GraphIngestRequest(BaseModel):
+    nodes: List[GraphNode] = []
+    edges: List[GraphEdge] = []
+
+
+class GraphIngestResponse(BaseModel):
+    nodes_upserted: int
+    edges_ingested: int
+    edges_rejected: int
+
+
 @router.get("/map")
-async def get_network_map(current_user: dict = Depends(get_current_user)) -> Dict[str, Any]:
+async def get_network_map(
+    center: Optional[str] = Query(None, description="Only return the k-hop neighbourhood of this node"),
+    hops: int = Query(1, ge=1, le=3),
+    cluster: Optional[str] = Query(None, description="Only return members of this cluster, e.g. cluster_12"),
+    min_risk: Optional[float] = Query(None, ge=0, le=1),
+    node_type: Optional[str] = Query(None, alias="type"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(1000, ge=1, le=settings.GRAPH_PAGE_MAX_LIMIT),
+    current_user: dict = Depends(get_current_user)
+) -> Dict[str, Any]:
     """
     Get bot network visualization data.
-    Returns graph structure with nodes and edges for network mapping.
+    Returns one page of the graph structure with nodes and edges for network mapping.
+    Follow next_cursor until it is null to load the whole (filtered) graph.
 
     Frontend Integration:
     ```javascript
-    const response = await fetch('http://localhost:8000/network/map', {
+    const params = new URLSearchParams({ min_risk: 0.6, limit: 500 });
+    const response = await fetch(`http://localhost:8000/network/map?${params}`, {
       method: 'GET',
       headers: {
         'Authorization': `Bearer ${accessToken}`
@@ -23,9 +66,10 @@ async def get_network_map(current_user: dict = Depends(get_current_user)) -> Dic
     const networkData = await response.json();
 
     // networkData contains:
-    // - nodes: array of {id, label, type, risk_score, ...}
-    // - edges: array of {source, target, relationship}
-    // - clusters: array of identified bot networks
+    // - nodes: array of {id, label, type, risk_score, cluster, ...}
+    // - edges: array of {source, target, relationship, weight}
+    // - clusters: clusters the nodes on this page belong to
+    // - next_cursor: pass as ?cursor= to fetch the next page, null on the last page
 
     // Use this data with D3.js, Cytoscape.js, or similar graph library
     console.log('Nodes:', networkData.nodes.length);
@@ -33,11 +77,87 @@ async def get_network_map(current_user: dict = Depends(get_current_user)) -> Dic
     console.log('Clusters:', networkData.clusters);
     ```
 
-    In production, this would query Neo4j graph database for real bot network relationships.
-    Currently returns sample data for demonstration.
+    Served from the in-process graph store, which is kept up to date through /network/ingest.
+    """
+    try:
+        return await run_cpu(
+            network_graph_service.query_graph,
+            center=center,
+            hops=hops,
+            cluster=cluster,
+            min_risk=min_risk,
+            node_type=node_type,
+            cursor=cursor,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/map/stream")
+async def stream_network_map(
+    center: Optional[str] = Query(None),
+    hops: int = Query(1, ge=1, le=3),
+    cluster: Optional[str] = Query(None),
+    min_risk: Optional[float] = Query(None, ge=0, le=1),
+    node_type: Optional[str] = Query(None, alias="type"),
+    cursor: Optional[str] = Query(None),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Stream the (filtered) graph as newline-delimited JSON, one record per line:
+    {"kind": "node", ...}, {"kind": "edge", ...}, {"kind": "cluster", ...} and a final {"kind": "end"}.
+    Accepts the same filters as /network/map.
+
+    Frontend Integration:
+    ```javascript
+    const response = await fetch('http://localhost:8000/network/map/stream?type=bot_account', {
+      headers: { 'Authorization': `Bearer ${accessToken}` }
+    });
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    // Split chunks on '\\n' and JSON.parse each line as it arrives
+    ```
     """
-    graph_data = network_graph_service.generate_sample_graph()
-    return graph_data
+    try:
+        lines = await run_cpu(
+            network_graph_service.stream_graph,
+            center=center,
+            hops=hops,
+            cluster=cluster,
+            min_risk=min_risk,
+            node_type=node_type,
+            cursor=cursor,
+            chunk_size=settings.GRAPH_PAGE_MAX_LIMIT
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Starlette iterates synchronous generators in its thread pool
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.get("/map/summary")
+async def get_network_summary(
+    zoom: int = Query(0, ge=0, le=settings.GRAPH_LOD_MAX_ZOOM),
+    current_user: dict = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """
+    Level-of-detail network view for large graphs.
+    Communities are collapsed into super-nodes with precomputed x/y coordinates
+    (unit square) and aggregated edge weights; higher zoom levels show more clusters.
+
+    Frontend Integration:
+    ```javascript
+    const response = await fetch('http://localhost:8000/network/map/summary?zoom=0', {
+      headers: { 'Authorization': `Bearer ${accessToken}` }
+    });
+    const summary = await response.json();
+    // summary.nodes: [{id, label, type: 'cluster' | 'other', member_count, x, y, ...}]
+    // summary.edges: [{source, target, weight}]
+    // Render with fixed positions; load /network/map?cluster=<id> when the user drills in
+    ```
+    """
+    return await run_cpu(network_graph_service.get_summary, zoom)
 
 
 @router.get("/stats")
@@ -58,11 +178,42 @@ async def get_network_stats(current_user: dict = Depends(get_current_user)) -> D
     console.log('Suspicious Accounts:', stats.suspicious_accounts);
     ```
     """
-    return {
-        "total_networks": 32,
-        "suspicious_accounts": 1834,
-        "active_campaigns": 12,
-        "high_risk_clusters": 8,
-        "analyzed_posts": 45200,
-        "detection_rate": 0.87
-    }
+    return network_graph_service.get_stats()
+
+
+@router.post("/ingest", response_model=GraphIngestResponse)
+async def ingest_network_data(
+    request: GraphIngestRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Incrementally ingest accounts, posts and their relationships.
+    Endpoints referenced by edges are created on the fly; repeated edges increase the edge weight.
+
+    Frontend Integration:
+    ```javascript
+    const response = await fetch('http://localhost:8000/network/ingest', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${accessToken}`
+      },
+      body: JSON.stringify({
+        nodes: [{ id: "user_42", type: "bot_account", risk_score: 0.91 }],
+        edges: [{ source: "user_42", target: "post_7", relationship: "shared" }]
+      })
+    });
+    ```
+    """
+    try:
+        result = await run_cpu(
+            network_graph_service.ingest,
+            [node.model_dump(exclude_none=True) for node in request.nodes],
+            [edge.model_dump() for edge in request.edges]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except GraphCapacityError as e:
+        raise HTTPException(status_code=507, detail=str(e))
+
+    return GraphIngestResponse(**result)
@@ -0,0 +1,289 @@
+import asyncio
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+from fastapi import Depends, HTTPException, Request, status
+from .config import settings
+from .metrics import registry
+from .security import get_current_user
+
+# Shared bucket slot: key hash, tokens, last refill (wall clock)
+_SLOT = struct.Struct("<Qdd")
+
+
+class LoadShedError(RuntimeError):
+    """Raised when a request is rejected instead of queued."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets: each key may spend `rate` tokens per second with
+    bursts of up to `burst`. Buckets live in this worker's memory, or, with
+    shared_path, in a memory-mapped file (ideally under /dev/shm) so every
+    worker on the host draws from the same bucket. Shared buckets are
+    fixed hashed slots updated under a byte-range lock; two keys that hash
+    to the same slot simply take it over from each other.
+    A request costing more than burst is let through once the bucket is full
+    and empties it, so it is never refused forever and never leaves the key
+    waiting longer than a full refill.
+    """
+
+    def __init__(self, rate: float, burst: float, shared_path: Optional[str] = None, max_entries: int = 100000, slots: int = 65536):
+        self.rate = rate
+        self.burst = burst
+        self.max_entries = max_entries
+        self.slots = slots
+        self._buckets: Dict[str, list] = {}  # key -> [tokens, updated]
+
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        if shared_path:
+            self._fd = os.open(shared_path, os.O_RDWR | os.O_CREAT, 0o600)
+            size = slots * _SLOT.size
+            if os.fstat(self._fd).st_size < size:
+                os.ftruncate(self._fd, size)
+            self._map = mmap.mmap(self._fd, size)
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """Spend cost tokens. Returns 0.0 if allowed, else seconds until enough tokens accrue."""
+        needed = min(cost, self.burst)
+        if self._map is not None:
+            return self._acquire_shared(key, cost, needed)
+
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_entries:
+                self._evict_idle(now)
+            bucket = self._buckets[key] = [self.burst, now]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= needed:
+            bucket[0] = tokens - needed
+            return 0.0
+        bucket[0] = tokens
+        return (needed - tokens) / self.rate
+
+    def _acquire_shared(self, key: str, cost: float, needed: float) -> float:
+        key_hash = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little") or 1
+        offset = (key_hash % self.slots) * _SLOT.size
+        now = time.time()
+        # fcntl locks are per process; within a worker only the event loop calls this
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, _SLOT.size, offset)
+        try:
+            slot_hash, tokens, updated = _SLOT.unpack_from(self._map, offset)
+            if slot_hash != key_hash:
+                tokens, updated = self.burst, now
+            tokens = min(self.burst, tokens + max(now - updated, 0.0) * self.rate)
+            allowed = tokens >= needed
+            if allowed:
+                tokens -= needed
+            _SLOT.pack_into(self._map, offset, key_hash, tokens, now)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, _SLOT.size, offset)
+        return 0.0 if allowed else (needed - tokens) / self.rate
+
+    def _evict_idle(self, now: float) -> None:
+        # A bucket idle long enough to have refilled is the same as a missing one
+        full_after = self.burst / self.rate
+        for key in [key for key, (_, updated) in self._buckets.items() if now - updated >= full_after]:
+            del self._buckets[key]
+        if len(self._buckets) >= self.max_entries:
+            self._buckets.clear()
+
+
+class AdmissionController:
+    """
+    Concurrency limit with a CoDel-style queue for one route.
+    Up to max_concurrency requests run at once; the rest wait in a FIFO of at
+    most max_queue. Waiting is bounded by a timeout that adapts to load: while
+    the queue has been drained at least once in the last `interval`, a waiter
+    may wait up to `interval`; once it has stayed non-empty for longer than
+    that (a standing queue, i.e. sustained overload) the timeout drops to
+    `target`, so excess requests are shed in milliseconds instead of piling
+    up latency for everyone.
+    """
+
+    def __init__(self, name: str, max_concurrency: int = 32, max_queue: int = 128, target: float = 0.05, interval: float = 0.5):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.target = target
+        self.interval = interval
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_empty = time.monotonic()
+
+        # Metrics
+        self.admitted = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+
+    @property
+    def overloaded(self) -> bool:
+        return bool(self._waiters) and time.monotonic() - self._last_empty > self.interval
+
+    async def acquire(self) -> None:
+        """Wait for a slot; raises LoadShedError when the request should be rejected."""
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            self._last_empty = time.monotonic()
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed["queue_full"] += 1
+            raise LoadShedError("queue_full")
+
+        timeout = self.target if self.overloaded else self.interval
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # release() hands its slot straight to the waiter
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self.shed["queue_timeout"] += 1
+            raise LoadShedError("queue_timeout")
+        except asyncio.CancelledError:
+            # The client went away; give back a slot that was already handed over
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+        self.admitted += 1
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                # Handing the slot to the last waiter drains the queue too
+                if not self._waiters:
+                    self._last_empty = time.monotonic()
+                return
+        self.in_flight -= 1
+        self._last_empty = time.monotonic()
+
+    def stats(self) -> Dict[str, any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.admitted,
+            "overloaded": self.overloaded,
+            **{f"shed_{reason}": count for reason, count in self.shed.items()},
+        }
+
+
+def text_count(body: Any) -> int:
+    """Texts in a {"texts": [...]} request body, charged to the per-user text bucket."""
+    texts = body.get("texts") if isinstance(body, dict) else None
+    return max(len(texts), 1) if isinstance(texts, list) else 1
+
+
+def admission(route: str, cost: Optional[Callable[[Any], float]] = None):
+    """
+    Dependency for analysis routes: authenticates, applies the caller's rate
+    limit (429) and the route's concurrency limit (503), and holds the
+    concurrency slot until the request finishes. Yields the current user,
+    so it replaces Depends(get_current_user).
+    Every request spends one token of the caller's request bucket. Routes
+    whose work grows with the request (text batches and jobs) pass cost, and
+    also spend cost(JSON body) tokens of a separate text bucket, so a large
+    batch is paid for without locking the caller out of single analyses.
+    """
+    controller = admission_controllers.setdefault(route, AdmissionController(
+        route,
+        max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+        max_queue=settings.ADMISSION_MAX_QUEUE,
+        target=settings.ADMISSION_TARGET_MS / 1000,
+        interval=settings.ADMISSION_INTERVAL_MS / 1000,
+    ))
+
+    async def admit(request: Request, current_user: dict = Depends(get_current_user)):
+        retry_after = 0.0
+        if rate_limiter is not None:
+            retry_after = rate_limiter.acquire(current_user["user_id"])
+        if not retry_after and cost is not None and text_rate_limiter is not None:
+            # FastAPI has already read the body, so request.json() is cached
+            retry_after = text_rate_limiter.acquire(current_user["user_id"], cost(await request.json()))
+        if retry_after:
+            rate_limited[route] = rate_limited.get(route, 0) + 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded, slow down",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+        try:
+            await controller.acquire()
+        except LoadShedError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is overloaded, please retry",
+                headers={"Retry-After": "1"}
+            )
+        try:
+            yield current_user
+        finally:
+            controller.release()
+
+    return admit
+
+
+def shed_counts() -> Dict[tuple, int]:
+    """Rejections by (route, reason), for the metrics endpoint."""
+    counts = {(route, "rate_limited"): count for route, count in rate_limited.items()}
+    for route, controller in admission_controllers.items():
+        for reason, count in controller.shed.items():
+            counts[(route, reason)] = count
+    return counts
+
+
+# Singleton instances
+admission_controllers: Dict[str, AdmissionController] = {}
+rate_limited: Dict[str, int] = {}  # route -> requests rejected by the rate limiter
+rate_limiter = TokenBucketLimiter(
+    rate=settings.RATE_LIMIT_PER_SECOND,
+    burst=settings.RATE_LIMIT_BURST,
+    shared_path=settings.RATE_LIMIT_SHARED_PATH or None,
+) if settings.RATE_LIMIT_PER_SECOND > 0 else None
+text_rate_limiter = TokenBucketLimiter(
+    rate=settings.RATE_LIMIT_TEXTS_PER_SECOND,
+    burst=settings.RATE_LIMIT_TEXTS_BURST,
+    shared_path=f"{settings.RATE_LIMIT_SHARED_PATH}-texts" if settings.RATE_LIMIT_SHARED_PATH else None,
+) if settings.RATE_LIMIT_TEXTS_PER_SECOND > 0 else None
+
+registry.gauge(
+    "satyanetra_requests_shed_total",
+    "Analysis requests rejected by route and reason (rate_limited, queue_full, queue_timeout).",
+    shed_counts,
+    labelnames=("route", "reason"),
+    kind="counter",
+)
+registry.gauge(
+    "satyanetra_admission_in_flight",
+    "Analysis requests currently running, by route.",
+    lambda: {(route,): controller.in_flight for route, controller in admission_controllers.items()},
+    labelnames=("route",),
+)
+registry.gauge(
+    "satyanetra_admission_queued",
+    "Analysis requests waiting for a slot, by route.",
+    lambda: {(route,): len(controller._waiters) for route, controller in admission_controllers.items()},
+    labelnames=("route",),
+)
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from pydantic_settings import BaseSettings
 from typing import List
 
@@ -12,16 +14,140 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+    JWT_BACKEND: str = "jose"  # "jose" or "pyjwt" (faster; requires PyJWT)
+    JWT_CACHE_MAX_ENTRIES: int = 10000  # verified-token cache size; 0 disables
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12  # existing hashes are upgraded on next login when this changes
+    PASSWORD_POOL_SIZE: int = 2
+    PASSWORD_MAX_QUEUE: int = 256  # logins/signups waiting for a bcrypt worker before 503s
+
+    # User lookups
+    USER_CACHE_TTL_SECONDS: float = 30.0  # in-process email -> user cache for login; 0 disables
+    USER_CACHE_MAX_ENTRIES: int = 10000
 
     # API
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
+
+    # Server (run.py)
+    SERVER_MODE: str = "development"  # "development" (reload) or "production" (pre-forked workers)
+    SERVER_WORKERS: int = 4
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_TIMEOUT: int = 5
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # seconds to drain in-flight requests on SIGTERM
+    SERVER_RESPAWN_BACKOFF: float = 1.0  # delay before replacing a crashed worker, doubled per quick crash
+    SERVER_RESPAWN_MAX_BACKOFF: float = 30.0
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
 
+    # Analysis
+    ANALYZE_BATCH_MAX_SIZE: int = 1000
+    MEME_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+
+    # Executors
+    DB_POOL_SIZE: int = 32
+    CPU_POOL_SIZE: int = 4
+
+    # Meme analysis execution backend: "inline", "thread" or "process"
+    MEME_EXECUTION_MODE: str = "inline"
+    MEME_POOL_SIZE: int = 4
+
+    # Inference micro-batching
+    INFERENCE_BATCH_MAX_SIZE: int = 32
+    INFERENCE_BATCH_MAX_WAIT_MS: float = 2.0
+
+    # Network graph store
+    GRAPH_MAX_NODES: int = 1_000_000
+    GRAPH_MAX_EDGES: int = 5_000_000
+    GRAPH_SEED_SAMPLE: bool = True
+    GRAPH_PAGE_MAX_LIMIT: int = 10000
+    GRAPH_EGO_MAX_NODES: int = 50000
+    GRAPH_LOD_BASE_CLUSTERS: int = 50  # super-nodes at zoom 0; each zoom level allows 4x more
+    GRAPH_LOD_MAX_ZOOM: int = 2
+    GRAPH_LOD_LAYOUT_ITERATIONS: int = 50
+    GRAPH_LOD_REFRESH_SECONDS: float = 5.0  # a changed graph's summary is rebuilt at most this often
+    COMMUNITY_MIN_SIZE: int = 3
+    COMMUNITY_UPDATE_BUDGET: int = 10000
+    COMMUNITY_UPDATE_INTERVAL: float = 0.5
+
+    # Analysis log write-behind sink
+    LOG_SINK_MAX_QUEUE_SIZE: int = 10000
+    LOG_SINK_BATCH_SIZE: int = 500
+    LOG_SINK_FLUSH_INTERVAL: float = 1.0
+    LOG_SINK_FLUSH_RETRIES: int = 3  # failed bulk inserts are retried this many times
+    LOG_SINK_RETRY_BACKOFF_SECONDS: float = 0.5  # doubled after each failed attempt
+
+    # Health checks
+    HEALTH_CACHE_SECONDS: float = 1.0  # readiness results are reused for this long
+    HEALTH_DB_TIMEOUT: float = 2.0
+    HEALTH_MAX_LOOP_LAG_MS: float = 500
+    HEALTH_MAX_QUEUE_FILL: float = 0.9  # log sink fill ratio above which the worker reports not ready
+    WARMUP_RETRY_BACKOFF_SECONDS: float = 1.0  # failed start-up warm-ups are retried, doubling the delay
+    WARMUP_RETRY_MAX_BACKOFF_SECONDS: float = 60.0
+
+    # Analytics rollups
+    ANALYTICS_REBUILD_ON_STARTUP: bool = False  # replay analysis_logs into the rollups at startup
+    ANALYTICS_REBUILD_PAGE_SIZE: int = 1000
+
+    # Admission control on analysis routes
+    RATE_LIMIT_PER_SECOND: float = 10.0  # sustained analysis requests per user; 0 disables
+    RATE_LIMIT_BURST: float = 40  # requests a user may make at once after idling
+    RATE_LIMIT_TEXTS_PER_SECOND: float = 200.0  # sustained texts per user on batch and job routes (a separate bucket); 0 disables
+    RATE_LIMIT_TEXTS_BURST: float = 10000  # texts a user may submit at once after idling (one full job)
+    RATE_LIMIT_SHARED_PATH: str = ""  # e.g. /dev/shm/satyanetra-ratelimit to share buckets across workers; empty = per worker
+    ADMISSION_MAX_CONCURRENCY: int = 32  # concurrent requests per route and worker
+    ADMISSION_MAX_QUEUE: int = 128  # requests waiting for a slot before immediate 503s
+    ADMISSION_TARGET_MS: float = 50  # max queue wait under sustained overload
+    ADMISSION_INTERVAL_MS: float = 500  # max queue wait otherwise; a queue non-empty this long counts as overload
+
+    # Analysis jobs (durable SQLite queue behind /analyze/jobs)
+    # Shared by every worker on the host; point it at a persistent data directory in production
+    JOB_QUEUE_PATH: str = os.path.join(tempfile.gettempdir(), "satyanetra", "jobs.sqlite3")
+    JOB_WORKERS: int = 2  # concurrent jobs per uvicorn worker
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 2.0  # doubled after each failed attempt
+    JOB_LEASE_SECONDS: float = 300  # running jobs are retried if their worker has not finished by then
+    JOB_RESULT_TTL_SECONDS: float = 86400  # finished jobs and their results are kept this long
+    JOB_MAX_QUEUED: int = 10000  # submissions beyond this many waiting jobs get 503s
+    JOB_MAX_TEXTS: int = 10000  # texts per bulk text job
+    JOB_LOG_ENQUEUE_TIMEOUT: float = 60.0  # max wait for room in the analysis log queue; rows that still do not fit are dropped
+    JOB_POLL_INTERVAL: float = 0.5  # idle workers check for jobs submitted by other processes
+
+    # Alerts
+    ALERT_MIN_SEVERITY: str = "medium"  # analyses at or above this severity raise alerts (critical/high/medium/low)
+    ALERT_COALESCE_SECONDS: float = 1.0  # triggers within one interval become one alert per severity and type
+    ALERT_PERSIST: bool = True  # also write generated alerts to the alerts table
+    ALERT_CLIENT_BUFFER: int = 64  # undelivered alerts per subscriber before it is disconnected
+    ALERT_REPLAY_SIZE: int = 256  # recent alerts kept for clients reconnecting with Last-Event-ID
+    ALERT_MAX_SUBSCRIBERS: int = 10000  # per worker
+    ALERT_HEARTBEAT_SECONDS: float = 15.0  # SSE keep-alive comment interval
+
+    # Analysis history
+    HISTORY_PAGE_MAX_LIMIT: int = 200  # max rows per /analyze/history page
+
+    # Near-duplicate (campaign) detection for analyzed texts
+    NEAR_DUP_ENABLED: bool = True
+    NEAR_DUP_THRESHOLD: float = 0.7  # estimated Jaccard similarity of 5-character shingles
+    NEAR_DUP_WINDOW_SECONDS: float = 86400  # how far back matches reach
+    NEAR_DUP_SEGMENTS: int = 4  # the window is evicted one segment at a time
+    NEAR_DUP_SEGMENT_CAPACITY: int = 50000  # texts per segment; about 240 bytes each
+    NEAR_DUP_MIN_LENGTH: int = 30  # shorter normalized texts are not indexed
+
+    # Classifier result cache
+    RESULT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESULT_CACHE_TTL_SECONDS: float = 3600
+    RESULT_CACHE_DISK_PATH: str = ""  # SQLite file shared by workers; empty disables the disk tier
+    RESULT_CACHE_PERCEPTUAL_HASH: bool = False
+
     class Config:
         env_file = ".env"
         case_sensitive = True
 
+    @property
+    def meme_upload_limit_detail(self) -> str:
+        return f"Image file too large (max {self.MEME_MAX_UPLOAD_BYTES // (1024 * 1024)}MB)"
+
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
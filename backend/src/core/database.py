@@ -1,10 +1,52 @@
-from supabase import create_client, Client
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
 from .config import settings
+from .metrics import span
 
-# Initialize Supabase client with service role key for admin operations
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+if TYPE_CHECKING:
+    from supabase import Client
 
+# Created on first use: importing supabase and building the client costs
+# a few hundred milliseconds that startup should not pay up front
+_client: Optional["Client"] = None
+_client_lock = threading.Lock()
 
-def get_supabase() -> Client:
-    """Get Supabase client instance."""
-    return supabase
+# Bounded pool for blocking Supabase round-trips, so they never stall the event loop
+db_executor = ThreadPoolExecutor(max_workers=settings.DB_POOL_SIZE, thread_name_prefix="supabase")
+
+
+def get_supabase() -> "Client":
+    """Get Supabase client instance (created on first call)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from supabase import create_client
+
+                # Service role key for admin operations
+                _client = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+    return _client
+
+
+async def run_query(query):
+    """
+    Execute a Supabase query builder without blocking the event loop.
+
+    Usage:
+        result = await run_query(supabase.table("users").select("id").eq("email", email))
+    """
+    loop = asyncio.get_running_loop()
+    with span("db.query"):
+        return await loop.run_in_executor(db_executor, query.execute)
+
+
+async def ping_database() -> None:
+    """
+    Round-trip a trivial query. Creates the client off the event loop on
+    first use, so it doubles as the start-up connection warm-up.
+    """
+    loop = asyncio.get_running_loop()
+    supabase = await loop.run_in_executor(db_executor, get_supabase)
+    await run_query(supabase.table("users").select("id").limit(1))
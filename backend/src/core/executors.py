@@ -0,0 +1,108 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+from .config import settings
+
+# Bounded pool for CPU-bound work (classifier inference, image decoding).
+# Pillow and NumPy release the GIL for their heavy sections, so this scales past one core.
+cpu_executor = ThreadPoolExecutor(max_workers=settings.CPU_POOL_SIZE, thread_name_prefix="cpu")
+
+
+async def run_cpu(func, *args, **kwargs):
+    """Run a CPU-bound callable on the bounded CPU pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(cpu_executor, partial(func, *args, **kwargs))
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a LimitedExecutor's wait queue is full."""
+
+
+class LimitedExecutor:
+    """
+    Dedicated thread pool with an admission limit.
+    At most max_workers calls run at once; up to max_queue more wait in line
+    and anything beyond that is rejected immediately with
+    ExecutorSaturatedError, so a burst cannot build an unbounded backlog.
+    Tracks queue depth and wait time.
+    """
+
+    def __init__(self, name: str, max_workers: int = 2, max_queue: int = 256):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Metrics
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        return self._slots
+
+    async def run(self, func, *args, **kwargs):
+        """Run func on the pool once a worker slot is free."""
+        if self.waiting >= self.max_queue and self.slots.locked():
+            self.rejected += 1
+            raise ExecutorSaturatedError(f"{self.name} queue is full")
+
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        queued_at = time.perf_counter()
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        waited = time.perf_counter() - queued_at
+        self.total_wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.slots.release()
+
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth, throughput and wait-time counters."""
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "mean_wait_ms": round(self.total_wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+# Password hashing gets its own pool so a login storm queues behind bcrypt
+# instead of starving classifier work on the CPU pool
+password_executor = LimitedExecutor(
+    "bcrypt",
+    max_workers=settings.PASSWORD_POOL_SIZE,
+    max_queue=settings.PASSWORD_MAX_QUEUE,
+)
+
+
+async def run_password(func, *args, **kwargs):
+    """Run a password hashing/verification callable on the dedicated bcrypt pool."""
+    return await password_executor.run(func, *args, **kwargs)
@@ -0,0 +1,82 @@
+from time import perf_counter
+from typing import Dict, Tuple
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject oversized request bodies while they are still streaming in.
+    Requests are refused up front when Content-Length is over the limit, and
+    chunked bodies are aborted as soon as the running total crosses it, so the
+    multipart parser never spools an oversized upload.
+    """
+
+    def __init__(self, app, limits: Dict[str, Tuple[int, str]]):
+        self.app = app
+        self.limits = limits  # path -> (max body bytes, error detail)
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes, detail = limit
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            response = JSONResponse(status_code=400, content={"detail": detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise HTTPException(status_code=400, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class MetricsMiddleware:
+    """
+    Record per-route request latency in a histogram.
+    Requests are labelled with the matched route template (e.g.
+    /map/summary, never raw paths with IDs) so label cardinality stays bounded;
+    paths that match no route are grouped under "unmatched".
+    """
+
+    def __init__(self, app, histogram, exclude: Tuple[str, ...] = ()):
+        self.app = app
+        self.histogram = histogram
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = perf_counter()
+
+        async def recording_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            self.histogram.observe(
+                perf_counter() - start,
+                (scope["method"], getattr(route, "path", "unmatched"), str(status)),
+            )
@@ -0,0 +1,81 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Callable, Dict, List
+from .config import settings
+from .executors import run_cpu
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Start-up state of components that warm up in the background.
+    warm() schedules a warm-up (a coroutine function, or a blocking callable
+    run on the CPU pool) and records whether it is pending, ready or failed,
+    so the app can accept connections immediately and report readiness.
+    A failed warm-up is retried in the background with exponential backoff,
+    so a dependency that was briefly unavailable at start-up does not keep
+    the worker unready for good.
+    """
+
+    def __init__(self, retry_backoff: float = 1.0, max_retry_backoff: float = 60.0):
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.components: Dict[str, Dict[str, any]] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def warm(self, name: str, func: Callable, *args) -> None:
+        self.components[name] = {"state": "pending"}
+        self._tasks.append(asyncio.create_task(self._run(name, func, *args)))
+
+    @property
+    def ready(self) -> bool:
+        return all(component["state"] == "ready" for component in self.components.values())
+
+    def report(self) -> Dict[str, Dict[str, any]]:
+        return {name: dict(component) for name, component in self.components.items()}
+
+    async def wait(self) -> None:
+        """Wait for every scheduled warm-up to succeed or be cancelled."""
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await self.wait()
+        self._tasks.clear()
+
+    async def _run(self, name: str, func: Callable, *args) -> None:
+        attempts = 0
+        while True:
+            attempts += 1
+            start = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(func):
+                    await func(*args)
+                else:
+                    await run_cpu(func, *args)
+            except asyncio.CancelledError:
+                self.components[name] = {"state": "cancelled"}
+                raise
+            except Exception as e:
+                delay = min(self.retry_backoff * 2 ** (attempts - 1), self.max_retry_backoff)
+                logger.exception("Warm-up of %s failed (attempt %d), retrying in %.1fs", name, attempts, delay)
+                self.components[name] = {"state": "failed", "error": str(e), "attempts": attempts, "retry_in": delay}
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    self.components[name] = {"state": "cancelled"}
+                    raise
+                continue
+            self.components[name] = {"state": "ready", "seconds": round(time.perf_counter() - start, 3), "attempts": attempts}
+            return
+
+
+# Singleton instance
+readiness = Readiness(
+    retry_backoff=settings.WARMUP_RETRY_BACKOFF_SECONDS,
+    max_retry_backoff=settings.WARMUP_RETRY_MAX_BACKOFF_SECONDS,
+)
@@ -1,12 +1,18 @@
+import hashlib
+import importlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .config import settings
+from .metrics import span
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 security = HTTPBearer()
 
 
@@ -15,6 +21,15 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, if the stored hash uses outdated settings
+    (e.g. a lower BCRYPT_ROUNDS), return a fresh hash to store.
+    Returns: (valid, new_hash or None)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
@@ -33,12 +48,104 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens that already passed verification, keyed by a SHA-256
+    digest of the token (the raw token is never kept). Entries expire at the
+    token's own exp claim; tokens without exp are not cached.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()  # digest -> (user, exp)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                user, expires_at = entry
+                if expires_at > time.time():
+                    self._entries.move_to_end(digest)
+                    self.hits += 1
+                    return user
+                del self._entries[digest]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def set(self, token: str, user: dict, expires_at: Optional[float]) -> None:
+        if self.max_entries <= 0 or expires_at is None:
+            return
+        digest = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[digest] = (user, expires_at)
+            self._entries.move_to_end(digest)
+            if len(self._entries) > self.max_entries:
+                self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "expirations": self.expirations}
+
+    def _evict(self) -> None:
+        # Caller holds the lock. Drop expired tokens first, then least recently used.
+        now = time.time()
+        for digest in [digest for digest, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[digest]
+            self.expirations += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _jose_decoder() -> Tuple[Callable[[str], dict], type]:
+    def decode(token: str) -> dict:
+        return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    return decode, JWTError
+
+
+def _pyjwt_decoder() -> Tuple[Callable[[str], dict], type]:
+    # Optional dependency: pip install PyJWT
+    try:
+        pyjwt = importlib.import_module("jwt")
+    except ImportError:
+        raise RuntimeError("JWT_BACKEND=pyjwt requires the PyJWT package (pip install PyJWT)")
+
+    def decode(token: str) -> dict:
+        return pyjwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    return decode, pyjwt.PyJWTError
+
+
+JWT_BACKENDS = {
+    "jose": _jose_decoder,
+    "pyjwt": _pyjwt_decoder,
+}
+
+
+def build_token_decoder(backend: str = "jose") -> Tuple[Callable[[str], dict], type]:
+    """Return (decode, error_type) for the named JOSE backend."""
+    try:
+        factory = JWT_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend: {backend}")
+    return factory()
+
+
+_decode_token, _token_error = build_token_decoder(settings.JWT_BACKEND)
+token_cache = VerifiedTokenCache(max_entries=settings.JWT_CACHE_MAX_ENTRIES)
+
+
 def decode_access_token(token: str) -> dict:
     """Decode and verify a JWT token."""
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        return payload
-    except JWTError:
+        with span("jwt.decode"):
+            return _decode_token(token)
+    except _token_error:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -48,7 +155,16 @@ def decode_access_token(token: str) -> dict:
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Dependency to get the current authenticated user from JWT token."""
-    token = credentials.credentials
+    return authenticate_token(credentials.credentials)
+
+
+def authenticate_token(token: str) -> dict:
+    """Resolve a bearer token to the current user (for callers that cannot use the header dependency)."""
+    # Repeat callers skip signature and claims verification until the token expires
+    user = token_cache.get(token)
+    if user is not None:
+        return user
+
     payload = decode_access_token(token)
 
     user_id: str = payload.get("sub")
@@ -59,4 +175,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return {"user_id": user_id, "email": payload.get("email")}
+    user = {"user_id": user_id, "email": payload.get("email")}
+    exp = payload.get("exp")
+    token_cache.set(token, user, float(exp) if isinstance(exp, (int, float)) else None)
+    return user
@@ -1,16 +1,85 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
-from .api import auth, analyze_text, analyze_meme, network_map
+from .core.database import db_executor, get_supabase, ping_database
+from .core.executors import password_executor
+from .core.metrics import registry, request_seconds
+from .core.middleware import BodySizeLimitMiddleware, MetricsMiddleware
+from .core.readiness import readiness
+from .api import auth, analyze_text, analyze_meme, analyze_jobs, analysis_history, network_map, analytics, alerts
+from .services.log_sink import analysis_log_sink
+from .services.alerts import alert_broker, alert_service
+from .services.job_queue import job_queue, job_workers
+from .services.batching import text_batcher, meme_batcher
+from .services.meme_executor import meme_executor
+from .services.network_graph import network_graph_service
+from .services.analytics import analytics_rollups
+from .services.text_classifier import text_classifier
+from .services.health import health_monitor
+from .services.result_cache import result_cache
+from .services.near_duplicates import near_duplicate_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Loop-bound background services are cheap to start
+    await network_graph_service.start()
+    await analysis_log_sink.start()
+    await alert_service.start()
+    await job_workers.start()
+    await text_batcher.start()
+    await meme_batcher.start()
+    await health_monitor.loop_lag.start()
+
+    # Slow warm-ups run in the background so the worker accepts connections
+    # immediately; /health reports readiness until they finish
+    readiness.warm("database", ping_database)
+    readiness.warm("text_classifier", text_classifier.analyze, "warm up")
+    readiness.warm("meme_classifier", meme_executor.start)
+    if settings.GRAPH_SEED_SAMPLE:
+        readiness.warm("network_graph", network_graph_service.seed_sample_graph)
+    if settings.ANALYTICS_REBUILD_ON_STARTUP:
+        readiness.warm("analytics", analytics_rollups.rebuild, get_supabase, settings.ANALYTICS_REBUILD_PAGE_SIZE)
+
+    yield
+
+    await readiness.cancel()
+    await job_workers.stop()
+    await health_monitor.loop_lag.stop()
+    await network_graph_service.stop()
+    await text_batcher.stop()
+    await meme_batcher.stop()
+    meme_executor.shutdown()
+
+    # Flush buffered analysis logs and pending alerts before the worker exits
+    await analysis_log_sink.stop()
+    await alert_service.stop()
+
 
 # Create FastAPI application
 app = FastAPI(
     title="SatyaNetra API",
     description="Backend API for real-time misinformation detection platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Middleware added later wraps the middleware added before it
+# Abort oversized uploads while they stream in (allowance covers multipart framing)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        "/analyze/meme": (settings.MEME_MAX_UPLOAD_BYTES + 64 * 1024, settings.meme_upload_limit_detail),
+        "/analyze/jobs/meme": (settings.MEME_MAX_UPLOAD_BYTES + 64 * 1024, settings.meme_upload_limit_detail),
+    },
 )
 
-# Configure CORS
+# Per-route latency histogram (body-size rejections are counted as "unmatched")
+app.add_middleware(MetricsMiddleware, histogram=request_seconds, exclude=("/metrics",))
+
+# Configure CORS (outermost, so every response, including early rejections, carries the CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,  # Frontend origins
@@ -19,11 +88,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Queue depths and cache size, read at scrape time
+registry.gauge("satyanetra_db_pending_queries", "Queries waiting for a database executor thread.", lambda: db_executor._work_queue.qsize())
+registry.gauge("satyanetra_log_sink_queue_depth", "Analysis logs waiting to be flushed.", lambda: analysis_log_sink.stats()["queue_depth"])
+registry.gauge("satyanetra_text_batcher_queue_depth", "Texts waiting for an inference batch.", lambda: text_batcher.stats()["queue_depth"])
+registry.gauge("satyanetra_meme_batcher_queue_depth", "Images waiting for an inference batch.", lambda: meme_batcher.stats()["queue_depth"])
+registry.gauge("satyanetra_password_pool_waiting", "Password hashes waiting for a bcrypt thread.", lambda: password_executor.stats()["waiting"])
+registry.gauge("satyanetra_result_cache_bytes", "Memory used by the in-process result cache.", lambda: result_cache.stats()["bytes"])
+registry.gauge("satyanetra_jobs_queued", "Analysis jobs waiting in the host-wide job queue.", lambda: job_queue.last_stats["queued"])
+registry.gauge("satyanetra_jobs_running", "Analysis jobs currently leased by a worker.", lambda: job_queue.last_stats["running"])
+registry.gauge("satyanetra_alert_subscribers", "Dashboards connected to the alert stream.", lambda: alert_broker.stats()["subscribers"])
+if near_duplicate_index is not None:
+    registry.gauge("satyanetra_near_duplicate_indexed", "Texts held in the near-duplicate index.", lambda: near_duplicate_index.stats()["indexed"])
+    registry.gauge("satyanetra_near_duplicate_campaigns", "Live near-duplicate campaigns of two or more texts.", lambda: near_duplicate_index.stats()["campaigns"])
+registry.gauge("satyanetra_event_loop_lag_seconds", "Most recent event-loop lag sample.", lambda: health_monitor.loop_lag.lag)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(analyze_text.router)
 app.include_router(analyze_meme.router)
+app.include_router(analysis_history.router)
+app.include_router(analyze_jobs.router)
 app.include_router(network_map.router)
+app.include_router(analytics.router)
+app.include_router(alerts.router)
 
 
 @app.get("/")
@@ -36,15 +124,33 @@ async def root():
     }
 
 
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the worker is running and its event loop responds. Never touches dependencies."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: 200 when this worker should receive traffic, 503 otherwise."""
+    health = await health_monitor.check()
+    return JSONResponse(
+        status_code=200 if health["ready"] else 503,
+        content={"status": health["status"]}
+    )
+
+
 @app.get("/health")
 async def health_check():
-    """Detailed health check."""
-    return {
-        "status": "healthy",
-        "database": "connected",
-        "services": {
-            "text_classifier": "active",
-            "meme_classifier": "active",
-            "network_graph": "active"
-        }
-    }
+    """Detailed health check with per-dependency results (cached for HEALTH_CACHE_SECONDS)."""
+    health = await health_monitor.check()
+    return JSONResponse(
+        status_code=200 if health["ready"] else 503,
+        content={"status": health["status"], "checks": health["checks"]}
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of request latencies, hot-path spans and queue depths."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
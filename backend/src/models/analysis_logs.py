@@ -1,14 +1,18 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, Any
+from uuid import uuid4
 
 
 class AnalysisLogCreate(BaseModel):
+    # Generated client-side so the analysis_id is known before the row is written
+    id: str = Field(default_factory=lambda: str(uuid4()))
     user_id: str
     input_data: str
     result_score: float
     result_label: str
     analysis_type: str  # 'text' or 'meme'
+    created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class AnalysisLogResponse(BaseModel):
@@ -0,0 +1,306 @@
+import asyncio
+import logging
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+from ..core.config import settings
+from ..core.database import get_supabase, run_query
+from ..models.alerts import AlertResponse
+from ..models.analysis_logs import AnalysisLogCreate
+
+logger = logging.getLogger(__name__)
+
+# Minimum analysis score for each severity, most severe first
+SEVERITY_THRESHOLDS = (
+    ("critical", 0.9),
+    ("high", 0.8),
+    ("medium", 0.7),
+    ("low", 0.5),
+)
+SEVERITIES = tuple(severity for severity, _ in SEVERITY_THRESHOLDS)
+
+
+def severity_for(score: float) -> Optional[str]:
+    """Severity of an analysis score, or None below the lowest threshold."""
+    for severity, threshold in SEVERITY_THRESHOLDS:
+        if score >= threshold:
+            return severity
+    return None
+
+
+class AlertMessage:
+    """An alert serialized once and shared by every subscriber."""
+
+    __slots__ = ("seq", "alert", "json", "sse")
+
+    def __init__(self, seq: int, alert: AlertResponse):
+        self.seq = seq
+        self.alert = alert
+        self.json = alert.model_dump_json()
+        self.sse = f"id: {seq}\nevent: alert\ndata: {self.json}\n\n".encode("utf-8")
+
+
+class Subscription:
+    """
+    One connected client: a bounded buffer of pending messages.
+    get() returns None once the subscription is closed (client left, the
+    broker is shutting down, or the client fell too far behind).
+    """
+
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.closed = False
+        self.close_reason: Optional[str] = None
+
+    async def get(self) -> Optional[AlertMessage]:
+        if self.closed and self.queue.empty():
+            return None
+        return await self.queue.get()
+
+    def offer(self, message: AlertMessage) -> bool:
+        """Buffer a message without waiting; False if the buffer is full."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self, reason: str) -> None:
+        """Stop the subscription and wake its consumer."""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        if reason == "slow consumer":
+            # The client reconnects with Last-Event-ID and catches up from the
+            # replay buffer, so discard the backlog rather than deliver it late
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        if not self.queue.full():
+            self.queue.put_nowait(None)
+
+
+class AlertBroker:
+    """
+    In-process pub/sub for alerts.
+    publish() serializes each alert once and offers it to every subscriber's
+    bounded buffer without awaiting, so a publish costs O(subscribers) cheap
+    appends however slow the clients are. A subscriber whose buffer is full is
+    disconnected instead of slowing everyone else down; the last replay_size
+    alerts are kept so reconnecting clients resume from their Last-Event-ID.
+    Subscribers only see alerts published in this worker process.
+    """
+
+    def __init__(self, buffer_size: int = 64, replay_size: int = 256, max_subscribers: int = 10000):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscription] = set()
+        self._replay: Deque[AlertMessage] = deque(maxlen=replay_size)
+        self._seq = 0
+
+        # Metrics
+        self.published = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Register a subscriber. With last_event_id, alerts published after it that
+        are still in the replay buffer are queued first.
+        Raises OverflowError when max_subscribers are already connected.
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise OverflowError("Too many alert subscribers")
+        subscription = Subscription(self.buffer_size)
+        if last_event_id is not None:
+            for message in self._replay:
+                if message.seq > last_event_id and not subscription.offer(message):
+                    break
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        subscription.close("unsubscribed")
+
+    def publish(self, alert: AlertResponse) -> AlertMessage:
+        self._seq += 1
+        message = AlertMessage(self._seq, alert)
+        self._replay.append(message)
+        self.published += 1
+
+        slow = []
+        for subscription in self._subscribers:
+            if subscription.offer(message):
+                self.delivered += 1
+            else:
+                slow.append(subscription)
+        for subscription in slow:
+            self._subscribers.discard(subscription)
+            subscription.close("slow consumer")
+            self.dropped_subscribers += 1
+        return message
+
+    def close_all(self) -> None:
+        for subscription in self._subscribers:
+            subscription.close("shutdown")
+        self._subscribers.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+            "last_event_id": self._seq,
+        }
+
+
+class _Burst:
+    """Analyses of one (severity, analysis_type) waiting to be coalesced into an alert."""
+
+    __slots__ = ("count", "max_score", "labels", "first_at", "last_at")
+
+    def __init__(self, created_at: datetime):
+        self.count = 0
+        self.max_score = 0.0
+        self.labels: Counter = Counter()
+        self.first_at = created_at
+        self.last_at = created_at
+
+
+class AlertService:
+    """
+    Creates alerts from analyses that cross a severity threshold.
+    record_log() (a log sink on_accept hook) only counts the analysis; every
+    coalesce_seconds the counts are turned into at most one alert per
+    (severity, analysis_type), so a burst of harmful posts becomes one
+    "N analyses" alert instead of N. Alerts are published to the broker first
+    and then written to the alerts table in one bulk insert per interval.
+    """
+
+    def __init__(
+        self,
+        broker: AlertBroker,
+        client_factory: Callable = get_supabase,
+        min_severity: str = "medium",
+        coalesce_seconds: float = 1.0,
+        persist: bool = True,
+    ):
+        if min_severity not in SEVERITIES:
+            raise ValueError(f"Unknown alert severity: {min_severity} (choose from {', '.join(SEVERITIES)})")
+        self.broker = broker
+        self.client_factory = client_factory
+        self.min_score = dict(SEVERITY_THRESHOLDS)[min_severity]
+        self.coalesce_seconds = coalesce_seconds
+        self.persist = persist
+
+        self._pending: Dict[Tuple[str, str], _Burst] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.triggers = 0
+        self.created = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        """Start the coalescing task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Emit pending alerts and disconnect every subscriber."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self.broker.close_all()
+
+    def record_log(self, record: AnalysisLogCreate) -> None:
+        """Count an analysis towards the next alert if it crosses the minimum severity."""
+        if record.result_score < self.min_score:
+            return
+        key = (severity_for(record.result_score), record.analysis_type)
+        burst = self._pending.get(key)
+        if burst is None:
+            burst = self._pending[key] = _Burst(record.created_at)
+        burst.count += 1
+        burst.max_score = max(burst.max_score, record.result_score)
+        burst.labels[record.result_label] += 1
+        burst.last_at = record.created_at
+        self.triggers += 1
+
+    async def flush(self) -> List[AlertResponse]:
+        """Turn pending bursts into alerts now."""
+        pending, self._pending = self._pending, {}
+        alerts = []
+        # Most severe first, so dashboards list them in priority order
+        for (severity, analysis_type), burst in sorted(pending.items(), key=lambda item: SEVERITIES.index(item[0][0])):
+            alert = self._new_alert(*_describe(severity, analysis_type, burst), severity)
+            self.broker.publish(alert)
+            alerts.append(alert)
+        if alerts:
+            await self._store(alerts)
+        return alerts
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "triggers": self.triggers,
+            "created": self.created,
+            "failed": self.failed,
+            "pending": sum(burst.count for burst in self._pending.values()),
+            **self.broker.stats(),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.coalesce_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to emit alerts")
+
+    def _new_alert(self, title: str, description: str, severity: str) -> AlertResponse:
+        self.created += 1
+        return AlertResponse(id=str(uuid4()), title=title, description=description, severity=severity, timestamp=datetime.utcnow())
+
+    async def _store(self, alerts: List[AlertResponse]) -> None:
+        if not self.persist:
+            return
+        rows = [alert.model_dump(mode="json") for alert in alerts]
+        try:
+            supabase = self.client_factory()
+            await run_query(supabase.table("alerts").insert(rows))
+        except Exception:
+            self.failed += len(rows)
+            logger.exception("Failed to store %d alerts", len(rows))
+
+
+def _describe(severity: str, analysis_type: str, burst: _Burst) -> Tuple[str, str]:
+    subject = "analysis" if burst.count == 1 else "analyses"
+    title = f"{burst.count} {severity}-risk {analysis_type} {subject}"
+    labels = ", ".join(f"{label} x{count}" for label, count in burst.labels.most_common())
+    description = (
+        f"{burst.count} {analysis_type} {subject} scored {severity} risk (max score {burst.max_score:.2f}) "
+        f"between {burst.first_at:%H:%M:%S} and {burst.last_at:%H:%M:%S} UTC. Labels: {labels}."
+    )
+    return title, description
+
+
+# Singleton instances
+alert_broker = AlertBroker(
+    buffer_size=settings.ALERT_CLIENT_BUFFER,
+    replay_size=settings.ALERT_REPLAY_SIZE,
+    max_subscribers=settings.ALERT_MAX_SUBSCRIBERS,
+)
+alert_service = AlertService(
+    alert_broker,
+    min_severity=settings.ALERT_MIN_SEVERITY,
+    coalesce_seconds=settings.ALERT_COALESCE_SECONDS,
+    persist=settings.ALERT_PERSIST,
+)
@@ -0,0 +1,106 @@
+import base64
+import binascii
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from ..core.database import get_supabase, run_query
+
+# Columns callers may project; created_at and id are always returned because the cursor needs them
+HISTORY_COLUMNS = ("id", "user_id", "input_data", "result_score", "result_label", "analysis_type", "created_at")
+CURSOR_COLUMNS = ("created_at", "id")
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """Opaque cursor for the last row of a page."""
+    return base64.urlsafe_b64encode(f"{created_at}|{row_id}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Cursors are (created_at, id) of the last row on the previous page."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    created_at, _, row_id = raw.partition("|")
+    # Both values are interpolated into a PostgREST filter, so only accept well-formed ones
+    try:
+        datetime.fromisoformat(created_at)
+        uuid.UUID(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, row_id
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """Validate a comma-separated projection; None selects every column."""
+    if fields is None:
+        return list(HISTORY_COLUMNS)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in HISTORY_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(HISTORY_COLUMNS)})")
+    return list(CURSOR_COLUMNS) + [field for field in requested if field not in CURSOR_COLUMNS]
+
+
+class AnalysisHistory:
+    """
+    Read path for one user's analysis_logs, newest first.
+    Pages are keyset-paginated on (created_at, id): each page starts strictly
+    after the last row of the previous one, so with the composite
+    (user_id, created_at, id) index every page is an index
+    range scan of limit rows however deep the client has paged, unlike OFFSET
+    which reads and discards every earlier row.
+    """
+
+    def __init__(self, client_factory: Callable = get_supabase):
+        self.client_factory = client_factory
+
+    async def page(
+        self,
+        user_id: str,
+        analysis_type: Optional[str] = None,
+        result_label: Optional[str] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        fields: Sequence[str] = HISTORY_COLUMNS,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Dict[str, any]:
+        """
+        One page of user_id's history. The service-role client bypasses row-level
+        security, so the user filter is always applied here.
+        Returns: {"items": [rows with the projected fields], "next_cursor": str or None}
+        Raises ValueError on an invalid cursor.
+        """
+        after = decode_cursor(cursor) if cursor is not None else None
+
+        query = self.client_factory().table("analysis_logs").select(", ".join(fields)).eq("user_id", user_id)
+        if analysis_type is not None:
+            query = query.eq("analysis_type", analysis_type)
+        if result_label is not None:
+            query = query.eq("result_label", result_label)
+        if min_score is not None:
+            query = query.gte("result_score", min_score)
+        if max_score is not None:
+            query = query.lte("result_score", max_score)
+        if after is not None:
+            # (created_at, id) < (cursor created_at, cursor id), spelled out as a
+            # PostgREST or= filter (this postgrest client has no or_() builder)
+            created_at, row_id = after
+            query.params = query.params.add("or", f'(created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id}))')
+
+        # One order parameter for both keys ("created_at.desc,id.desc"): this postgrest
+        # client sends repeated .order() calls as duplicate parameters.
+        # Fetch one extra row to learn whether another page exists without a count query
+        result = await run_query(query.order("created_at.desc,id", desc=True).limit(limit + 1))
+        rows = result.data or []
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return {"items": rows, "next_cursor": next_cursor}
+
+
+# Singleton instance
+analysis_history = AnalysisHistory()
@@ -0,0 +1,228 @@
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+from ..core.database import get_supabase, run_query
+
+logger = logging.getLogger(__name__)
+
+# Rollup resolutions: bucket width in seconds and how many buckets are retained
+RESOLUTIONS = {
+    "minute": (60, 180),
+    "hour": (3600, 72),
+    "day": (86400, 400),
+}
+
+# Longest window answered from each resolution (coarsest last), so a read
+# touches a bounded number of buckets whatever the traffic volume
+WINDOW_RESOLUTIONS = (
+    (2 * 3600, "minute"),
+    (2 * 86400, "hour"),
+    (400 * 86400, "day"),
+)
+
+WINDOW_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def parse_window(window: str) -> int:
+    """Parse a window such as "15m", "24h" or "7d" into seconds."""
+    unit = WINDOW_UNITS.get(window[-1:])
+    if unit is None or not window[:-1].isdigit() or int(window[:-1]) <= 0:
+        raise ValueError(f"Invalid window: {window} (use e.g. 15m, 24h or 7d)")
+    seconds = int(window[:-1]) * unit
+    if seconds > WINDOW_RESOLUTIONS[-1][0]:
+        raise ValueError(f"Window too long: {window} (max {WINDOW_RESOLUTIONS[-1][0] // 86400}d)")
+    return seconds
+
+
+class AnalyticsRollups:
+    """
+    Running counters and time-bucketed rollups of analyses and graph ingestion.
+    Every logged analysis bumps its (analysis_type, label) counter in the
+    all-time totals and in the current minute, hour and day buckets; reads sum
+    at most a few hundred buckets and never touch analysis_logs.
+    State lives in memory and can be rebuilt from analysis_logs with rebuild().
+    Each worker process counts only the analyses it served itself.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            # (analysis_type, label) -> [count, score_sum]
+            self.totals: Dict[Tuple[str, str], list] = {}
+            # resolution -> bucket start -> {(analysis_type, label): [count, score_sum]}
+            self._buckets: Dict[str, Dict[int, Dict[Tuple[str, str], list]]] = {name: {} for name in RESOLUTIONS}
+            # resolution -> bucket start -> edges ingested
+            self._edge_buckets: Dict[str, Dict[int, int]] = {name: {} for name in RESOLUTIONS}
+            self.edges_ingested = 0
+
+    def record(self, analysis_type: str, label: str, score: float, created_at: Optional[datetime] = None) -> None:
+        """Count one analysis."""
+        timestamp = _timestamp(created_at)
+        key = (analysis_type, label)
+        with self._lock:
+            _bump(self.totals, key, score)
+            for name, (width, retention) in RESOLUTIONS.items():
+                buckets = self._buckets[name]
+                start = int(timestamp // width) * width
+                bucket = buckets.get(start)
+                if bucket is None:
+                    bucket = buckets[start] = {}
+                    _prune(buckets, start, width, retention)
+                _bump(bucket, key, score)
+
+    def record_log(self, record) -> None:
+        """Count an AnalysisLogCreate (used as the log sink's on_accept hook)."""
+        self.record(record.analysis_type, record.result_label, record.result_score, record.created_at)
+
+    def record_edges(self, count: int, created_at: Optional[datetime] = None) -> None:
+        """Count ingested graph edges."""
+        if not count:
+            return
+        timestamp = _timestamp(created_at)
+        with self._lock:
+            self.edges_ingested += count
+            for name, (width, retention) in RESOLUTIONS.items():
+                buckets = self._edge_buckets[name]
+                start = int(timestamp // width) * width
+                if start not in buckets:
+                    _prune(buckets, start, width, retention)
+                buckets[start] = buckets.get(start, 0) + count
+
+    def summary(self, window_seconds: int, analysis_type: Optional[str] = None, now: Optional[datetime] = None) -> Dict[str, any]:
+        """
+        Per-label distribution of analyses over the trailing window, answered
+        from the coarsest resolution that covers it.
+        """
+        resolution = next(name for limit, name in WINDOW_RESOLUTIONS if window_seconds <= limit)
+        width, _ = RESOLUTIONS[resolution]
+        end = _timestamp(now)
+        first_bucket = int((end - window_seconds) // width) * width
+
+        counts: Dict[Tuple[str, str], list] = {}
+        series = []
+        edges = 0
+        with self._lock:
+            for start in range(first_bucket, int(end) + 1, width):
+                bucket = self._buckets[resolution].get(start, {})
+                bucket_total = 0
+                for key, (count, score_sum) in bucket.items():
+                    if analysis_type is not None and key[0] != analysis_type:
+                        continue
+                    entry = counts.setdefault(key, [0, 0.0])
+                    entry[0] += count
+                    entry[1] += score_sum
+                    bucket_total += count
+                series.append({"start": _isoformat(start), "analyses": bucket_total})
+                edges += self._edge_buckets[resolution].get(start, 0)
+
+        return {
+            "window_seconds": window_seconds,
+            "resolution": resolution,
+            **_distribution(counts),
+            "edges_ingested": edges,
+            "series": series,
+        }
+
+    def totals_summary(self) -> Dict[str, any]:
+        """All-time distribution (O(labels))."""
+        with self._lock:
+            counts = {key: list(value) for key, value in self.totals.items()}
+        return {**_distribution(counts), "edges_ingested": self.edges_ingested}
+
+    async def rebuild(self, client_factory=get_supabase, page_size: int = 1000) -> int:
+        """
+        Recompute every counter from the analysis_logs table, paging through it
+        in (created_at, id) order. Returns the number of rows replayed.
+        Only rows logged before the rebuild started are replayed; anything
+        newer is counted live as it is submitted, so it is never counted twice.
+        Graph ingestion counts are not logged, so they restart from zero.
+        """
+        self.reset()
+        started_at = datetime.utcnow().isoformat()
+        supabase = client_factory()
+        replayed = 0
+        after: Optional[Tuple[str, str]] = None
+        while True:
+            query = (
+                supabase.table("analysis_logs")
+                .select("id, analysis_type, result_label, result_score, created_at")
+                .lt("created_at", started_at)
+            )
+            if after is not None:
+                # Keyset pagination: resume strictly after the last (created_at, id) seen, so
+                # rows sharing a timestamp across a page boundary are neither skipped nor
+                # counted twice, and every page is a range scan of the (created_at, id) index.
+                # Spelled out as an or= filter (this postgrest client has no or_() builder).
+                created_at, row_id = after
+                query.params = query.params.add("or", f'(created_at.gt."{created_at}",and(created_at.eq."{created_at}",id.gt.{row_id}))')
+            result = await run_query(query.order("created_at,id").limit(page_size))
+            rows = result.data or []
+            self.replay(rows)
+            replayed += len(rows)
+            if len(rows) < page_size:
+                break
+            after = (rows[-1]["created_at"], rows[-1]["id"])
+        logger.info("Rebuilt analytics rollups from %d analysis log rows", replayed)
+        return replayed
+
+    def replay(self, rows: Iterable[Dict[str, any]]) -> None:
+        """Count analysis_logs rows (dicts as returned by Supabase)."""
+        for row in rows:
+            created_at = row.get("created_at")
+            if isinstance(created_at, str):
+                created_at = datetime.fromisoformat(created_at)
+            self.record(row["analysis_type"], row["result_label"], float(row["result_score"]), created_at)
+
+
+def _timestamp(moment: Optional[datetime]) -> float:
+    if moment is None:
+        return datetime.now(timezone.utc).timestamp()
+    if moment.tzinfo is None:
+        # Log timestamps are naive UTC (datetime.utcnow)
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _isoformat(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def _bump(counters: Dict[Tuple[str, str], list], key: Tuple[str, str], score: float) -> None:
+    entry = counters.get(key)
+    if entry is None:
+        entry = counters[key] = [0, 0.0]
+    entry[0] += 1
+    entry[1] += score
+
+
+def _prune(buckets: Dict[int, any], newest: int, width: int, retention: int) -> None:
+    # Runs once per new bucket, so the cost is amortized over a whole bucket width
+    cutoff = newest - width * retention
+    for start in [start for start in buckets if start <= cutoff]:
+        del buckets[start]
+
+
+def _distribution(counts: Dict[Tuple[str, str], list]) -> Dict[str, any]:
+    total = sum(count for count, _ in counts.values())
+    by_label: Dict[str, int] = {}
+    by_type: Dict[str, Dict[str, int]] = {}
+    score_sum = 0.0
+    for (analysis_type, label), (count, label_score_sum) in counts.items():
+        by_label[label] = by_label.get(label, 0) + count
+        by_type.setdefault(analysis_type, {})[label] = by_type.get(analysis_type, {}).get(label, 0) + count
+        score_sum += label_score_sum
+    return {
+        "total": total,
+        "by_label": by_label,
+        "by_type": by_type,
+        "label_share": {label: round(count / total, 4) for label, count in by_label.items()} if total else {},
+        "mean_score": round(score_sum / total, 4) if total else 0.0,
+    }
+
+
+# Singleton instance
+analytics_rollups = AnalyticsRollups()
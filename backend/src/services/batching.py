@@ -0,0 +1,162 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from ..core.config import settings
+from ..core.executors import run_cpu
+from .near_duplicates import campaign_text_batch_analysis
+from .result_cache import cached_meme_batch_analysis
+
+
+class MicroBatcher:
+    """
+    Dynamic batching scheduler for classifier inference.
+    Concurrent submit() calls are collected into one batch, bounded by
+    max_batch_size and max_wait_ms, scored with a single batch_fn call on the
+    CPU pool, and each awaiting caller receives its own result. Up to
+    max_concurrency batches run at once (one per CPU pool thread); the next
+    batch is collected only when a slot frees up, so under load batches grow
+    instead of queueing behind each other.
+    batch_fn takes a list of items and returns a list of results in the same order.
+    """
+
+    # Upper bounds of the batch-size histogram buckets
+    HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 32, max_wait_ms: float = 2.0, max_concurrency: int = 1):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrency = max_concurrency
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.batches = 0
+        self.items = 0
+        self.max_queue_depth = 0
+        self.batch_size_histogram: Dict[str, int] = {str(bound): 0 for bound in self.HISTOGRAM_BUCKETS}
+        self.batch_size_histogram["+Inf"] = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item for the next batch and wait for its result."""
+        if self._task is None or self._task.done():
+            await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def start(self) -> None:
+        """Start the batching task (also started lazily on first submit)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the batching task, wait for batches already running; items still queued are failed."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batcher stopped"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, batch counts and the batch-size histogram."""
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches_in_flight": len(self._in_flight),
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "batch_size_histogram": dict(self.batch_size_histogram),
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._collect_batch()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        self._slots.release()
+
+    async def _collect_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        self._record(len(batch))
+        items = [item for item, _ in batch]
+        try:
+            results = await run_cpu(self.batch_fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"batch_fn returned {len(results)} results for {len(items)} items")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # Callers that went away (e.g. client disconnect) have cancelled futures
+            if not future.done():
+                future.set_result(result)
+
+    def _record(self, size: int) -> None:
+        self.batches += 1
+        self.items += size
+        for bound in self.HISTOGRAM_BUCKETS:
+            if size <= bound:
+                self.batch_size_histogram[str(bound)] += 1
+                return
+        self.batch_size_histogram["+Inf"] += 1
+
+
+# Singleton instances
+text_batcher = MicroBatcher(
+    campaign_text_batch_analysis,
+    max_batch_size=settings.INFERENCE_BATCH_MAX_SIZE,
+    max_wait_ms=settings.INFERENCE_BATCH_MAX_WAIT_MS,
+    max_concurrency=settings.CPU_POOL_SIZE,
+)
+meme_batcher = MicroBatcher(
+    cached_meme_batch_analysis,
+    max_batch_size=settings.INFERENCE_BATCH_MAX_SIZE,
+    max_wait_ms=settings.INFERENCE_BATCH_MAX_WAIT_MS,
+    max_concurrency=settings.CPU_POOL_SIZE,
+)
@@ -0,0 +1,208 @@
+from array import array
+from typing import Dict, List, Optional, Set
+from .graph_store import GraphStore, ACCOUNT_TYPES, COORDINATED
+
+# Coordination is a stronger community signal than sharing the same post
+COORDINATED_WEIGHT = 3
+
+# Mean member risk from which a cluster is "high" (or "critical") risk
+HIGH_RISK_MEAN = 0.6
+
+
+class CommunityDetector:
+    """
+    Incremental label propagation over the account/post graph.
+    Every node holds a community label (initially its own index). Ingested
+    edges mark their endpoints dirty; run() re-evaluates dirty nodes, moving
+    each to the label with the largest edge weight among its neighbors and
+    marking the neighbors of any node that moved. Work is proportional to the
+    changed neighborhood, never the whole graph, and is bounded per call so it
+    can run in the background. Per-community account counts and risk sums are
+    maintained as labels change, so membership and cluster risk are O(1) reads,
+    as are the counts of clusters and of high-risk clusters.
+    """
+
+    def __init__(self, store: GraphStore, min_cluster_size: int = 3):
+        self.store = store
+        self.min_cluster_size = min_cluster_size
+
+        self._labels = array("I")
+        self._counted = array("B")  # whether the node is counted in its community's aggregates
+        self._counted_risk = array("d")  # risk attributed to the node's community
+        self._dirty: Set[int] = set()
+
+        # Per-community aggregates over accounts, keyed by label
+        self._members: Dict[int, int] = {}
+        self._risk: Dict[int, float] = {}
+        # Labels with at least min_cluster_size accounts, and those of them at HIGH_RISK_MEAN or above
+        self._clusters: Set[int] = set()
+        self._high_risk: Set[int] = set()
+
+        # Nodes that moved into a community, keyed by label. A node still carrying
+        # its own initial label is an implicit member, so singletons cost nothing.
+        self._moved_in: Dict[int, Set[int]] = {}
+
+        # Metrics
+        self.evaluations = 0
+        self.moves = 0
+
+    @property
+    def cluster_count(self) -> int:
+        return len(self._clusters)
+
+    @property
+    def high_risk_cluster_count(self) -> int:
+        return len(self._high_risk)
+
+    @property
+    def pending(self) -> int:
+        """Nodes waiting to be re-evaluated."""
+        return len(self._dirty)
+
+    def on_edge(self, edge: int) -> None:
+        """Mark the endpoints of an ingested edge for re-evaluation."""
+        source, target = self.store.edge_endpoints(edge)
+        self._track(max(source, target))
+        self._dirty.add(source)
+        self._dirty.add(target)
+
+    def on_node(self, index: int) -> None:
+        """Pick up a new node or a change in its type or risk score."""
+        with self.store.lock:
+            self._track(index)
+            self._refresh(index)
+
+    def run(self, budget: int = 10000) -> int:
+        """Re-evaluate up to budget dirty nodes; returns how many labels changed."""
+        moved = 0
+        with self.store.lock:
+            for _ in range(min(budget, len(self._dirty))):
+                index = self._dirty.pop()
+                new_label = self._best_label(index)
+                self.evaluations += 1
+                if new_label != self._labels[index]:
+                    self._relabel(index, new_label)
+                    self._dirty.update(neighbor for neighbor, _, _ in self.store.adjacent(index))
+                    moved += 1
+        self.moves += moved
+        return moved
+
+    def run_until_stable(self, max_evaluations: int = 1_000_000) -> None:
+        """Propagate until no node is dirty (or the evaluation cap is hit)."""
+        while self._dirty and max_evaluations > 0:
+            batch = min(max_evaluations, len(self._dirty))
+            self.run(batch)
+            max_evaluations -= batch
+
+    def community_of(self, node_id: str) -> Optional[int]:
+        """Community label of a node, or None if the node is unknown."""
+        index = self.store.index_of(node_id)
+        if index is None or index >= len(self._labels):
+            return None
+        return self._labels[index]
+
+    def community_of_index(self, index: int) -> int:
+        return self._labels[index] if index < len(self._labels) else index
+
+    def snapshot_labels(self) -> array:
+        """Copy of every node's label; nodes not yet tracked carry their own index."""
+        with self.store.lock:
+            labels = array("I", self._labels)
+            labels.extend(range(len(labels), self.store.node_count))
+            return labels
+
+    def members_of(self, label: int) -> List[int]:
+        """Node indices (accounts and posts) currently in a community, ascending."""
+        with self.store.lock:
+            members = set(self._moved_in.get(label, ()))
+            if label < len(self._labels) and self._labels[label] == label:
+                members.add(label)
+            return sorted(members)
+
+    def clusters(self) -> List[Dict[str, any]]:
+        """Communities with at least min_cluster_size accounts: label, member count and mean risk."""
+        return [self.cluster_summary(label) for label in list(self._clusters)]
+
+    def cluster_summary(self, label: int) -> Dict[str, any]:
+        members = self._members.get(label, 0)
+        return {"label": label, "member_count": members, "mean_risk": self._risk.get(label, 0.0) / members if members else 0.0}
+
+    def _track(self, index: int) -> None:
+        # Extend per-node arrays to cover newly interned nodes
+        while len(self._labels) <= index:
+            new_index = len(self._labels)
+            self._labels.append(new_index)
+            self._counted.append(0)
+            self._counted_risk.append(0.0)
+            self._add_member(new_index, new_index)
+
+    def _add_member(self, index: int, label: int) -> None:
+        # Only accounts count towards community size and risk
+        if self.store.node_at(index).type not in ACCOUNT_TYPES:
+            self._counted[index] = 0
+            return
+        risk = self.store.node_at(index).risk_score or 0.0
+        self._counted[index] = 1
+        self._counted_risk[index] = risk
+        self._members[label] = self._members.get(label, 0) + 1
+        self._risk[label] = self._risk.get(label, 0.0) + risk
+        self._update_cluster(label)
+
+    def _remove_member(self, index: int, label: int) -> None:
+        if not self._counted[index]:
+            return
+        self._counted[index] = 0
+        self._members[label] -= 1
+        self._risk[label] -= self._counted_risk[index]
+        if self._members[label] == 0:
+            del self._members[label]
+            del self._risk[label]
+        self._update_cluster(label)
+
+    def _update_cluster(self, label: int) -> None:
+        members = self._members.get(label, 0)
+        if members >= self.min_cluster_size:
+            self._clusters.add(label)
+            if self._risk[label] / members >= HIGH_RISK_MEAN:
+                self._high_risk.add(label)
+            else:
+                self._high_risk.discard(label)
+        else:
+            self._clusters.discard(label)
+            self._high_risk.discard(label)
+
+    def _refresh(self, index: int) -> None:
+        label = self._labels[index]
+        self._remove_member(index, label)
+        self._add_member(index, label)
+
+    def _relabel(self, index: int, new_label: int) -> None:
+        old_label = self._labels[index]
+        self._remove_member(index, old_label)
+
+        moved_out = self._moved_in.get(old_label)
+        if moved_out is not None:
+            moved_out.discard(index)
+            if not moved_out:
+                del self._moved_in[old_label]
+        if new_label != index:
+            self._moved_in.setdefault(new_label, set()).add(index)
+
+        self._labels[index] = new_label
+        self._add_member(index, new_label)
+
+    def _best_label(self, index: int) -> int:
+        labels = self._labels
+        current = labels[index]
+        scores: Dict[int, int] = {}
+        for neighbor, weight, code in self.store.adjacent(index):
+            label = labels[neighbor]
+            scores[label] = scores.get(label, 0) + (weight * COORDINATED_WEIGHT if code == COORDINATED else weight)
+        if not scores:
+            return current
+
+        best_score = max(scores.values())
+        # Stay put on ties to damp oscillation; otherwise break ties deterministically
+        if scores.get(current, 0) == best_score:
+            return current
+        return min(label for label, score in scores.items() if score == best_score)
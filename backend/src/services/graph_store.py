@@ -0,0 +1,303 @@
+import heapq
+import threading
+from array import array
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ACCOUNT_TYPES = ("bot_account", "suspicious_account", "normal_account")
+SUSPICIOUS_TYPES = ("bot_account", "suspicious_account")
+POST_TYPE = "post"
+NODE_TYPES = ACCOUNT_TYPES + (POST_TYPE,)
+
+# Relationship names are stored as one-byte codes
+RELATIONSHIPS = ("created", "shared", "amplified", "coordinated_with")
+RELATIONSHIP_CODES = {name: code for code, name in enumerate(RELATIONSHIPS)}
+COORDINATED = RELATIONSHIP_CODES["coordinated_with"]
+
+# A post shared by this many suspicious accounts counts as an active campaign
+CAMPAIGN_MIN_SHARERS = 3
+
+# Out-degree at which a node gets a hashed (target, relationship) -> edge lookup;
+# below it, deduplicating a new edge scans at most this many outgoing edges
+HUB_DEGREE = 32
+
+# Risk index granularity: bucket i holds nodes with risk_score in [i/10, (i+1)/10)
+RISK_BUCKETS = 10
+
+
+def risk_bucket(risk_score: float) -> int:
+    return min(max(int(risk_score * RISK_BUCKETS), 0), RISK_BUCKETS - 1)
+
+
+class GraphCapacityError(RuntimeError):
+    """Raised when ingesting would exceed the configured node or edge capacity."""
+
+
+class NodeRecord:
+    """Attributes of one graph node. Slots keep per-node overhead small."""
+
+    __slots__ = ("id", "type", "label", "risk_score", "follower_count", "engagement", "sentiment")
+
+    def __init__(self, node_id: str, node_type: str):
+        self.id = node_id
+        self.type = node_type
+        self.label = None
+        self.risk_score = None
+        self.follower_count = None
+        self.engagement = None
+        self.sentiment = None
+
+    def to_dict(self) -> Dict[str, any]:
+        node = {"id": self.id, "label": self.label or self.id, "type": self.type}
+        for field in ("risk_score", "follower_count", "engagement", "sentiment"):
+            value = getattr(self, field)
+            if value is not None:
+                node[field] = value
+        return node
+
+
+class GraphStore:
+    """
+    In-process account/post graph with incremental ingestion.
+    Node IDs are interned to dense integer indices; edges live in parallel
+    typed arrays (source, target, relationship code, weight) and every node
+    keeps arrays of its outgoing and incoming edge indices; hubs (out-degree
+    >= HUB_DEGREE, e.g. bot and amplifier accounts) also get a dict of their
+    outgoing edges so repeated edges are found in O(1). Aggregates used
+    by the stats endpoint are updated on every write, so reads never scan.
+    Sorted secondary indexes by node type and risk bucket let filtered
+    queries page through matching nodes without a full scan.
+    """
+
+    def __init__(self, max_nodes: int = 1_000_000, max_edges: int = 5_000_000):
+        self.max_nodes = max_nodes
+        self.max_edges = max_edges
+        self._lock = threading.RLock()
+
+        # Nodes
+        self._ids: Dict[str, int] = {}
+        self._nodes: List[NodeRecord] = []
+        self._out: List[array] = []
+        self._in: List[array] = []
+
+        # Edges
+        self._edge_source = array("I")
+        self._edge_target = array("I")
+        self._edge_relationship = array("B")
+        self._edge_weight = array("I")
+        # Hub node index -> {(target << 2) | relationship code: edge index}
+        self._hub_edges: Dict[int, Dict[int, int]] = {}
+
+        # Secondary indexes: sorted arrays of node indices
+        self._type_index: Dict[str, array] = {node_type: array("I") for node_type in NODE_TYPES}
+        self._risk_index: List[array] = [array("I") for _ in range(RISK_BUCKETS)]
+
+        # Campaign tracking: suspicious accounts that pushed each post
+        self._post_sharers = array("I")
+
+        # Maintained counters
+        self.type_counts: Dict[str, int] = {node_type: 0 for node_type in NODE_TYPES}
+        self.relationship_counts: Dict[str, int] = {name: 0 for name in RELATIONSHIPS}
+        self.active_campaigns = 0
+        self.rejected_edges = 0
+
+        # Bumped on every mutation so derived views can be cached per version
+        self.version = 0
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Lock guarding the store; held by derived structures that read adjacency."""
+        return self._lock
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self._edge_source)
+
+    def upsert_node(self, node_id: str, node_type: Optional[str] = None, **attributes) -> int:
+        """Create or update a node; returns its interned index."""
+        with self._lock:
+            index = self._intern(node_id, node_type or "normal_account")
+            record = self._nodes[index]
+
+            if node_type is not None and node_type != record.type:
+                self._check_type(node_type)
+                self.type_counts[record.type] -= 1
+                self.type_counts[node_type] += 1
+                _index_remove(self._type_index[record.type], index)
+                insort(self._type_index[node_type], index)
+                record.type = node_type
+
+            risk_score = attributes.get("risk_score")
+            if risk_score is not None and risk_score != record.risk_score:
+                if record.risk_score is not None:
+                    _index_remove(self._risk_index[risk_bucket(record.risk_score)], index)
+                insort(self._risk_index[risk_bucket(risk_score)], index)
+
+            for field, value in attributes.items():
+                if value is not None:
+                    setattr(record, field, value)
+
+            self.version += 1
+            return index
+
+    def add_edge(self, source_id: str, target_id: str, relationship: str) -> int:
+        """
+        Ingest one edge, creating missing endpoints.
+        Repeated (source, target, relationship) edges increment the edge weight.
+        Returns the edge index.
+        """
+        code = RELATIONSHIP_CODES.get(relationship)
+        if code is None:
+            raise ValueError(f"Unknown relationship: {relationship}")
+
+        with self._lock:
+            try:
+                source = self._intern(source_id, "normal_account")
+                target = self._intern(target_id, "normal_account" if code == COORDINATED else POST_TYPE)
+            except GraphCapacityError:
+                self.rejected_edges += 1
+                raise
+
+            # Deduplicate against the source's outgoing edges: a hash lookup for hubs,
+            # otherwise a scan of fewer than HUB_DEGREE edges
+            key = (target << 2) | code
+            hub_edges = self._hub_edges.get(source)
+            if hub_edges is not None:
+                edge = hub_edges.get(key)
+            else:
+                edge = next((edge for edge in self._out[source]
+                             if self._edge_target[edge] == target and self._edge_relationship[edge] == code), None)
+            if edge is not None:
+                self._edge_weight[edge] += 1
+                self.version += 1
+                return edge
+
+            if self.edge_count >= self.max_edges:
+                self.rejected_edges += 1
+                raise GraphCapacityError(f"Graph edge capacity ({self.max_edges}) reached")
+
+            edge = self.edge_count
+            self._edge_source.append(source)
+            self._edge_target.append(target)
+            self._edge_relationship.append(code)
+            self._edge_weight.append(1)
+            self._out[source].append(edge)
+            self._in[target].append(edge)
+            if hub_edges is not None:
+                hub_edges[key] = edge
+            elif len(self._out[source]) >= HUB_DEGREE:
+                self._hub_edges[source] = {
+                    (self._edge_target[out] << 2) | self._edge_relationship[out]: out for out in self._out[source]
+                }
+            self.relationship_counts[relationship] += 1
+
+            if code != COORDINATED and self._nodes[target].type == POST_TYPE and self._nodes[source].type in SUSPICIOUS_TYPES:
+                self._post_sharers[target] += 1
+                if self._post_sharers[target] == CAMPAIGN_MIN_SHARERS:
+                    self.active_campaigns += 1
+
+            self.version += 1
+            return edge
+
+    def get_node(self, node_id: str) -> Optional[NodeRecord]:
+        index = self._ids.get(node_id)
+        return self._nodes[index] if index is not None else None
+
+    def index_of(self, node_id: str) -> Optional[int]:
+        return self._ids.get(node_id)
+
+    def node_at(self, index: int) -> NodeRecord:
+        return self._nodes[index]
+
+    def edge_endpoints(self, edge: int) -> Tuple[int, int]:
+        return self._edge_source[edge], self._edge_target[edge]
+
+    def adjacent(self, index: int) -> Iterator[Tuple[int, int, int]]:
+        """(neighbor index, edge weight, relationship code) for every edge touching a node."""
+        for edge in self._out[index]:
+            yield self._edge_target[edge], self._edge_weight[edge], self._edge_relationship[edge]
+        for edge in self._in[index]:
+            yield self._edge_source[edge], self._edge_weight[edge], self._edge_relationship[edge]
+
+    def out_edges(self, index: int) -> array:
+        """Indices of edges leaving a node."""
+        return self._out[index]
+
+    def matches(self, index: int, node_type: Optional[str] = None, min_risk: Optional[float] = None) -> bool:
+        """Whether a node passes the type and minimum-risk filters."""
+        record = self._nodes[index]
+        if node_type is not None and record.type != node_type:
+            return False
+        if min_risk is not None and (record.risk_score is None or record.risk_score < min_risk):
+            return False
+        return True
+
+    def iter_indices(self, node_type: Optional[str] = None, min_risk: Optional[float] = None, start: int = 0) -> Iterator[int]:
+        """
+        Node indices >= start matching the filters, in ascending order.
+        Uses whichever secondary index is smaller instead of scanning every node.
+        """
+        if node_type is not None:
+            self._check_type(node_type)
+
+        type_index = self._type_index[node_type] if node_type is not None else None
+        risk_buckets = self._risk_index[risk_bucket(min_risk):] if min_risk is not None else None
+
+        if type_index is not None and (risk_buckets is None or len(type_index) <= sum(map(len, risk_buckets))):
+            candidates = islice(type_index, bisect_left(type_index, start), None)
+        elif risk_buckets is not None:
+            candidates = heapq.merge(*(islice(bucket, bisect_left(bucket, start), None) for bucket in risk_buckets))
+        else:
+            candidates = range(start, self.node_count)
+
+        for index in candidates:
+            if self.matches(index, node_type, min_risk):
+                yield index
+
+    def snapshot_edges(self) -> Tuple[array, array, array]:
+        """Copies of the (source, target, weight) edge columns, for bulk aggregation outside the lock."""
+        with self._lock:
+            return array("I", self._edge_source), array("I", self._edge_target), array("I", self._edge_weight)
+
+    def edge_dict(self, edge: int) -> Dict[str, any]:
+        return {
+            "source": self._nodes[self._edge_source[edge]].id,
+            "target": self._nodes[self._edge_target[edge]].id,
+            "relationship": RELATIONSHIPS[self._edge_relationship[edge]],
+            "weight": self._edge_weight[edge],
+        }
+
+    def _intern(self, node_id: str, node_type: str) -> int:
+        index = self._ids.get(node_id)
+        if index is not None:
+            return index
+        self._check_type(node_type)
+        if self.node_count >= self.max_nodes:
+            raise GraphCapacityError(f"Graph node capacity ({self.max_nodes}) reached")
+
+        index = self.node_count
+        self._ids[node_id] = index
+        self._nodes.append(NodeRecord(node_id, node_type))
+        self._out.append(array("I"))
+        self._in.append(array("I"))
+        self._post_sharers.append(0)
+        self.type_counts[node_type] += 1
+        # New indices are the largest so far, so appending keeps the index sorted
+        self._type_index[node_type].append(index)
+        return index
+
+    @staticmethod
+    def _check_type(node_type: str) -> None:
+        if node_type not in NODE_TYPES:
+            raise ValueError(f"Unknown node type: {node_type}")
+
+
+def _index_remove(index_array: array, value: int) -> None:
+    position = bisect_left(index_array, value)
+    if position < len(index_array) and index_array[position] == value:
+        del index_array[position]
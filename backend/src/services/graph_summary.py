@@ -0,0 +1,195 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .graph_store import GraphStore, ACCOUNT_TYPES
+from .community import CommunityDetector
+
+OTHER_ID = "other"
+
+
+def force_layout(
+    node_count: int,
+    edges: np.ndarray,
+    weights: np.ndarray,
+    initial: Optional[np.ndarray] = None,
+    iterations: int = 50,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Fruchterman-Reingold layout in the unit square.
+    edges is an (m, 2) array of node indices, weights the matching edge weights.
+    initial (optional, (n, 2)) warm-starts the layout, so successive versions
+    of the same summary move little. Returns an (n, 2) array of coordinates.
+    """
+    if node_count == 0:
+        return np.zeros((0, 2))
+    rng = np.random.default_rng(seed)
+    positions = initial.copy() if initial is not None else rng.random((node_count, 2))
+    if node_count == 1:
+        return np.full((1, 2), 0.5)
+
+    k = np.sqrt(1.0 / node_count)
+    # Heavy edges pull harder, but damped so one hub edge cannot dominate
+    attraction = np.log1p(weights.astype(np.float64))
+    temperature = 0.1
+
+    for _ in range(iterations):
+        delta = positions[:, None, :] - positions[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=-1), 1e-3)
+        displacement = np.einsum("ij,ijk->ik", k * k / distance ** 2, delta)
+
+        if len(edges):
+            edge_delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+            edge_distance = np.maximum(np.linalg.norm(edge_delta, axis=-1), 1e-3)
+            pull = edge_delta * (attraction * edge_distance / k)[:, None]
+            np.subtract.at(displacement, edges[:, 0], pull)
+            np.add.at(displacement, edges[:, 1], pull)
+
+        length = np.maximum(np.linalg.norm(displacement, axis=-1), 1e-9)
+        positions += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature *= 0.95
+
+    # Normalize into the unit square
+    low = positions.min(axis=0)
+    span = np.maximum(positions.max(axis=0) - low, 1e-9)
+    return (positions - low) / span
+
+
+class GraphSummarizer:
+    """
+    Level-of-detail views of the network graph for large visualizations.
+    At zoom level z the 4**z * base_clusters largest communities become
+    super-nodes (every other node is folded into one "other" super-node), and
+    edges between super-nodes carry the summed weight of the edges they
+    replace. Summaries and their layout are computed per zoom level and served
+    from cache. Under steady ingest the graph version (store mutations plus
+    community moves) changes constantly, so a stale summary is rebuilt at
+    most once every refresh_interval seconds; in between the last one is served.
+    """
+
+    def __init__(self, store: GraphStore, communities: CommunityDetector, base_clusters: int = 50, max_zoom: int = 2, layout_iterations: int = 50, refresh_interval: float = 5.0):
+        self.store = store
+        self.communities = communities
+        self.base_clusters = base_clusters
+        self.max_zoom = max_zoom
+        self.layout_iterations = layout_iterations
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        self._cache: Dict[int, Tuple[Tuple[int, int], float, Dict[str, any]]] = {}  # zoom -> (version, built at, summary)
+        self._positions: Dict[int, Dict[str, Tuple[float, float]]] = {}  # zoom -> super-node id -> last (x, y)
+
+        # Metrics
+        self.hits = 0
+        self.builds = 0
+
+    @property
+    def version(self) -> Tuple[int, int]:
+        return self.store.version, self.communities.moves
+
+    def get(self, zoom: int = 0) -> Dict[str, any]:
+        """
+        Summary graph for a zoom level.
+        Returns: {"zoom", "version", "nodes": [super-nodes with x/y], "edges": [{source, target, weight}]}
+        """
+        if not 0 <= zoom <= self.max_zoom:
+            raise ValueError(f"Zoom level must be between 0 and {self.max_zoom}")
+
+        # One build at a time: concurrent requests for a stale zoom wait for the
+        # first build instead of repeating it
+        with self._lock:
+            version = self.version
+            cached = self._cache.get(zoom)
+            if cached is not None:
+                cached_version, built_at, summary = cached
+                if cached_version == version or time.monotonic() - built_at < self.refresh_interval:
+                    self.hits += 1
+                    return summary
+
+            summary = self._build(zoom)
+            self._cache[zoom] = (version, time.monotonic(), summary)
+            self.builds += 1
+            return summary
+
+    def _build(self, zoom: int) -> Dict[str, any]:
+        version = self.version
+        # Copy labels and edge columns together so they describe the same graph;
+        # the aggregation below runs without holding the store lock
+        with self.store.lock:
+            label_column = self.communities.snapshot_labels()
+            edge_columns = self.store.snapshot_edges()
+            clusters = self.communities.clusters()
+            accounts = sum(self.store.type_counts[node_type] for node_type in ACCOUNT_TYPES)
+        labels = np.frombuffer(label_column, dtype=np.uint32).astype(np.int64)
+        sources, targets, weights = (np.frombuffer(column, dtype=np.uint32).astype(np.int64) for column in edge_columns)
+
+        clusters.sort(key=lambda cluster: (-cluster["member_count"], cluster["label"]))
+        clusters = clusters[:self.base_clusters * 4 ** zoom]
+
+        # Map every node to its super-node; the last slot is "other"
+        other = len(clusters)
+        lookup = np.full(len(labels), other, dtype=np.int64)
+        lookup[[cluster["label"] for cluster in clusters]] = np.arange(other)
+        node_super = lookup[labels]
+        node_counts = np.bincount(node_super, minlength=other + 1)
+
+        # Aggregate edge weights between super-nodes (undirected)
+        edge_super = node_super[sources], node_super[targets]
+        internal = edge_super[0] == edge_super[1]
+        internal_weight = np.bincount(edge_super[0][internal], weights=weights[internal], minlength=other + 1)
+        low = np.minimum(*edge_super)[~internal]
+        high = np.maximum(*edge_super)[~internal]
+        pairs, inverse = np.unique(low * (other + 1) + high, return_inverse=True)
+        pair_weights = np.bincount(inverse, weights=weights[~internal], minlength=len(pairs))
+        pair_edges = np.stack([pairs // (other + 1), pairs % (other + 1)], axis=1)
+
+        ids = [f"cluster_{cluster['label']}" for cluster in clusters] + [OTHER_ID]
+        positions = self._layout(zoom, ids, pair_edges, pair_weights)
+
+        nodes = []
+        for position, cluster in enumerate(clusters):
+            seed = self.store.node_at(cluster["label"])
+            nodes.append({
+                "id": ids[position],
+                "label": f"Network of {seed.label or seed.id}",
+                "type": "cluster",
+                "member_count": cluster["member_count"],
+                "node_count": int(node_counts[position]),
+                "internal_weight": int(internal_weight[position]),
+                "mean_risk": round(cluster["mean_risk"], 4),
+                "x": round(float(positions[position, 0]), 4),
+                "y": round(float(positions[position, 1]), 4),
+            })
+        if node_counts[other]:
+            nodes.append({
+                "id": OTHER_ID,
+                "label": "Other accounts and posts",
+                "type": OTHER_ID,
+                "member_count": max(accounts - sum(cluster["member_count"] for cluster in clusters), 0),
+                "node_count": int(node_counts[other]),
+                "internal_weight": int(internal_weight[other]),
+                "x": round(float(positions[other, 0]), 4),
+                "y": round(float(positions[other, 1]), 4),
+            })
+
+        edges = [
+            {"source": ids[source], "target": ids[target], "weight": int(weight)}
+            for (source, target), weight in zip(pair_edges.tolist(), pair_weights.tolist())
+            if node_counts[source] and node_counts[target]
+        ]
+
+        return {"zoom": zoom, "version": f"{version[0]}.{version[1]}", "nodes": nodes, "edges": edges}
+
+    def _layout(self, zoom: int, ids: List[str], edges: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        # Warm-start from the previous layout at this zoom so the picture is stable across versions
+        previous = self._positions.get(zoom, {})
+        rng = np.random.default_rng(zoom)
+        initial = rng.random((len(ids), 2))
+        for position, node_id in enumerate(ids):
+            if node_id in previous:
+                initial[position] = previous[node_id]
+
+        positions = force_layout(len(ids), edges, weights, initial=initial, iterations=self.layout_iterations)
+        self._positions[zoom] = {node_id: tuple(positions[position]) for position, node_id in enumerate(ids)}
+        return positions
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from typing import Dict, Optional
+from ..core.admission import admission_controllers
+from ..core.config import settings
+from ..core.database import db_executor, ping_database
+from ..core.executors import password_executor
+from ..core.readiness import readiness
+from .log_sink import analysis_log_sink
+from .batching import text_batcher, meme_batcher
+
+
+class EventLoopLagMonitor:
+    """
+    Measures event-loop lag: a task sleeps for a fixed interval and records
+    how late it wakes up. Sustained lag means handlers are blocking the loop.
+    """
+
+    def __init__(self, interval: float = 0.25):
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag = max(loop.time() - expected, 0.0)
+            self.max_lag = max(self.max_lag, self.lag)
+
+
+class HealthMonitor:
+    """
+    Per-dependency health probes for the readiness endpoint.
+    Probes the database with a trivial query (latency and executor backlog),
+    reports warm-up state, background queue depths and event-loop lag, and
+    caches the combined result for cache_seconds so frequent load-balancer
+    probes cost one real check per interval. Concurrent callers share the
+    in-flight check.
+    """
+
+    def __init__(self, cache_seconds: float = 1.0, db_timeout: float = 2.0, max_loop_lag_ms: float = 500, max_queue_fill: float = 0.9):
+        self.cache_seconds = cache_seconds
+        self.db_timeout = db_timeout
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.max_queue_fill = max_queue_fill
+        self.loop_lag = EventLoopLagMonitor()
+
+        self._result: Optional[Dict[str, any]] = None
+        self._checked_at = 0.0
+        self._pending: Optional[asyncio.Task] = None
+
+    async def check(self) -> Dict[str, any]:
+        """Cached health report: {"ready": bool, "status": str, "checks": {...}}."""
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+            return self._result
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.create_task(self._check())
+        return await asyncio.shield(self._pending)
+
+    async def _check(self) -> Dict[str, any]:
+        checks = {
+            "database": await self._check_database(),
+            "warmup": self._check_warmup(),
+            "analysis_log_sink": self._check_log_sink(),
+            "inference_batchers": {
+                "ok": True,
+                "text_queue_depth": text_batcher.stats()["queue_depth"],
+                "meme_queue_depth": meme_batcher.stats()["queue_depth"],
+            },
+            "password_pool": self._check_password_pool(),
+            "admission": self._check_admission(),
+            "event_loop": self._check_event_loop(),
+        }
+        ready = all(check["ok"] for check in checks.values())
+        if ready:
+            status = "healthy"
+        elif not checks["warmup"]["ok"] and all(check["ok"] for name, check in checks.items() if name != "warmup"):
+            status = "starting"
+        else:
+            status = "unhealthy"
+
+        self._result = {"ready": ready, "status": status, "checks": checks}
+        self._checked_at = time.monotonic()
+        return self._result
+
+    async def _check_database(self) -> Dict[str, any]:
+        # Queries waiting for a free executor thread: a growing backlog means the pool is exhausted
+        pending = db_executor._work_queue.qsize()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(ping_database(), self.db_timeout)
+        except asyncio.TimeoutError:
+            return {"ok": False, "error": f"ping timed out after {self.db_timeout}s", "pending_queries": pending}
+        except Exception as e:
+            return {"ok": False, "error": str(e), "pending_queries": pending}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 1), "pending_queries": pending}
+
+    def _check_warmup(self) -> Dict[str, any]:
+        return {"ok": readiness.ready, "components": readiness.report()}
+
+    def _check_log_sink(self) -> Dict[str, any]:
+        stats = analysis_log_sink.stats()
+        fill = stats["queue_depth"] / stats["max_queue_size"] if stats["max_queue_size"] else 0.0
+        return {
+            "ok": fill < self.max_queue_fill,
+            "queue_depth": stats["queue_depth"],
+            "max_queue_size": stats["max_queue_size"],
+            "dropped": stats["dropped"],
+            "failed": stats["failed"],
+        }
+
+    def _check_password_pool(self) -> Dict[str, any]:
+        stats = password_executor.stats()
+        # Informational: a saturated bcrypt pool sheds logins with 503s but
+        # does not stop the worker from serving everything else
+        return {
+            "ok": True,
+            "saturated": stats["waiting"] >= password_executor.max_queue,
+            "waiting": stats["waiting"],
+            "running": stats["running"],
+            "rejected": stats["rejected"],
+        }
+
+    def _check_admission(self) -> Dict[str, any]:
+        # Informational: shedding is the overload response working as intended
+        return {"ok": True, **{route: controller.stats() for route, controller in admission_controllers.items()}}
+
+    def _check_event_loop(self) -> Dict[str, any]:
+        lag_ms = self.loop_lag.lag * 1000
+        return {
+            "ok": lag_ms < self.max_loop_lag_ms,
+            "lag_ms": round(lag_ms, 1),
+            "max_lag_ms": round(self.loop_lag.max_lag * 1000, 1),
+        }
+
+
+# Singleton instance
+health_monitor = HealthMonitor(
+    cache_seconds=settings.HEALTH_CACHE_SECONDS,
+    db_timeout=settings.HEALTH_DB_TIMEOUT,
+    max_loop_lag_ms=settings.HEALTH_MAX_LOOP_LAG_MS,
+    max_queue_fill=settings.HEALTH_MAX_QUEUE_FILL,
+)
@@ -0,0 +1,59 @@
+import io
+from typing import Tuple
+from PIL import Image
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+
+async def read_upload_limited(file, max_bytes: int, chunk_size: int = 64 * 1024) -> bytes:
+    """
+    Read an UploadFile in chunks, aborting as soon as max_bytes is exceeded.
+    Oversized uploads are never fully buffered in memory.
+    """
+    # Starlette records the spooled size; reject without reading anything if it is known
+    if file.size is not None and file.size > max_bytes:
+        raise ImageTooLargeError(f"Upload exceeds {max_bytes} bytes")
+
+    buffer = bytearray()
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        if len(buffer) + len(chunk) > max_bytes:
+            raise ImageTooLargeError(f"Upload exceeds {max_bytes} bytes")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def probe_image(image_bytes: bytes) -> Tuple[str, int, int]:
+    """
+    Read format and dimensions from the image header without decoding pixels.
+    Returns: (format, width, height)
+    """
+    # Image.open only parses the header; pixel data is decoded lazily on load()
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        width, height = image.size
+        return image.format or "unknown", width, height
+
+
+def load_for_model(image_bytes: bytes, size: Tuple[int, int], mode: str = "RGB") -> Image.Image:
+    """
+    Decode an image straight to (roughly) model input resolution.
+    JPEGs are DCT-scaled during decode via draft(); other formats are decoded
+    once and shrunk with reduce() before the final resize, so the
+    full-resolution bitmap is never converted or resampled.
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+
+    # JPEG only: decode at 1/2, 1/4 or 1/8 scale, keeping at least the requested size
+    image.draft(mode, size)
+
+    factor = min(image.width // size[0], image.height // size[1])
+    if factor >= 2:
+        image = image.reduce(factor)
+
+    if image.mode != mode:
+        image = image.convert(mode)
+    return image.resize(size, Image.BILINEAR)
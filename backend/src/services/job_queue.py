@@ -0,0 +1,339 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when submitting while max_queued jobs are already waiting."""
+
+
+class JobQueue:
+    """
+    Durable job queue in a local SQLite file.
+    Jobs are claimed highest priority first (then oldest first) with an
+    atomic UPDATE ... RETURNING, so every uvicorn worker on the host can share
+    one file. A claim is a lease: jobs whose worker died are queued again when
+    the lease expires. Failed jobs are retried with exponential backoff up to
+    max_attempts; finished jobs keep their result for result_ttl seconds.
+    All SQLite calls run on one dedicated thread, off the event loop.
+    """
+
+    # Expired results are purged at most this often
+    PURGE_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = 3,
+        retry_backoff: float = 2.0,
+        lease_seconds: float = 300,
+        result_ttl: float = 86400,
+        max_queued: int = 10000,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lease_seconds = lease_seconds
+        self.result_ttl = result_ttl
+        self.max_queued = max_queued
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+        # SQLite connections and executor threads must not cross fork(); children start fresh
+        os.register_at_fork(after_in_child=self._reset)
+
+        # Last stats() result, for scrape-time gauges
+        self.last_stats: Dict[str, int] = {status: 0 for status in JOB_STATUSES}
+
+    def _reset(self) -> None:
+        self._db = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    async def _call(self, func, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-queue")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args))
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # Opened on the queue thread on first use
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, user_id TEXT NOT NULL, "
+                "priority INTEGER NOT NULL, status TEXT NOT NULL, payload BLOB, params TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+                "created_at REAL NOT NULL, available_at REAL NOT NULL, started_at REAL, "
+                "lease_expires_at REAL, finished_at REAL, expires_at REAL)"
+            )
+            # Claim order: highest priority, then oldest, among jobs that are due
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, priority DESC, created_at)"
+            )
+        return self._db
+
+    async def submit(self, kind: str, user_id: str, payload: bytes, params: Optional[dict] = None, priority: int = 0) -> Dict[str, Any]:
+        """
+        Store a job and return its status; raises JobQueueFullError when the queue is full.
+        payload is the (possibly large) input; params holds small JSON options such as a filename.
+        """
+        return await self._call(self._submit, kind, user_id, payload, json.dumps(params or {}), priority)
+
+    async def claim(self) -> Optional[Dict[str, Any]]:
+        """Lease the next due job (payload included), or None if there is none."""
+        return await self._call(self._claim)
+
+    async def complete(self, job_id: str, result: Any) -> None:
+        await self._call(self._finish, job_id, "succeeded", json.dumps(result, separators=(",", ":")), None)
+
+    async def fail(self, job_id: str, error: str) -> str:
+        """Record a failed attempt; returns the new status ("queued" for a retry, or "failed")."""
+        return await self._call(self._fail, job_id, error)
+
+    async def release(self, job_id: str) -> None:
+        """Return a leased job to the queue without counting the attempt (worker shutting down)."""
+        await self._call(self._release, job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job status and, once finished, its result; None if unknown or expired."""
+        return await self._call(self._get, job_id)
+
+    async def stats(self) -> Dict[str, int]:
+        """Job counts per status."""
+        self.last_stats = await self._call(self._stats)
+        return self.last_stats
+
+    def _submit(self, kind: str, user_id: str, payload: bytes, params: str, priority: int) -> Dict[str, Any]:
+        now = time.time()
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            queued = db.execute("SELECT count(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= self.max_queued:
+                raise JobQueueFullError(f"Job queue is full ({self.max_queued} jobs waiting)")
+            job_id = str(uuid4())
+            db.execute(
+                "INSERT INTO jobs (id, kind, user_id, priority, status, payload, params, created_at, available_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, kind, user_id, priority, payload, params, now, now),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return {"job_id": job_id, "status": "queued", "queued_ahead": queued}
+
+    def _claim(self) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        self._maybe_purge(now)
+        db = self.db
+        # Leases that ran out belong to workers that died: the attempt counts as failed
+        db.execute(
+            "UPDATE jobs SET status = 'failed', error = 'Lease expired', payload = NULL, finished_at = ?, "
+            "expires_at = ?, lease_expires_at = NULL "
+            "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?",
+            (now, now + self.result_ttl, now, self.max_attempts),
+        )
+        db.execute(
+            "UPDATE jobs SET status = 'queued', available_at = ?, lease_expires_at = NULL "
+            "WHERE status = 'running' AND lease_expires_at < ?",
+            (now, now),
+        )
+        row = db.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, lease_expires_at = ? "
+            "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' AND available_at <= ? "
+            "ORDER BY priority DESC, created_at LIMIT 1) "
+            "RETURNING id, kind, user_id, priority, payload, params, attempts",
+            (now, now + self.lease_seconds, now),
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"] or "{}")
+        return job
+
+    def _finish(self, job_id: str, status: str, result: Optional[str], error: Optional[str]) -> None:
+        now = time.time()
+        # The payload is no longer needed once the job is done
+        self.db.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, finished_at = ?, "
+            "expires_at = ?, lease_expires_at = NULL WHERE id = ?",
+            (status, result, error, now, now + self.result_ttl, job_id),
+        )
+
+    def _fail(self, job_id: str, error: str) -> str:
+        row = self.db.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return "failed"
+        if row["attempts"] >= self.max_attempts:
+            self._finish(job_id, "failed", None, error)
+            return "failed"
+        delay = self.retry_backoff * 2 ** (row["attempts"] - 1)
+        self.db.execute(
+            "UPDATE jobs SET status = 'queued', error = ?, available_at = ?, lease_expires_at = NULL WHERE id = ?",
+            (error, time.time() + delay, job_id),
+        )
+        return "queued"
+
+    def _release(self, job_id: str) -> None:
+        self.db.execute(
+            "UPDATE jobs SET status = 'queued', attempts = attempts - 1, lease_expires_at = NULL "
+            "WHERE id = ? AND status = 'running'",
+            (job_id,),
+        )
+
+    def _get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self.db.execute(
+            "SELECT id, kind, user_id, priority, status, attempts, result, error, created_at, started_at, "
+            "finished_at, expires_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None or (row["expires_at"] is not None and row["expires_at"] <= time.time()):
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def _stats(self) -> Dict[str, int]:
+        counts = dict(self.db.execute("SELECT status, count(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in JOB_STATUSES}
+
+    def _maybe_purge(self, now: float) -> None:
+        if now - self._last_purge < self.PURGE_INTERVAL:
+            return
+        self._last_purge = now
+        self.db.execute("DELETE FROM jobs WHERE expires_at <= ?", (now,))
+
+
+class JobWorkerPool:
+    """
+    Background workers that run queued jobs in this process.
+    Each worker claims one job at a time and awaits its handler (which
+    offloads the classifier work to the CPU pool), so throughput is set by
+    the number of workers rather than by HTTP timeouts. Idle workers wake on
+    local submissions immediately and poll for jobs submitted by other
+    processes every poll_interval.
+    """
+
+    def __init__(self, queue: JobQueue, concurrency: int = 2, poll_interval: float = 0.5):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Awaitable[Any]]] = {}
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stats_at = 0.0
+
+        # Metrics
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any]], Awaitable[Any]]) -> None:
+        """Set the coroutine function that runs jobs of this kind; it receives the claimed job."""
+        self.handlers[kind] = handler
+
+    def notify(self) -> None:
+        """Wake an idle worker (called after a local submit)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._wakeup = asyncio.Event()
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": len(self._tasks),
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            **self.queue.last_stats,
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # Keep queue.last_stats (queue depth gauges) at most poll_interval old
+                if loop.time() - self._stats_at >= self.poll_interval:
+                    self._stats_at = loop.time()
+                    await self.queue.stats()
+                job = await self.queue.claim()
+            except Exception:
+                logger.exception("Failed to read the job queue")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._execute(job)
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        handler = self.handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind: {job['kind']}")
+            result = await handler(job)
+        except asyncio.CancelledError:
+            await asyncio.shield(self.queue.release(job["id"]))
+            raise
+        except Exception as e:
+            logger.warning("Job %s (%s) attempt %d failed: %s", job["id"], job["kind"], job["attempts"], e)
+            if await self.queue.fail(job["id"], f"{type(e).__name__}: {e}") == "queued":
+                self.retried += 1
+            else:
+                self.failed += 1
+            return
+
+        await self.queue.complete(job["id"], result)
+        self.succeeded += 1
+
+
+# Singleton instances
+job_queue = JobQueue(
+    path=settings.JOB_QUEUE_PATH,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_backoff=settings.JOB_RETRY_BACKOFF_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    result_ttl=settings.JOB_RESULT_TTL_SECONDS,
+    max_queued=settings.JOB_MAX_QUEUED,
+)
+job_workers = JobWorkerPool(job_queue, concurrency=settings.JOB_WORKERS, poll_interval=settings.JOB_POLL_INTERVAL)
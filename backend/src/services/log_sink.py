@@ -0,0 +1,214 @@
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Sequence
+from ..core.config import settings
+from ..core.database import get_supabase, run_query
+from ..models.analysis_logs import AnalysisLogCreate
+from .alerts import alert_service
+from .analytics import analytics_rollups
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisLogSink:
+    """
+    Write-behind buffer for analysis logs.
+    Records carry a client-generated UUID, so request handlers can return an
+    analysis_id without waiting on the database. A background task drains the
+    bounded queue and writes rows in bulk inserts once a batch fills up or the
+    flush interval elapses; failed inserts are retried with exponential
+    backoff before the batch is given up on. Every on_accept callback is called for each
+    accepted record (used to keep analytics rollups current and to raise
+    alerts without reading the table back).
+    """
+
+    # How often submit_bulk() checks whether the queue has drained enough
+    BULK_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        client_factory: Callable = get_supabase,
+        table: str = "analysis_logs",
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        enqueue_timeout: float = 0.05,
+        flush_retries: int = 3,
+        retry_backoff: float = 0.5,
+        on_accept: Sequence[Callable[[AnalysisLogCreate], None]] = (),
+    ):
+        self.client_factory = client_factory
+        self.table = table
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.flush_retries = flush_retries
+        self.retry_backoff = retry_backoff
+        self.on_accept = tuple(on_accept)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        # Counters
+        self.submitted = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.retries = 0
+        self.flushes = 0
+
+    @property
+    def queue(self) -> asyncio.Queue:
+        # Created lazily so the queue binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        return self._queue
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop accepting work, flush everything still queued and wait for the task to finish."""
+        self._closing = True
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def submit(self, record: AnalysisLogCreate) -> bool:
+        """
+        Queue a record for writing.
+        Waits up to enqueue_timeout for space when the queue is full (backpressure),
+        then drops the record. Returns True if the record was accepted.
+        """
+        return (await self.submit_many([record]))[0]
+
+    async def submit_many(self, records: List[AnalysisLogCreate]) -> List[bool]:
+        """
+        Queue several records; returns per-record acceptance in input order.
+        The whole batch shares one enqueue_timeout: records that still do not
+        fit when it runs out are all dropped at once.
+        """
+        accepted = [False] * len(records)
+        if self._closing:
+            self.dropped += len(records)
+            return accepted
+
+        loop = asyncio.get_running_loop()
+        deadline = None
+        for index, record in enumerate(records):
+            try:
+                self.queue.put_nowait(record)
+            except asyncio.QueueFull:
+                if deadline is None:
+                    deadline = loop.time() + self.enqueue_timeout
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self.queue.put(record), timeout)
+                except asyncio.TimeoutError:
+                    break
+            accepted[index] = True
+            self.submitted += 1
+            for callback in self.on_accept:
+                callback(record)
+
+        self.dropped += accepted.count(False)
+        return accepted
+
+    async def submit_bulk(self, records: List[AnalysisLogCreate], timeout: float) -> List[bool]:
+        """
+        Queue many records from a background producer (e.g. a job worker).
+        Records go in batch_size chunks, and before each chunk this waits, up to
+        timeout in total, until the queue is at most half full. A bulk producer
+        therefore never takes the room that request handlers' submits need.
+        Returns per-record acceptance in input order.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        high_water = max(self.max_queue_size // 2, self.batch_size)
+        accepted: List[bool] = []
+        for start in range(0, len(records), self.batch_size):
+            chunk = records[start:start + self.batch_size]
+            while not self._closing and self.queue.qsize() + len(chunk) > high_water and loop.time() < deadline:
+                await asyncio.sleep(self.BULK_POLL_INTERVAL)
+            accepted += await self.submit_many(chunk)
+        return accepted
+
+    def stats(self) -> Dict[str, int]:
+        """Return sink counters and the current queue depth."""
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_size": self.max_queue_size,
+            "submitted": self.submitted,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "retries": self.retries,
+            "flushes": self.flushes,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            if batch:
+                await self._flush(batch)
+            if self._closing and self.queue.empty():
+                return
+
+    async def _collect_batch(self) -> List[AnalysisLogCreate]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        batch: List[AnalysisLogCreate] = []
+
+        while len(batch) < self.batch_size:
+            # Drain whatever is already queued without suspending
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            timeout = deadline - loop.time()
+            if len(batch) >= self.batch_size or self._closing or timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _flush(self, batch: List[AnalysisLogCreate]) -> None:
+        rows = [record.model_dump(mode="json") for record in batch]
+        for attempt in range(self.flush_retries + 1):
+            try:
+                supabase = self.client_factory()
+                # Rows carry their own ids, so a retry after an insert that did
+                # land (e.g. a timed-out response) skips them instead of failing
+                await run_query(supabase.table(self.table).upsert(rows, ignore_duplicates=True))
+            except Exception:
+                if attempt == self.flush_retries:
+                    self.failed += len(rows)
+                    logger.exception("Failed to flush %d analysis log rows after %d attempts", len(rows), attempt + 1)
+                    return
+                self.retries += 1
+                logger.warning("Flushing %d analysis log rows failed, retrying", len(rows), exc_info=True)
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+                continue
+            self.flushed += len(rows)
+            self.flushes += 1
+            return
+
+
+# Singleton instance
+analysis_log_sink = AnalysisLogSink(
+    max_queue_size=settings.LOG_SINK_MAX_QUEUE_SIZE,
+    batch_size=settings.LOG_SINK_BATCH_SIZE,
+    flush_interval=settings.LOG_SINK_FLUSH_INTERVAL,
+    flush_retries=settings.LOG_SINK_FLUSH_RETRIES,
+    retry_backoff=settings.LOG_SINK_RETRY_BACKOFF_SECONDS,
+    on_accept=(analytics_rollups.record_log, alert_service.record_log),
+)
@@ -1,7 +1,8 @@
 import random
-from typing import Dict
+from typing import Dict, List, Tuple
 from PIL import Image
-import io
+from ..core.metrics import span
+from .image_io import probe_image, load_for_model
 
 
 class MemeClassifier:
@@ -10,18 +11,35 @@ class MemeClassifier:
     In production, this would use computer vision models for harmful meme detection.
     """
 
+    # Bump when scoring logic changes; cached results are keyed by version
+    MODEL_VERSION = "placeholder-1"
+
+    # Input resolution of the production CNN
+    INPUT_SIZE = (224, 224)
+
+    @property
+    def version(self) -> str:
+        return self.MODEL_VERSION
+
+    def preprocess(self, image_bytes: bytes) -> Image.Image:
+        """Decode an image directly at model input resolution."""
+        return load_for_model(image_bytes, self.INPUT_SIZE)
+
     def analyze(self, image_bytes: bytes, filename: str) -> Dict[str, any]:
         """
         Analyze uploaded image and return a risk score.
         Returns: {"score": float (0-1), "label": str, "explanation": str}
         """
+        with span("meme_classifier.analyze"):
+            return self._analyze(image_bytes, filename)
+
+    def _analyze(self, image_bytes: bytes, filename: str) -> Dict[str, any]:
         try:
-            # Open and validate image
-            image = Image.open(io.BytesIO(image_bytes))
-            width, height = image.size
+            # Validate image from its header; no pixels are decoded
+            _, width, height = probe_image(image_bytes)
 
             # Mock analysis based on image properties
-            # In production: Use CNN model trained on harmful memes
+            # In production: Use CNN model trained on harmful memes on self.preprocess(image_bytes)
 
             # Random score for demo (weighted toward suspicious)
             score = random.uniform(0.4, 0.95)
@@ -54,6 +72,14 @@ class MemeClassifier:
                 "filename": filename
             }
 
+    def analyze_batch(self, items: List[Tuple[bytes, str]]) -> List[Dict[str, any]]:
+        """
+        Analyze a batch of (image_bytes, filename) pairs.
+        Returns: list of analyze() results, in input order
+        """
+        # In production: stack preprocessed images into one tensor for a single CNN forward pass
+        return [self.analyze(image_bytes, filename) for image_bytes, filename in items]
+
 
 # Singleton instance
 meme_classifier = MemeClassifier()
@@ -0,0 +1,128 @@
+import io
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+from PIL import Image
+from ..core.config import settings
+from .meme_classifier import meme_classifier
+
+EXECUTION_MODES = ("inline", "thread", "process")
+
+
+def analyze_image(image_bytes: bytes, filename: str) -> Dict[str, any]:
+    """Default per-image work: run the meme classifier."""
+    return meme_classifier.analyze(image_bytes, filename)
+
+
+def _analyze_shared(analyze_fn: Callable, shm_name: str, spans: List[Tuple[int, int]], filenames: List[str]) -> List[Dict[str, any]]:
+    # Runs in a worker process: image bytes are read out of the shared segment
+    # rather than pickled through the pool's pipe
+    segment = shared_memory.SharedMemory(name=shm_name)
+    try:
+        results = []
+        for (start, end), filename in zip(spans, filenames):
+            results.append(analyze_fn(bytes(segment.buf[start:end]), filename))
+        return results
+    finally:
+        segment.close()
+
+
+def _analyze_local(analyze_fn: Callable, items: List[Tuple[bytes, str]]) -> List[Dict[str, any]]:
+    return [analyze_fn(image_bytes, filename) for image_bytes, filename in items]
+
+
+def _warm_up() -> int:
+    # Load image plugins and exercise the classifier once so the first real request is not a cold start
+    Image.init()
+    buffer = io.BytesIO()
+    Image.new("RGB", (32, 32)).save(buffer, "PNG")
+    meme_classifier.analyze(buffer.getvalue(), "warmup.png")
+    return multiprocessing.current_process().pid
+
+
+class MemeExecutor:
+    """
+    Configurable execution backend for meme analysis.
+    - inline: run in the calling thread
+    - thread: shard each batch across a thread pool (helps where Pillow releases the GIL)
+    - process: shard each batch across a process pool, so decoding and inference
+      use every core; image bytes travel through shared memory, not pickling
+    """
+
+    def __init__(self, mode: str = "inline", pool_size: int = 4, analyze_fn: Callable = analyze_image):
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown meme execution mode: {mode}")
+        self.mode = mode
+        self.pool_size = pool_size
+        self.analyze_fn = analyze_fn
+        self._pool: Optional[Executor] = None
+        self._start_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Create the pool and warm every worker (safe to call concurrently)."""
+        if self.mode == "inline":
+            _warm_up()
+            return
+        with self._start_lock:
+            if self._pool is not None:
+                return
+            if self.mode == "thread":
+                pool = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="meme")
+            else:
+                # spawn avoids forking a process that already runs executor threads
+                pool = ProcessPoolExecutor(max_workers=self.pool_size, mp_context=multiprocessing.get_context("spawn"))
+            wait([pool.submit(_warm_up) for _ in range(self.pool_size)])
+            self._pool = pool
+
+    def shutdown(self) -> None:
+        """Stop the pool, waiting for in-flight work."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def analyze_batch(self, items: List[Tuple[bytes, str]]) -> List[Dict[str, any]]:
+        """
+        Analyze a batch of (image_bytes, filename) pairs on the configured backend.
+        Returns: list of results, in input order
+        """
+        if not items:
+            return []
+        if self.mode == "inline":
+            return _analyze_local(self.analyze_fn, items)
+
+        self.start()
+        shards = self._shard(items)
+        if self.mode == "thread":
+            futures = [self._pool.submit(_analyze_local, self.analyze_fn, shard) for shard in shards]
+            return [result for future in futures for result in future.result()]
+        return self._analyze_in_processes(shards)
+
+    def _shard(self, items: List[Tuple[bytes, str]]) -> List[List[Tuple[bytes, str]]]:
+        shard_count = min(self.pool_size, len(items))
+        size = -(-len(items) // shard_count)
+        return [items[index:index + size] for index in range(0, len(items), size)]
+
+    def _analyze_in_processes(self, shards: List[List[Tuple[bytes, str]]]) -> List[Dict[str, any]]:
+        total = sum(len(image_bytes) for shard in shards for image_bytes, _ in shard)
+        segment = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        try:
+            futures = []
+            offset = 0
+            for shard in shards:
+                spans = []
+                for image_bytes, _ in shard:
+                    segment.buf[offset:offset + len(image_bytes)] = image_bytes
+                    spans.append((offset, offset + len(image_bytes)))
+                    offset += len(image_bytes)
+                filenames = [filename for _, filename in shard]
+                futures.append(self._pool.submit(_analyze_shared, self.analyze_fn, segment.name, spans, filenames))
+            return [result for future in futures for result in future.result()]
+        finally:
+            segment.close()
+            segment.unlink()
+
+
+# Singleton instance
+meme_executor = MemeExecutor(mode=settings.MEME_EXECUTION_MODE, pool_size=settings.MEME_POOL_SIZE)
@@ -0,0 +1,274 @@
+import math
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..core.config import settings
+from ..core.metrics import span
+from .result_cache import cached_text_batch_analysis
+
+SHINGLE_BYTES = 5  # character 5-grams of the UTF-8 text, packed losslessly into 40 bits
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # 16 bands of 4 rows: pairs at Jaccard 0.7 share a band 99% of the time
+MAX_TEXT_BYTES = 4096  # longer posts are indexed by their beginning
+CHUNK_SHINGLES = 8192  # shingles hashed per vectorized step (bounds the temporary matrix)
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_BAND_INDEX = np.arange(BANDS)
+
+# Fixed seed: signatures must agree across restarts and workers
+_rng = np.random.default_rng(0x5A7A)
+_PERM_MULTIPLIERS = (_rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+_ROW_MULTIPLIERS = (_rng.integers(0, 2**63, ROWS, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+
+
+def normalize_text(text: str) -> str:
+    """Compatibility-normalized, case-folded text with whitespace runs collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def shingle_bytes(text: str) -> bytes:
+    """Normalized UTF-8 text that shingles are taken from: case, width, punctuation and spacing are ignored."""
+    return " ".join(_PUNCTUATION.sub(" ", normalize_text(text)).split()).encode("utf-8")[:MAX_TEXT_BYTES]
+
+
+def minhash_signatures(documents: List[bytes]) -> np.ndarray:
+    """
+    MinHash signatures, shape (len(documents), NUM_PERM), of the 5-byte shingle
+    sets of documents at least SHINGLE_BYTES long. Each permutation is a
+    multiply-shift hash of the packed shingle, (a * x mod 2^64) >> 32 for a
+    random odd a; all documents are hashed together in large array steps.
+    """
+    lengths = np.fromiter(map(len, documents), np.int64, len(documents))
+    counts = lengths - SHINGLE_BYTES + 1
+    data = np.frombuffer(b"".join(documents), np.uint8).astype(np.uint64)
+
+    # Pack every 5-byte window of the concatenation, then keep those within one document
+    windows = data.size - SHINGLE_BYTES + 1
+    shingles = data[:windows].copy()
+    for offset in range(1, SHINGLE_BYTES):
+        shingles |= data[offset:offset + windows] << np.uint64(8 * offset)
+    if len(documents) > 1:
+        document_starts = np.cumsum(lengths) - lengths
+        shingle_starts = np.cumsum(counts) - counts
+        shingles = shingles[np.arange(counts.sum()) + np.repeat(document_starts - shingle_starts, counts)]
+
+    signatures = np.empty((len(documents), NUM_PERM), np.uint32)
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    first = 0
+    while first < len(documents):
+        last = max(int(np.searchsorted(bounds, bounds[first] + CHUNK_SHINGLES, side="right")) - 1, first + 1)
+        chunk = shingles[bounds[first]:bounds[last]]
+        hashed = np.multiply.outer(_PERM_MULTIPLIERS, chunk)
+        # The top 32 bits of the minimum are the minimum of the top 32 bits
+        minimums = np.minimum.reduceat(hashed, bounds[first:last] - bounds[first], axis=1)
+        signatures[first:last] = (minimums >> np.uint64(32)).T
+        first = last
+    return signatures
+
+
+def band_keys(signatures: np.ndarray) -> np.ndarray:
+    """One 64-bit LSH key per band, shape (n, BANDS)."""
+    rows = signatures.reshape(-1, BANDS, ROWS).astype(np.uint64)
+    keys = (rows * _ROW_MULTIPLIERS).sum(axis=2, dtype=np.uint64)
+    keys ^= keys >> np.uint64(31)
+    keys *= np.uint64(0x9E3779B97F4A7C15)
+    keys ^= keys >> np.uint64(29)
+    return keys
+
+
+class NearDuplicateIndex:
+    """
+    Streaming near-duplicate index over recently analyzed texts.
+
+    Texts are reduced to MinHash signatures and bucketed by LSH band. Every
+    observed text is matched against the index and then inserted, joining the
+    campaign (cluster) of its most established near-duplicate or starting its
+    own. Storage is a ring of `segments` fixed-size segments of numpy arrays:
+    per band a direct-mapped table of (key tag, doc) slots, and per doc an
+    8-bit-per-row sketch of its signature used to confirm candidates. A
+    segment covers window_seconds / segments of time (less if it fills up);
+    reopening the oldest one evicts its texts, so memory is fixed up front
+    and matches reach back at most window_seconds.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        window_seconds: float = 86400,
+        segments: int = 4,
+        segment_capacity: int = 50000,
+        min_length: int = 30
+    ):
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.segments = segments
+        self.segment_capacity = segment_capacity
+        self.min_length = max(min_length, SHINGLE_BYTES)
+        # A random pair of 8-bit sketch rows agrees 1/256 of the time; correct for that
+        self._min_agreement = math.ceil(NUM_PERM * (threshold * 255 / 256 + 1 / 256))
+
+        self.table_size = 1 << max((segment_capacity - 1).bit_length(), 4)
+        self._mask = np.uint64(self.table_size - 1)
+        # Zeroed arrays are mapped lazily, so memory is only touched as segments fill.
+        # Table slots hold position + 1 so that zero means empty.
+        self._tags = np.zeros((segments, BANDS, self.table_size), np.uint32)
+        self._docs = np.zeros((segments, BANDS, self.table_size), np.int32)
+        self._sketches = np.zeros((segments, segment_capacity, NUM_PERM), np.uint8)
+        self._clusters = np.zeros((segments, segment_capacity), np.int64)
+        self._counts = [0] * segments
+        self._opened = [time.time()] * segments
+        self._current = 0
+
+        self._sizes: Dict[int, int] = {}  # campaigns with two or more live texts -> size
+        # Observation keys (e.g. a job's analysis log ids) -> (segment, position) of the live text
+        self._keyed: Dict[str, Tuple[int, int]] = {}
+        self._segment_keys: List[List[str]] = [[] for _ in range(segments)]
+        self._next_cluster = 1
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.observed = 0
+        self.matched = 0
+        self.evicted = 0
+
+    def observe_batch(self, texts: List[str], keys: Optional[List[str]] = None) -> List[int]:
+        """
+        Match and insert each text in order; returns each one's campaign size,
+        i.e. how many near-duplicates of it (itself included) are in the window.
+        Texts shorter than min_length after normalization are not indexed and get 1.
+        With keys, a text whose key was already observed in the window is not
+        inserted again (so a retried job does not inflate its own campaigns);
+        it gets the current size of the campaign it joined.
+        """
+        documents = [shingle_bytes(text) for text in texts]
+        indexable = [index for index, document in enumerate(documents) if len(document) >= self.min_length]
+        sizes = [1] * len(texts)
+        if not indexable:
+            return sizes
+
+        signatures = minhash_signatures([documents[index] for index in indexable])
+        band_key_rows = band_keys(signatures)
+        sketches = signatures.astype(np.uint8)
+
+        now = time.time()
+        with span("near_duplicates.observe"), self._lock:
+            self._expire(now)
+            for index, key_row, sketch in zip(indexable, band_key_rows, sketches):
+                key = keys[index] if keys is not None else None
+                seen = self._keyed.get(key) if key is not None else None
+                if seen is not None:
+                    sizes[index] = self._sizes.get(int(self._clusters[seen]), 1)
+                    continue
+                sizes[index] = self._observe(key_row, sketch, now, key)
+        return sizes
+
+    def observe(self, text: str) -> int:
+        return self.observe_batch([text])[0]
+
+    def _observe(self, keys: np.ndarray, sketch: np.ndarray, now: float, key: Optional[str] = None) -> int:
+        slots = (keys & self._mask).astype(np.intp)
+        tags = (keys >> np.uint64(32)).astype(np.uint32)
+
+        # The latest doc in each band bucket of every segment, confirmed by its sketch
+        docs = self._docs[:, _BAND_INDEX, slots]
+        segment, band = np.nonzero((docs > 0) & (self._tags[:, _BAND_INDEX, slots] == tags))
+        cluster = 0
+        if segment.size:
+            positions = docs[segment, band] - 1
+            agreement = np.count_nonzero(self._sketches[segment, positions] == sketch, axis=1)
+            similar = agreement >= self._min_agreement
+            if similar.any():
+                candidates = set(self._clusters[segment[similar], positions[similar]].tolist())
+                cluster = max(candidates, key=lambda candidate: self._sizes.get(candidate, 1))
+
+        current = self._current
+        if self._counts[current] >= self.segment_capacity or now - self._opened[current] >= self.window_seconds / self.segments:
+            current = self._rotate(now)
+        position = self._counts[current]
+        self._tags[current, _BAND_INDEX, slots] = tags
+        self._docs[current, _BAND_INDEX, slots] = position + 1
+        self._sketches[current, position] = sketch
+        self._counts[current] = position + 1
+        self.observed += 1
+
+        if cluster:
+            self.matched += 1
+            size = self._sizes[cluster] = self._sizes.get(cluster, 1) + 1
+        else:
+            cluster = self._next_cluster
+            self._next_cluster += 1
+            size = 1
+        self._clusters[current, position] = cluster
+        if key is not None:
+            self._keyed[key] = (current, position)
+            self._segment_keys[current].append(key)
+        return size
+
+    def _rotate(self, now: float) -> int:
+        self._current = (self._current + 1) % self.segments
+        self._evict(self._current)
+        self._opened[self._current] = now
+        return self._current
+
+    def _expire(self, now: float) -> None:
+        for segment in range(self.segments):
+            if self._counts[segment] and now - self._opened[segment] >= self.window_seconds:
+                self._evict(segment)
+
+    def _evict(self, segment: int) -> None:
+        count = self._counts[segment]
+        if not count:
+            return
+        clusters, members = np.unique(self._clusters[segment, :count], return_counts=True)
+        sizes = self._sizes
+        for cluster, evicted in zip(clusters.tolist(), members.tolist()):
+            size = sizes.get(cluster)
+            if size is not None:
+                if size - evicted > 1:
+                    sizes[cluster] = size - evicted
+                else:
+                    del sizes[cluster]
+        for key in self._segment_keys[segment]:
+            del self._keyed[key]
+        self._segment_keys[segment].clear()
+        self._tags[segment] = 0
+        self._docs[segment] = 0
+        self._counts[segment] = 0
+        self.evicted += count
+
+    def stats(self) -> Dict[str, any]:
+        # Read under the lock so the counts come from one consistent state
+        with self._lock:
+            return {
+                "indexed": sum(self._counts),
+                "campaigns": len(self._sizes),
+                "observed": self.observed,
+                "matched": self.matched,
+                "evicted": self.evicted,
+                "memory_bytes": self._tags.nbytes + self._docs.nbytes + self._sketches.nbytes + self._clusters.nbytes,
+            }
+
+
+def campaign_text_batch_analysis(texts: List[str], keys: Optional[List[str]] = None) -> List[Dict[str, any]]:
+    """
+    cached_text_batch_analysis plus each text's campaign_size. Runs after the
+    result cache, so exact repeats served from cache still count. keys, if
+    given, make re-observing the same texts idempotent (see observe_batch).
+    """
+    results = cached_text_batch_analysis(texts)
+    sizes = near_duplicate_index.observe_batch(texts, keys) if near_duplicate_index is not None else [1] * len(texts)
+    return [{**result, "campaign_size": size} for result, size in zip(results, sizes)]
+
+
+# Singleton instance
+near_duplicate_index: Optional[NearDuplicateIndex] = NearDuplicateIndex(
+    threshold=settings.NEAR_DUP_THRESHOLD,
+    window_seconds=settings.NEAR_DUP_WINDOW_SECONDS,
+    segments=settings.NEAR_DUP_SEGMENTS,
+    segment_capacity=settings.NEAR_DUP_SEGMENT_CAPACITY,
+    min_length=settings.NEAR_DUP_MIN_LENGTH,
+) if settings.NEAR_DUP_ENABLED else None
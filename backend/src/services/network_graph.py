@@ -1,13 +1,271 @@
+import asyncio
+import json
 import random
-from typing import Dict, List
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set
+from ..core.config import settings
+from ..core.executors import run_cpu
+from .graph_store import GraphStore, GraphCapacityError, SUSPICIOUS_TYPES, ACCOUNT_TYPES, POST_TYPE, NODE_TYPES, RELATIONSHIPS
+from .community import CommunityDetector, HIGH_RISK_MEAN
+from .graph_summary import GraphSummarizer
+from .analytics import analytics_rollups
 
 
 class NetworkGraphService:
     """
-    Placeholder service for network graph generation.
-    In production, this would query Neo4j for bot network relationships.
+    Bot network graph service.
+    Serves /network/map and /network/stats from an incrementally maintained
+    in-process GraphStore instead of regenerating data per request.
+    Communities are maintained by incremental label propagation in the background.
+    Large graphs can be viewed as cached level-of-detail summaries.
     """
 
+    def __init__(self, store: Optional[GraphStore] = None):
+        self.store = store or GraphStore(max_nodes=settings.GRAPH_MAX_NODES, max_edges=settings.GRAPH_MAX_EDGES)
+        self.communities = CommunityDetector(self.store, min_cluster_size=settings.COMMUNITY_MIN_SIZE)
+        self.summaries = GraphSummarizer(
+            self.store,
+            self.communities,
+            base_clusters=settings.GRAPH_LOD_BASE_CLUSTERS,
+            max_zoom=settings.GRAPH_LOD_MAX_ZOOM,
+            layout_iterations=settings.GRAPH_LOD_LAYOUT_ITERATIONS,
+            refresh_interval=settings.GRAPH_LOD_REFRESH_SECONDS
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start background community maintenance."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintain_communities())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _maintain_communities(self) -> None:
+        while True:
+            if self.communities.pending:
+                await run_cpu(self.communities.run, settings.COMMUNITY_UPDATE_BUDGET)
+            else:
+                await asyncio.sleep(settings.COMMUNITY_UPDATE_INTERVAL)
+
+    def ingest(self, nodes: List[Dict[str, any]], edges: List[Dict[str, any]]) -> Dict[str, int]:
+        """
+        Ingest node attribute updates and edges ("user X shared post Y", "coordinated_with").
+        Returns counts of upserted nodes and added/rejected edges.
+        The whole request is validated before anything is applied, so a bad
+        node type or relationship (ValueError) or too many new nodes
+        (GraphCapacityError) leaves the graph untouched.
+        """
+        for node in nodes:
+            if node.get("type") is not None and node["type"] not in NODE_TYPES:
+                raise ValueError(f"Unknown node type: {node['type']}")
+        for edge in edges:
+            if edge["relationship"] not in RELATIONSHIPS:
+                raise ValueError(f"Unknown relationship: {edge['relationship']}")
+
+        with self.store.lock:
+            new_nodes = len({node["id"] for node in nodes if self.store.index_of(node["id"]) is None})
+            if self.store.node_count + new_nodes > self.store.max_nodes:
+                raise GraphCapacityError(f"Graph node capacity ({self.store.max_nodes}) reached")
+
+            for node in nodes:
+                attributes = {key: value for key, value in node.items() if key not in ("id", "type")}
+                index = self.store.upsert_node(node["id"], node.get("type"), **attributes)
+                self.communities.on_node(index)
+
+            added = 0
+            rejected = 0
+            for edge in edges:
+                try:
+                    edge_index = self.store.add_edge(edge["source"], edge["target"], edge["relationship"])
+                except GraphCapacityError:
+                    rejected += 1
+                    continue
+                self.communities.on_edge(edge_index)
+                added += 1
+
+        analytics_rollups.record_edges(added)
+        return {"nodes_upserted": len(nodes), "edges_ingested": added, "edges_rejected": rejected}
+
+    def query_graph(
+        self,
+        center: Optional[str] = None,
+        hops: int = 1,
+        cluster: Optional[str] = None,
+        min_risk: Optional[float] = None,
+        node_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 1000
+    ) -> Dict[str, any]:
+        """
+        One page of the graph, optionally restricted to the k-hop ego network of
+        a node, a cluster, a minimum risk score and/or a node type.
+        Each page carries the edges leaving its nodes whose targets also match,
+        so every edge appears on exactly one page.
+        Returns: {"nodes": [...], "edges": [...], "clusters": [...], "next_cursor": str or None}
+        """
+        with self.store.lock:
+            selection = self._select(center, hops, cluster)
+            return self._query_page(selection, min_risk, node_type, decode_cursor(cursor), limit)
+
+    def stream_graph(
+        self,
+        center: Optional[str] = None,
+        hops: int = 1,
+        cluster: Optional[str] = None,
+        min_risk: Optional[float] = None,
+        node_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        chunk_size: int = 1000
+    ) -> Iterator[str]:
+        """
+        Same selection as query_graph, serialized as NDJSON lines
+        ({"kind": "node" | "edge" | "cluster" | "end", ...}) one chunk at a time,
+        so the full graph is never materialized in memory.
+        Filters are validated before the first line is produced.
+        """
+        if node_type is not None and node_type not in NODE_TYPES:
+            raise ValueError(f"Unknown node type: {node_type}")
+        start = decode_cursor(cursor)
+        with self.store.lock:
+            selection = self._select(center, hops, cluster)
+        return self._stream_pages(selection, min_risk, node_type, start, chunk_size)
+
+    def _stream_pages(self, selection: Optional[Set[int]], min_risk: Optional[float], node_type: Optional[str], start: int, chunk_size: int) -> Iterator[str]:
+        seen_clusters = set()
+        while True:
+            # The lock is held per chunk, never across a yield
+            with self.store.lock:
+                page = self._query_page(selection, min_risk, node_type, start, chunk_size)
+
+            lines = [json.dumps({"kind": "node", **node}) for node in page["nodes"]]
+            lines.extend(json.dumps({"kind": "edge", **edge}) for edge in page["edges"])
+            for cluster_dict in page["clusters"]:
+                if cluster_dict["id"] not in seen_clusters:
+                    seen_clusters.add(cluster_dict["id"])
+                    lines.append(json.dumps({"kind": "cluster", **cluster_dict}))
+            if lines:
+                yield "\n".join(lines) + "\n"
+
+            if page["next_cursor"] is None:
+                break
+            start = decode_cursor(page["next_cursor"])
+
+        yield json.dumps({"kind": "end"}) + "\n"
+
+    def _select(self, center: Optional[str], hops: int, cluster: Optional[str]) -> Optional[Set[int]]:
+        # Caller holds the store lock. None means "no restriction".
+        selection = None
+        if center is not None:
+            selection = self._ego_network(center, hops)
+        if cluster is not None:
+            members = set(self.communities.members_of(decode_cluster_id(cluster)))
+            selection = members if selection is None else selection & members
+        return selection
+
+    def _ego_network(self, center: str, hops: int) -> Set[int]:
+        index = self.store.index_of(center)
+        if index is None:
+            return set()
+
+        # Breadth-first expansion, capped so hub nodes cannot blow up the query
+        visited = {index}
+        frontier = [index]
+        for _ in range(hops):
+            next_frontier = []
+            for node in frontier:
+                for neighbor, _, _ in self.store.adjacent(node):
+                    if neighbor not in visited:
+                        if len(visited) >= settings.GRAPH_EGO_MAX_NODES:
+                            return visited
+                        visited.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return visited
+
+    def _query_page(self, selection: Optional[Set[int]], min_risk: Optional[float], node_type: Optional[str], start: int, limit: int) -> Dict[str, any]:
+        # Caller holds the store lock
+        store = self.store
+        if selection is not None:
+            candidates = (index for index in sorted(index for index in selection if index >= start)
+                          if store.matches(index, node_type, min_risk))
+        else:
+            candidates = store.iter_indices(node_type, min_risk, start)
+
+        page = list(islice(candidates, limit + 1))
+        next_cursor = encode_cursor(page[limit]) if len(page) > limit else None
+        page = page[:limit]
+
+        def in_subgraph(index: int) -> bool:
+            return (selection is None or index in selection) and store.matches(index, node_type, min_risk)
+
+        edges = [
+            store.edge_dict(edge)
+            for index in page
+            for edge in store.out_edges(index)
+            if in_subgraph(store.edge_endpoints(edge)[1])
+        ]
+
+        labels = {self.communities.community_of_index(index) for index in page}
+        clusters = [
+            self._cluster_dict(summary)
+            for summary in (self.communities.cluster_summary(label) for label in sorted(labels))
+            if summary["member_count"] >= self.communities.min_cluster_size
+        ]
+
+        return {
+            "nodes": [self._node_dict(store.node_at(index)) for index in page],
+            "edges": edges,
+            "clusters": clusters,
+            "next_cursor": next_cursor
+        }
+
+    def get_summary(self, zoom: int = 0) -> Dict[str, any]:
+        """Level-of-detail view: communities collapsed into laid-out super-nodes (refreshed at most every GRAPH_LOD_REFRESH_SECONDS)."""
+        return self.summaries.get(zoom)
+
+    def get_stats(self) -> Dict[str, any]:
+        """Network statistics from maintained counters."""
+        store = self.store
+        accounts = sum(store.type_counts[node_type] for node_type in ACCOUNT_TYPES)
+        suspicious = sum(store.type_counts[node_type] for node_type in SUSPICIOUS_TYPES)
+        return {
+            "total_networks": self.communities.cluster_count,
+            "suspicious_accounts": suspicious,
+            "active_campaigns": store.active_campaigns,
+            "high_risk_clusters": self.communities.high_risk_cluster_count,
+            "analyzed_posts": store.type_counts[POST_TYPE],
+            "detection_rate": round(suspicious / accounts, 2) if accounts else 0.0
+        }
+
+    def _node_dict(self, node) -> Dict[str, any]:
+        node_dict = node.to_dict()
+        node_dict["cluster"] = encode_cluster_id(self.communities.community_of(node.id))
+        return node_dict
+
+    def _cluster_dict(self, cluster: Dict[str, any]) -> Dict[str, any]:
+        seed = self.store.node_at(cluster["label"])
+        return {
+            "id": encode_cluster_id(cluster["label"]),
+            "name": f"Network of {seed.label or seed.id}",
+            "member_count": cluster["member_count"],
+            "risk_level": risk_level(cluster["mean_risk"])
+        }
+
+    def seed_sample_graph(self) -> None:
+        """Load the demo graph into an empty store."""
+        if self.store.node_count:
+            return
+        sample = self.generate_sample_graph()
+        self.ingest(sample["nodes"], sample["edges"])
+        self.communities.run_until_stable()
+
     def generate_sample_graph(self) -> Dict[str, List]:
         """
         Generate sample network graph data.
@@ -79,5 +337,40 @@ class NetworkGraphService:
         }
 
 
+def encode_cursor(index: int) -> str:
+    return str(index)
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Cursors are the index of the first node on the next page."""
+    if cursor is None:
+        return 0
+    if not cursor.isdigit():
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return int(cursor)
+
+
+def encode_cluster_id(label: int) -> str:
+    return f"cluster_{label}"
+
+
+def decode_cluster_id(cluster_id: str) -> int:
+    prefix, _, label = cluster_id.partition("_")
+    if prefix != "cluster" or not label.isdigit():
+        raise ValueError(f"Invalid cluster ID: {cluster_id}")
+    return int(label)
+
+
+def risk_level(mean_risk: float) -> str:
+    """Map a mean member risk score to a cluster risk level."""
+    if mean_risk >= 0.8:
+        return "critical"
+    elif mean_risk >= HIGH_RISK_MEAN:
+        return "high"
+    elif mean_risk >= 0.4:
+        return "medium"
+    return "low"
+
+
 # Singleton instance
 network_graph_service = NetworkGraphService()
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from ..core.config import settings
+from .image_io import load_for_model, probe_image
+from .text_classifier import text_classifier
+from .meme_classifier import meme_classifier
+from .meme_executor import meme_executor
+
+
+class ResultCache:
+    """
+    Two-tier cache for classifier results.
+    An in-process LRU tier bounded by total value size in bytes, with per-entry TTL,
+    optionally backed by a SQLite file shared by every uvicorn worker on the host.
+    Values are JSON-serializable dicts.
+    """
+
+    # Expired rows are purged from the disk tier every this many writes
+    DISK_PURGE_EVERY = 1000
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 3600, disk_path: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_path = disk_path
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (payload, expires_at)
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_writes = 0
+        if disk_path:
+            self._open_disk()
+            # SQLite connections must not cross fork(); pre-forked workers open their own
+            os.register_at_fork(after_in_child=self._open_disk)
+
+        # Metrics
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _open_disk(self) -> None:
+        self._lock = threading.Lock()
+        self._disk = sqlite3.connect(self.disk_path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._disk.execute("PRAGMA journal_mode=WAL")
+        self._disk.execute("PRAGMA synchronous=NORMAL")
+        self._disk.execute(
+            "CREATE TABLE IF NOT EXISTS result_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        """Look up a cached result, checking memory first and then the shared disk tier."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return json.loads(payload)
+                self._remove(key)
+                self.expirations += 1
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT value, expires_at FROM result_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._store(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: dict) -> None:
+        """Store a result in both tiers."""
+        payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, payload, expires_at)
+
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO result_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, expires_at),
+                )
+                self._disk_writes += 1
+                if self._disk_writes % self.DISK_PURGE_EVERY == 0:
+                    self._disk.execute("DELETE FROM result_cache WHERE expires_at <= ?", (time.time(),))
+
+    def invalidate_prefix(self, prefix: str, keep_prefix: str) -> None:
+        """Drop every entry under prefix that is not under keep_prefix (e.g. stale classifier versions)."""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix) and not key.startswith(keep_prefix)]:
+                self._remove(key)
+            if self._disk is not None:
+                self._disk.execute(
+                    "DELETE FROM result_cache WHERE substr(key, 1, ?) = ? AND substr(key, 1, ?) != ?",
+                    (len(prefix), prefix, len(keep_prefix), keep_prefix),
+                )
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current memory usage."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _store(self, key: str, payload: bytes, expires_at: float) -> None:
+        # Caller holds the lock
+        if key in self._entries:
+            self._remove(key)
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[key] = (payload, expires_at)
+        self.current_bytes += len(payload)
+        while self.current_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        # Caller holds the lock
+        payload, _ = self._entries.pop(key)
+        self.current_bytes -= len(payload)
+
+
+def text_cache_key(text: str, version: str) -> str:
+    # Keyword matchers only see text.lower(), so texts equal after lower() always score
+    # alike; folding further (NFKC, casefold, whitespace) would merge texts they tell apart
+    digest = hashlib.sha256(text.lower().encode("utf-8")).hexdigest()
+    # "text-lower:" keeps entries written under the older, NFKC-folded keys from being served
+    return f"text-lower:{version}:{digest}"
+
+
+def image_cache_key(image_bytes: bytes, version: str) -> str:
+    digest = hashlib.sha256(image_bytes).hexdigest()
+    return f"meme:{version}:{digest}"
+
+
+def perceptual_hash(image_bytes: bytes) -> Optional[str]:
+    """
+    64-bit difference hash (dHash) of an image.
+    Re-encoded, resized or lightly recompressed copies of a meme hash to the same value.
+    Returns None if the image cannot be decoded.
+    """
+    try:
+        pixels = list(load_for_model(image_bytes, (9, 8), mode="L").getdata())
+    except Exception:
+        return None
+
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:016x}"
+
+
+def image_size(image_bytes: bytes, default: Optional[str]) -> Optional[str]:
+    """"WIDTHxHEIGHT" from the image header, or default if it cannot be read."""
+    try:
+        _, width, height = probe_image(image_bytes)
+    except Exception:
+        return default
+    return f"{width}x{height}"
+
+
+def perceptual_cache_key(phash: str, version: str) -> str:
+    return f"meme-phash:{version}:{phash}"
+
+
+def cached_text_batch_analysis(texts: List[str]) -> List[Dict[str, any]]:
+    """Run text_classifier.analyze_batch through the result cache, scoring only the misses."""
+    keys = [text_cache_key(text, text_classifier.version) for text in texts]
+    results = [result_cache.get(key) for key in keys]
+
+    # Duplicates within the batch are scored once
+    missing: Dict[str, List[int]] = {}
+    for index, result in enumerate(results):
+        if result is None:
+            missing.setdefault(keys[index], []).append(index)
+
+    if missing:
+        fresh = text_classifier.analyze_batch([texts[indices[0]] for indices in missing.values()])
+        for (key, indices), result in zip(missing.items(), fresh):
+            result_cache.set(key, result)
+            for index in indices:
+                results[index] = result
+    return results
+
+
+def cached_meme_analysis(image_bytes: bytes, filename: str) -> Dict[str, any]:
+    """
+    Run meme_classifier.analyze through the result cache.
+    Looks up the exact content hash first, then (if enabled) the perceptual hash.
+    """
+    return cached_meme_batch_analysis([(image_bytes, filename)])[0]
+
+
+def cached_meme_batch_analysis(items: List[Tuple[bytes, str]]) -> List[Dict[str, any]]:
+    """Run meme_classifier.analyze_batch through the result cache, analyzing only the misses."""
+    version = meme_classifier.version
+    results: List[Optional[dict]] = []
+    keys: List[Tuple[str, Optional[str]]] = []
+
+    for image_bytes, _ in items:
+        exact_key = image_cache_key(image_bytes, version)
+        result = result_cache.get(exact_key)
+
+        phash_key = None
+        if result is None and settings.RESULT_CACHE_PERCEPTUAL_HASH:
+            phash = perceptual_hash(image_bytes)
+            if phash is not None:
+                phash_key = perceptual_cache_key(phash, version)
+                result = result_cache.get(phash_key)
+                if result is not None:
+                    # The hit came from a different encoding of the image; report this one's size
+                    result = {**result, "image_size": image_size(image_bytes, result.get("image_size"))}
+                    result_cache.set(exact_key, result)
+
+        results.append(result)
+        keys.append((exact_key, phash_key))
+
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        fresh = meme_executor.analyze_batch([items[index] for index in missing])
+        for index, result in zip(missing, fresh):
+            results[index] = result
+            # Failed analyses are not cached so a retry gets a fresh attempt
+            if result["label"] != "Analysis Failed":
+                exact_key, phash_key = keys[index]
+                result_cache.set(exact_key, result)
+                if phash_key is not None:
+                    result_cache.set(phash_key, result)
+
+    # The filename belongs to this upload, not to the cached content
+    return [{**result, "filename": filename} for result, (_, filename) in zip(results, items)]
+
+
+# Singleton instance
+result_cache = ResultCache(
+    max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+    ttl=settings.RESULT_CACHE_TTL_SECONDS,
+    disk_path=settings.RESULT_CACHE_DISK_PATH or None,
+)
+
+# Drop results produced by previous classifier versions
+result_cache.invalidate_prefix("text:", f"text:{text_classifier.version}:")
+result_cache.invalidate_prefix("meme:", f"meme:{meme_classifier.version}:")
+result_cache.invalidate_prefix("meme-phash:", f"meme-phash:{meme_classifier.version}:")
@@ -1,5 +1,8 @@
-import random
-from typing import Dict
+import hashlib
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+from ..core.metrics import span
+from .keyword_matcher import build_matcher
 
 
 class TextClassifier:
@@ -8,51 +11,76 @@ class TextClassifier:
     In production, this would use IndicBERT or similar model for propaganda/misinformation detection.
     """
 
-    def __init__(self):
+    # Bump when scoring logic changes; cached results are keyed by version
+    MODEL_VERSION = "keyword-heuristic-1"
+
+    DEFAULT_KEYWORDS = [
+        'propaganda', 'fake', 'hoax', 'conspiracy', 'misleading',
+        'unverified', 'misinformation', 'disinformation'
+    ]
+
+    LABEL_THRESHOLDS = np.array([0.3, 0.5, 0.7])
+    LABELS = np.array(["Safe", "Suspicious", "Potential Propaganda", "Harmful Content"])
+
+    def __init__(self, keywords: Optional[Iterable[str]] = None, engine: str = "auto"):
         # Keyword-based heuristics for demo purposes
-        self.harmful_keywords = [
-            'propaganda', 'fake', 'hoax', 'conspiracy', 'misleading',
-            'unverified', 'misinformation', 'disinformation'
-        ]
+        self.harmful_keywords = list(keywords) if keywords is not None else list(self.DEFAULT_KEYWORDS)
+
+        # Compile the lexicon once; the engine is chosen by lexicon size
+        self.matcher = build_matcher(self.harmful_keywords, engine=engine)
+        self._rng = np.random.default_rng()
+
+        # Version covers the lexicon too, so loading new indicator terms invalidates cached results
+        lexicon_digest = hashlib.sha256("\n".join(self.matcher.keywords).encode("utf-8")).hexdigest()[:12]
+        self.version = f"{self.MODEL_VERSION}:{engine}:{lexicon_digest}"
 
     def analyze(self, text: str) -> Dict[str, any]:
         """
         Analyze text and return a risk score.
         Returns: {"score": float (0-1), "label": str, "explanation": str}
         """
-        text_lower = text.lower()
+        return self.analyze_batch([text])[0]
 
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, any]]:
+        """
+        Analyze a batch of texts in one call.
+        Scoring and labelling run over whole arrays rather than per item.
+        Returns: list of analyze() results, in input order
+        """
+        with span("text_classifier.analyze_batch"):
+            return self._score_batch(texts)
+
+    def _score_batch(self, texts: List[str]) -> List[Dict[str, any]]:
         # Simple keyword matching for demo
-        keyword_count = sum(1 for keyword in self.harmful_keywords if keyword in text_lower)
+        matches = [self.matcher.find_all(text) for text in texts]
+        keyword_counts = np.fromiter((len(hits) for hits in matches), dtype=np.int64, count=len(texts))
 
         # Calculate score (0 = safe, 1 = highly harmful)
-        base_score = min(keyword_count * 0.15, 0.9)
+        base_scores = np.minimum(keyword_counts * 0.15, 0.9)
 
         # Add some randomness for realism in demo
-        score = min(base_score + random.uniform(0, 0.2), 1.0)
+        scores = np.minimum(base_scores + self._rng.uniform(0, 0.2, size=len(texts)), 1.0)
 
         # Determine label
-        if score >= 0.7:
-            label = "Harmful Content"
-        elif score >= 0.5:
-            label = "Potential Propaganda"
-        elif score >= 0.3:
-            label = "Suspicious"
-        else:
-            label = "Safe"
-
-        # Generate explanation
-        if keyword_count > 0:
-            explanation = f"Detected {keyword_count} risk indicators in content."
-        else:
-            explanation = "No obvious risk indicators detected."
-
-        return {
-            "score": round(score, 2),
-            "label": label,
-            "explanation": explanation,
-            "indicators": keyword_count
-        }
+        labels = self.LABELS[np.searchsorted(self.LABEL_THRESHOLDS, scores, side="right")]
+        scores = np.round(scores, 2)
+
+        results = []
+        for score, label, keyword_count, hits in zip(scores.tolist(), labels.tolist(), keyword_counts.tolist(), matches):
+            # Generate explanation
+            if keyword_count > 0:
+                explanation = f"Detected {keyword_count} risk indicators in content."
+            else:
+                explanation = "No obvious risk indicators detected."
+
+            results.append({
+                "score": score,
+                "label": label,
+                "explanation": explanation,
+                "indicators": keyword_count,
+                "matches": {keyword: len(offsets) for keyword, offsets in hits.items()}
+            })
+        return results
 
 
 # Singleton instance
@@ -0,0 +1,112 @@
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+from ..core.config import settings
+from ..core.database import get_supabase, run_query
+
+# Columns needed to authenticate a user and build the login response
+CREDENTIAL_COLUMNS = "id, name, email, password_hash, created_at"
+
+# Postgres unique_violation
+UNIQUE_VIOLATION = "23505"
+
+
+class EmailAlreadyRegisteredError(ValueError):
+    """Raised when signing up with an email that already has an account."""
+
+
+class UserRepository:
+    """
+    Data access for the users table.
+    Reads project only the columns a caller needs, signup is a single insert
+    that relies on the unique email index, and login lookups are served from
+    a short-TTL in-process cache keyed by email. Only existing users are
+    cached, so a fresh signup on another worker is never hidden.
+    """
+
+    def __init__(self, client_factory: Callable = get_supabase, cache_ttl: float = 30.0, cache_max_entries: int = 10000):
+        self.client_factory = client_factory
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self._cache: Dict[str, Tuple[dict, float]] = {}  # email -> (user, expires_at)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.round_trips = 0
+        self.cache_hits = 0
+
+    async def create(self, name: str, email: str, password_hash: str) -> dict:
+        """Insert a new user; raises EmailAlreadyRegisteredError on a duplicate email."""
+        supabase = self.client_factory()
+        new_user = {
+            "name": name,
+            "email": email,
+            "password_hash": password_hash,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        try:
+            result = await self._execute(supabase.table("users").insert(new_user))
+        except Exception as e:
+            # postgrest APIError; matched by code so postgrest is not imported up front
+            if getattr(e, "code", None) == UNIQUE_VIOLATION:
+                raise EmailAlreadyRegisteredError(email)
+            raise
+
+        if not result.data:
+            raise RuntimeError("Failed to create user")
+        user = result.data[0]
+        self._remember(email, user)
+        return user
+
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        """User record with credentials (CREDENTIAL_COLUMNS), or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(email)
+            if entry is not None:
+                if entry[1] > now:
+                    self.cache_hits += 1
+                    return entry[0]
+                del self._cache[email]
+
+        supabase = self.client_factory()
+        result = await self._execute(supabase.table("users").select(CREDENTIAL_COLUMNS).eq("email", email).limit(1))
+        if not result.data:
+            return None
+        user = result.data[0]
+        self._remember(email, user)
+        return user
+
+    async def update_password_hash(self, user: dict, password_hash: str) -> None:
+        supabase = self.client_factory()
+        self.invalidate(user["email"])
+        await self._execute(supabase.table("users").update({"password_hash": password_hash}).eq("id", user["id"]))
+
+    def invalidate(self, email: str) -> None:
+        with self._lock:
+            self._cache.pop(email, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"round_trips": self.round_trips, "cache_hits": self.cache_hits, "cached_users": len(self._cache)}
+
+    async def _execute(self, query):
+        self.round_trips += 1
+        return await run_query(query)
+
+    def _remember(self, email: str, user: dict) -> None:
+        if self.cache_ttl <= 0:
+            return
+        record = {column: user.get(column) for column in ("id", "name", "email", "password_hash", "created_at")}
+        with self._lock:
+            if len(self._cache) >= self.cache_max_entries:
+                now = time.monotonic()
+                for key in [key for key, (_, expires_at) in self._cache.items() if expires_at <= now]:
+                    del self._cache[key]
+                if len(self._cache) >= self.cache_max_entries:
+                    self._cache.pop(next(iter(self._cache)))
+            self._cache[email] = (record, time.monotonic() + self.cache_ttl)
+
+
+# Singleton instance
+user_repository = UserRepository(cache_ttl=settings.USER_CACHE_TTL_SECONDS, cache_max_entries=settings.USER_CACHE_MAX_ENTRIES)
@@ -57,15 +57,34 @@ curl -s -X POST "$API_BASE/analyze/text" \
   -H "Authorization: Bearer $TOKEN" \
   -d '{"text":"This is fake news and propaganda spreading misinformation"}' | python -m json.tool
 
+# Full batch, then a single analysis: batches draw on the per-user text
+# bucket, so the single request must still be admitted (not 429)
+echo ""
+echo "5. Testing a full text batch followed by a single analysis..."
+BATCH_STATUS=$(python -c "import json; print(json.dumps({'texts': ['Coordinated post number %d' % i for i in range(1000)]}))" | \
+  curl -s -o /dev/null -w "%{http_code}" -X POST "$API_BASE/analyze/text/batch" \
+  -H "Content-Type: application/json" \
+  -H "Authorization: Bearer $TOKEN" \
+  --data-binary @-)
+SINGLE_STATUS=$(curl -s -o /dev/null -w "%{http_code}" -X POST "$API_BASE/analyze/text" \
+  -H "Content-Type: application/json" \
+  -H "Authorization: Bearer $TOKEN" \
+  -d '{"text":"A single post right after a full batch"}')
+echo "batch: $BATCH_STATUS, single: $SINGLE_STATUS"
+if [ "$BATCH_STATUS" != "200" ] || [ "$SINGLE_STATUS" != "200" ]; then
+    echo "Expected both requests to be admitted. Exiting."
+    exit 1
+fi
+
 # Network map
 echo ""
-echo "5. Testing network map..."
+echo "6. Testing network map..."
 curl -s "$API_BASE/network/map" \
   -H "Authorization: Bearer $TOKEN" | python -m json.tool | head -50
 
 # Network stats
 echo ""
-echo "6. Testing network stats..."
+echo "7. Testing network stats..."
 curl -s "$API_BASE/network/stats" \
   -H "Authorization: Bearer $TOKEN" | python -m json.tool
 